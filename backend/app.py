@@ -1,14 +1,26 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 import json
+import time
 import paho.mqtt.client as mqtt
-from models import db, SensorData, FarmerInput, SystemStatus
+from models import db, SensorData, FarmerInput, SystemStatus, create_missing_columns, create_missing_indexes
 import os
 from dotenv import load_dotenv
-import time
 from ml_model import CropRecommendationModel
+from category_encoding import UnknownCategoryError
+from training_jobs import TrainingJobManager
+from incremental_training import load_confirmed_inputs
+from ingestion import SensorIngestionWriter, MqttMessageProcessor, coerce_sensor_reading
+from mqtt_supervisor import MqttSupervisor
+from sensor_history import parse_timestamp, parse_limit, query_sensor_page
+from rollups import apply_rollups, parse_rollup_limit, query_rollups
+from sensor_status import SensorStatusTracker
+from live_feed import EventBroadcaster, SensorDataTailer, format_sse
+from http_cache import ResponseCache, weak_etag
+from archive import SensorArchive
+from database import database_url, engine_options, configure_engine
 import logging
 import sys
 
@@ -19,7 +31,7 @@ load_dotenv()
 print("Environment variables loaded")
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=['X-Next-Cursor', 'ETag'])
 print("Flask app created with CORS enabled")
 
 # Configure logging
@@ -31,9 +43,12 @@ logger = logging.getLogger(__name__)
 print("Logging configured")
 
 # Database configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///crop_recommendation.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = database_url()
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 db.init_app(app)
+with app.app_context():
+    configure_engine(db.engine)
 print("Database initialized")
 
 # MQTT Configuration
@@ -43,22 +58,162 @@ MQTT_USER = os.getenv('MQTT_USER', 'FY2025')
 MQTT_PASSWORD = os.getenv('MQTT_PASSWORD', 'Krish@2025')
 MQTT_TOPIC = os.getenv('MQTT_TOPIC', 'sensor/data')
 MQTT_KEEPALIVE = int(os.getenv('MQTT_KEEPALIVE', '60'))
-MQTT_RECONNECT_DELAY = 5  # seconds
+MQTT_RECONNECT_DELAY = float(os.getenv('MQTT_RECONNECT_DELAY', '5'))  # seconds
+MQTT_RECONNECT_MAX_DELAY = float(os.getenv('MQTT_RECONNECT_MAX_DELAY', '300'))  # seconds
 print("MQTT configuration loaded")
 
+# Prediction configuration
+PREDICTION_REQUIRED_FIELDS = ['N', 'P', 'K', 'temperature', 'humidity', 'moisture', 'rainfall',
+                              'soil_type', 'weather', 'region']
+MAX_BATCH_SIZE = int(os.getenv('MAX_BATCH_SIZE', '10000'))
+MODEL_PRELOAD = os.getenv('MODEL_PRELOAD', 'true').lower() in ('1', 'true', 'yes')
+MODEL_MMAP_MODE = os.getenv('MODEL_MMAP_MODE', 'r') or None
+MODEL_DIR = os.getenv('MODEL_DIR', 'models')
+MODEL_REFRESH_INTERVAL = float(os.getenv('MODEL_REFRESH_INTERVAL', '1.0'))
+MODEL_INFERENCE_ENGINE = os.getenv('MODEL_INFERENCE_ENGINE', 'flat')  # or 'sklearn'
+MODEL_BACKEND = os.getenv('MODEL_BACKEND', 'random_forest')  # see model_backends.BACKENDS
+UNKNOWN_CATEGORY_POLICY = os.getenv('UNKNOWN_CATEGORY_POLICY', 'default')  # see category_encoding.UNKNOWN_POLICIES
+MAX_AVERAGED_ROWS = int(os.getenv('MAX_AVERAGED_ROWS', '100000'))  # rows one request may average over
+PREDICTION_CACHE_SIZE = int(os.getenv('PREDICTION_CACHE_SIZE', '4096'))
+PREDICTION_CACHE_TTL = float(os.getenv('PREDICTION_CACHE_TTL', '300'))
+PREDICTION_CACHE_PRECISION = int(os.getenv('PREDICTION_CACHE_PRECISION', '1'))
+TRAINING_WORKERS = int(os.getenv('TRAINING_WORKERS', '1'))
+TRAINING_N_JOBS = int(os.getenv('TRAINING_N_JOBS', '-1'))  # cores per training job, -1 = all
+INCREMENTAL_TREES = int(os.getenv('INCREMENTAL_TREES', '10'))  # trees added per incremental run
+INCREMENTAL_MAX_TREES = int(os.getenv('INCREMENTAL_MAX_TREES', '0')) or None  # oldest trees retired past this
+
+# Ingestion configuration
+INGEST_QUEUE_SIZE = int(os.getenv('INGEST_QUEUE_SIZE', '10000'))
+INGEST_BATCH_SIZE = int(os.getenv('INGEST_BATCH_SIZE', '500'))
+INGEST_FLUSH_INTERVAL = float(os.getenv('INGEST_FLUSH_INTERVAL', '1.0'))
+INGEST_PUT_TIMEOUT = float(os.getenv('INGEST_PUT_TIMEOUT', '1.0'))
+STATUS_STALE_AFTER = float(os.getenv('STATUS_STALE_AFTER', '300'))  # seconds
+STATUS_REFRESH_INTERVAL = float(os.getenv('STATUS_REFRESH_INTERVAL', '5'))  # seconds
+LIVE_FEED_BUFFER = int(os.getenv('LIVE_FEED_BUFFER', '100'))  # events per client
+LIVE_FEED_MAX_DROPPED = int(os.getenv('LIVE_FEED_MAX_DROPPED', '100'))
+LIVE_FEED_HEARTBEAT = float(os.getenv('LIVE_FEED_HEARTBEAT', '15'))  # seconds
+LIVE_FEED_MAX_SECONDS = float(os.getenv('LIVE_FEED_MAX_SECONDS', '300'))  # clients reconnect after this
+LIVE_FEED_POLL_INTERVAL = float(os.getenv('LIVE_FEED_POLL_INTERVAL', '2'))  # seconds
+# Each open stream holds a server thread; keep half of gunicorn's threads for API requests
+LIVE_FEED_MAX_CLIENTS = int(os.getenv('LIVE_FEED_MAX_CLIENTS',
+                                      str(max(1, int(os.getenv('GUNICORN_THREADS', '8')) // 2))))
+LIVE_FEED_RETRY_SECONDS = int(os.getenv('LIVE_FEED_RETRY_SECONDS', '30'))  # clients turned away retry after this
+MQTT_WORKERS = int(os.getenv('MQTT_WORKERS', '2'))
+MQTT_QUEUE_SIZE = int(os.getenv('MQTT_QUEUE_SIZE', '10000'))
+
+# Readings older than the retention window live in the Parquet archive (see archive.py)
+ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', 'archive/sensor_data')
+sensor_archive = SensorArchive(ARCHIVE_DIR)
+
+def load_latest_sensor_data():
+    with app.app_context():
+        return SensorData.query.order_by(SensorData.timestamp.desc()).first()
+
+def record_status_transition(snapshot):
+    # Only persist a transition if another worker has not already done so
+    with app.app_context():
+        latest = SystemStatus.query.order_by(SystemStatus.id.desc()).first()
+        if latest is not None and latest.status == snapshot['status']:
+            return
+        db.session.add(SystemStatus(
+            status=snapshot['status'],
+            message=snapshot['message'],
+            sensor_status=snapshot['sensor_status']
+        ))
+        db.session.commit()
+        logger.info(f"System status transition to {snapshot['status']} saved to database")
+
+# New readings and status transitions are pushed to dashboards over SSE
+live_feed = EventBroadcaster(buffer_size=LIVE_FEED_BUFFER, max_dropped=LIVE_FEED_MAX_DROPPED,
+                             max_subscribers=LIVE_FEED_MAX_CLIENTS)
+
+def on_status_transition(snapshot):
+    record_status_transition(snapshot)
+    live_feed.publish('system-status', snapshot)
+
+def publish_sensor_rows(rows):
+    for row in rows:
+        live_feed.publish('sensor-data', row)
+
+# System status is computed from the last reading seen by the ingestion path
+status_tracker = SensorStatusTracker(
+    stale_after=STATUS_STALE_AFTER,
+    refresh_interval=STATUS_REFRESH_INTERVAL,
+    loader=load_latest_sensor_data,
+    on_transition=on_status_transition
+)
+
+def publish_tailed_rows(rows):
+    status_tracker.observe(rows)
+    publish_sensor_rows(rows)
+
+# Used by gunicorn workers, which do not ingest themselves under preload_app
+live_feed_tailer = SensorDataTailer(app, live_feed, publish_tailed_rows, interval=LIVE_FEED_POLL_INTERVAL)
+
+# Serialized /api/sensor-data bodies, reused until new readings are committed
+sensor_data_responses = ResponseCache(max_entries=int(os.getenv('SENSOR_RESPONSE_CACHE_SIZE', '64')))
+
+# Sensor readings are buffered and bulk-inserted by a writer thread
+ingestion_writer = SensorIngestionWriter(
+    app,
+    db,
+    max_queue_size=INGEST_QUEUE_SIZE,
+    batch_size=INGEST_BATCH_SIZE,
+    flush_interval=INGEST_FLUSH_INTERVAL,
+    put_timeout=INGEST_PUT_TIMEOUT,
+    before_commit=[apply_rollups],
+    after_commit=[sensor_data_responses.clear, status_tracker.observe, publish_sensor_rows]
+)
+
 # Initialize MQTT client
 mqtt_client = mqtt.Client(protocol=mqtt.MQTTv311)
+mqtt_supervisor = MqttSupervisor(
+    mqtt_client,
+    MQTT_BROKER,
+    MQTT_PORT,
+    keepalive=MQTT_KEEPALIVE,
+    min_delay=MQTT_RECONNECT_DELAY,
+    max_delay=MQTT_RECONNECT_MAX_DELAY
+)
 print("MQTT client initialized")
 
 # Initialize ML model with dataset
 dataset_path = os.path.join('data', 'crop_recommendation.csv')
 try:
-    model = CropRecommendationModel()
+    model = CropRecommendationModel(
+        cache_size=PREDICTION_CACHE_SIZE,
+        cache_ttl=PREDICTION_CACHE_TTL,
+        cache_precision=PREDICTION_CACHE_PRECISION,
+        model_dir=MODEL_DIR,
+        mmap_mode=MODEL_MMAP_MODE,
+        refresh_interval=MODEL_REFRESH_INTERVAL,
+        inference_engine=MODEL_INFERENCE_ENGINE,
+        backend=MODEL_BACKEND,
+        unknown_policy=UNKNOWN_CATEGORY_POLICY,
+        max_averaged_rows=MAX_AVERAGED_ROWS
+    )
     print("ML model initialized")
 except Exception as e:
     print(f"Error initializing ML model: {e}")
     sys.exit(1)
 
+training_jobs = TrainingJobManager(
+    model,
+    jobs_dir=os.path.join(MODEL_DIR, 'jobs'),
+    max_workers=TRAINING_WORKERS,
+    n_jobs=TRAINING_N_JOBS
+)
+
+# Load the model eagerly so that, under gunicorn's preload_app, it lives in
+# the master and every forked worker shares its pages instead of paying for
+# joblib.load on its first request
+if MODEL_PRELOAD:
+    try:
+        model.load_model()
+        print("ML model preloaded")
+    except Exception as e:
+        print(f"ML model not preloaded, it will be loaded on first prediction: {e}")
+
 def on_connect(client, userdata, flags, rc):
     if rc == 0:
         print("✅ Connected to MQTT broker successfully")
@@ -72,69 +227,54 @@ def on_connect(client, userdata, flags, rc):
         print("3: Connection refused - server unavailable")
         print("4: Connection refused - bad username or password")
         print("5: Connection refused - not authorized")
-        # Attempt to reconnect after delay
-        time.sleep(MQTT_RECONNECT_DELAY)
-        client.reconnect()
+        # The MQTT supervisor reconnects with backoff once the loop ends
 
 def on_disconnect(client, userdata, rc):
     if rc != 0:
         print(f"❌ Unexpected disconnection from MQTT broker with code: {rc}")
-        print("Attempting to reconnect...")
-        time.sleep(MQTT_RECONNECT_DELAY)
-        client.reconnect()
+        print("Reconnect scheduled by the MQTT supervisor...")
 
-def on_message(client, userdata, msg):
-    with app.app_context():
+def process_sensor_payload(raw_payload, received_at):
+    try:
+        payload = json.loads(raw_payload.decode())
+        # Validate payload: every field present and numeric
         try:
-            payload = json.loads(msg.payload.decode())
-            # Validate payload
-            required_fields = ['temperature', 'humidity', 'moisture', 'nitrogen', 'phosphorus', 'potassium']
-            if not all(field in payload for field in required_fields):
-                print("❌ Invalid payload: missing required fields")
-                return
-
-            # Create new sensor data entry
-            sensor_data = SensorData(
-                temperature=payload['temperature'],
-                humidity=payload['humidity'],
-                moisture=payload['moisture'],
-                nitrogen=payload['nitrogen'],
-                phosphorus=payload['phosphorus'],
-                potassium=payload['potassium']
-            )
-            db.session.add(sensor_data)
-            db.session.commit()
-            print("✅ Sensor data saved to database")
-        except json.JSONDecodeError:
-            print("❌ Error decoding JSON payload")
-        except Exception as e:
-            print(f"❌ Error processing MQTT message: {e}")
+            reading = coerce_sensor_reading(payload)
+        except ValueError as e:
+            print(f"❌ Invalid payload: {e}")
+            return
+
+        # Queue the new sensor data entry for the next bulk insert
+        ingestion_writer.submit(dict(reading, timestamp=received_at))
+    except json.JSONDecodeError:
+        print("❌ Error decoding JSON payload")
+
+# Decoding, validation and persistence run off the paho network thread
+message_processor = MqttMessageProcessor(
+    process_sensor_payload,
+    workers=MQTT_WORKERS,
+    max_queue_size=MQTT_QUEUE_SIZE
+)
+
+def on_message(client, userdata, msg):
+    if not message_processor.enqueue(msg.payload):
+        print("❌ MQTT message queue full, dropping message")
 
 def connect_mqtt():
-    try:
-        # Set up MQTT client with error handling
-        mqtt_client.on_connect = on_connect
-        mqtt_client.on_disconnect = on_disconnect
-        mqtt_client.on_message = on_message
-        
-        # Set username and password
-        mqtt_client.username_pw_set(MQTT_USER, MQTT_PASSWORD)
-        
-        # Set TLS/SSL
-        mqtt_client.tls_set()
-        
-        # Connect to broker
-        print(f"Connecting to MQTT broker at {MQTT_BROKER}:{MQTT_PORT}...")
-        mqtt_client.connect(MQTT_BROKER, MQTT_PORT, MQTT_KEEPALIVE)
-        
-        # Start the loop
-        mqtt_client.loop_start()
-        
-    except Exception as e:
-        print(f"❌ Error connecting to MQTT broker: {e}")
-        print("Retrying in 5 seconds...")
-        time.sleep(MQTT_RECONNECT_DELAY)
-        connect_mqtt()
+    # Set up MQTT client with error handling
+    mqtt_client.on_connect = on_connect
+    mqtt_client.on_disconnect = on_disconnect
+    mqtt_client.on_message = on_message
+    
+    # Set username and password
+    mqtt_client.username_pw_set(MQTT_USER, MQTT_PASSWORD)
+    
+    # Set TLS/SSL
+    mqtt_client.tls_set()
+    
+    # Connect, run the loop and reconnect on a background thread
+    print(f"Starting MQTT supervisor for {MQTT_BROKER}:{MQTT_PORT}...")
+    mqtt_supervisor.start()
 
 # Initial MQTT connection
 connect_mqtt()
@@ -142,19 +282,105 @@ connect_mqtt()
 # Create database tables
 with app.app_context():
     db.create_all()
+    create_missing_columns(db.engine)
+    create_missing_indexes(db.engine)
+
+ingestion_writer.start()
+message_processor.start()
+
+def not_modified(etag):
+    """Return a 304 response if the client already has this (weak) ETag"""
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    return None
 
 @app.route('/api/sensor-data', methods=['GET'])
 def get_sensor_data():
     try:
         logger.info("Fetching sensor data...")
-        # Get the last 24 hours of data
-        data = SensorData.query.order_by(SensorData.timestamp.desc()).limit(100).all()
-        logger.info(f"Found {len(data)} sensor records")
-        return jsonify([item.to_dict() for item in data])
+        try:
+            since = parse_timestamp(request.args.get('since'))
+            until = parse_timestamp(request.args.get('until'))
+            limit = parse_limit(request.args.get('limit'))
+            cursor = request.args.get('cursor')
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # The newest row changes whenever readings are ingested, the archive stamp on archival runs
+        latest = db.session.query(SensorData.id, SensorData.timestamp).order_by(SensorData.id.desc()).first()
+        cache_key = request.query_string
+        etag = weak_etag(latest.id if latest else None, latest.timestamp if latest else None,
+                         sensor_archive.stamp(), cache_key)
+        unchanged = not_modified(etag)
+        if unchanged is not None:
+            return unchanged
+
+        cached = sensor_data_responses.get(cache_key, etag)
+        if cached is None:
+            try:
+                data, next_cursor = query_sensor_page(since, until, limit, cursor, archive=sensor_archive)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+            logger.info(f"Found {len(data)} sensor records")
+            cached = (json.dumps([item.to_dict() for item in data]), next_cursor)
+            sensor_data_responses.put(cache_key, etag, cached)
+
+        body, next_cursor = cached
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'no-cache'
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response
     except Exception as e:
         logger.error(f"Error fetching sensor data: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/sensor-data/rollup', methods=['GET'])
+def get_sensor_rollups():
+    try:
+        try:
+            resolution = request.args.get('resolution', 'hour')
+            since = parse_timestamp(request.args.get('since'))
+            until = parse_timestamp(request.args.get('until'))
+            limit = parse_rollup_limit(request.args.get('limit'), resolution, since, until)
+            data = query_rollups(resolution, since, until, limit)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        return jsonify([item.to_dict() for item in data])
+    except Exception as e:
+        logger.error(f"Error fetching sensor rollups: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+def record_farmer_input(data, result):
+    """Store a prediction's input for later confirmation; returns its id,
+    or None if it could not be written (the prediction still succeeds)"""
+    try:
+        farmer_input = FarmerInput(
+            soil_type=data['soil_type'],
+            weather=data['weather'],
+            region=data['region'],
+            temperature=data['temperature'],
+            humidity=data['humidity'],
+            moisture=data['moisture'],
+            nitrogen=data['N'],
+            phosphorus=data['P'],
+            potassium=data['K'],
+            rainfall=data['rainfall'],
+            prediction=result['crop'],
+            confidence=result['confidence']
+        )
+        db.session.add(farmer_input)
+        db.session.commit()
+        return farmer_input.id
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error recording farmer input: {str(e)}")
+        return None
+
 @app.route('/api/predict', methods=['POST'])
 def predict():
     try:
@@ -162,9 +388,7 @@ def predict():
         logger.info(f"Received prediction request with data: {data}")
         
         # Validate required fields
-        required_fields = ['N', 'P', 'K', 'temperature', 'humidity', 'moisture', 'rainfall', 
-                         'soil_type', 'weather', 'region']
-        missing_fields = [field for field in required_fields if field not in data]
+        missing_fields = [field for field in PREDICTION_REQUIRED_FIELDS if field not in data]
         if missing_fields:
             return jsonify({
                 'error': f'Missing required fields: {missing_fields}'
@@ -173,15 +397,107 @@ def predict():
         # Make prediction
         result = model.predict(data)
         logger.info(f"Prediction result: {result}")
+
+        # Only clients that will confirm the planted crop pay for a database write
+        if data.get('record'):
+            result = dict(result, input_id=record_farmer_input(data, result))
         
         return jsonify(result)
         
+    except UnknownCategoryError as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
     except Exception as e:
         logger.error(f"Error in prediction: {str(e)}")
         return jsonify({
             'error': str(e)
         }), 500
 
+@app.route('/api/predict/<int:input_id>/confirm', methods=['POST'])
+def confirm_prediction(input_id):
+    try:
+        data = request.get_json() or {}
+        crop = data.get('crop')
+        if not isinstance(crop, str) or not crop:
+            return jsonify({
+                'error': 'crop is required'
+            }), 400
+
+        farmer_input = db.session.get(FarmerInput, input_id)
+        if farmer_input is None:
+            return jsonify({
+                'error': 'Unknown input id'
+            }), 404
+        if farmer_input.confirmed_crop is not None:
+            # A second confirmation would move it past the incremental
+            # training watermark and train on the same input twice
+            return jsonify({
+                'error': 'Input already confirmed'
+            }), 409
+
+        # Confirmed inputs feed the next incremental training run
+        farmer_input.confirmed_crop = crop
+        farmer_input.confirmed_at = datetime.utcnow()
+        db.session.commit()
+        return jsonify(farmer_input.to_dict())
+
+    except Exception as e:
+        logger.error(f"Error confirming prediction: {str(e)}")
+        return jsonify({
+            'error': str(e)
+        }), 500
+
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_batch():
+    try:
+        data = request.get_json()
+        records = data.get('records') if isinstance(data, dict) else data
+        if not isinstance(records, list):
+            return jsonify({
+                'error': 'Expected a list of records or {"records": [...]}'
+            }), 400
+        if len(records) > MAX_BATCH_SIZE:
+            return jsonify({
+                'error': f'Batch too large: {len(records)} records (max {MAX_BATCH_SIZE})'
+            }), 400
+
+        # Validate required fields for every record before predicting
+        for index, record in enumerate(records):
+            if not isinstance(record, dict):
+                return jsonify({
+                    'error': f'Record {index} is not an object'
+                }), 400
+            missing_fields = [field for field in PREDICTION_REQUIRED_FIELDS if field not in record]
+            if missing_fields:
+                return jsonify({
+                    'error': f'Record {index} is missing required fields: {missing_fields}'
+                }), 400
+
+        logger.info(f"Received batch prediction request with {len(records)} records")
+        results = model.predict_batch(records)
+
+        return jsonify({
+            'predictions': results,
+            'count': len(results)
+        })
+
+    except UnknownCategoryError as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        logger.error(f"Error in batch prediction: {str(e)}")
+        return jsonify({
+            'error': str(e)
+        }), 500
+
+@app.route('/api/predict/cache-stats', methods=['GET'])
+def prediction_cache_stats():
+    if model.cache is None:
+        return jsonify({'enabled': False})
+    return jsonify(dict(model.cache.stats(), enabled=True))
+
 @app.route('/api/train', methods=['POST'])
 def train():
     try:
@@ -191,10 +507,22 @@ def train():
                 'error': 'dataset_path is required'
             }), 400
             
-        model.train(data['dataset_path'])
+        # Fit in the background; the live model is swapped when the job finishes
+        try:
+            job_id = training_jobs.submit(
+                data['dataset_path'],
+                backend=data.get('backend'),
+                search=data.get('search'),
+                cv=data.get('cv', 5),
+                n_iter=data.get('n_iter', 20)
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         return jsonify({
-            'message': 'Model trained successfully'
-        })
+            'message': 'Training job submitted',
+            'job_id': job_id,
+            'status_url': f'/api/train/{job_id}'
+        }), 202
         
     except Exception as e:
         logger.error(f"Error in training: {str(e)}")
@@ -202,47 +530,108 @@ def train():
             'error': str(e)
         }), 500
 
+@app.route('/api/train/incremental', methods=['POST'])
+def train_incremental():
+    try:
+        data = request.get_json(silent=True) or {}
+        manifest = model.registry.read_manifest()
+        if manifest is None:
+            return jsonify({
+                'error': 'No model version to extend; run a full training first'
+            }), 409
+
+        # Only inputs confirmed since the active version was trained
+        watermark = manifest['metadata'].get('incremental_watermark')
+        records, new_watermark = load_confirmed_inputs(watermark)
+        if not records:
+            return jsonify({
+                'message': 'No new confirmed inputs',
+                'job_id': None
+            })
+
+        try:
+            job_id = training_jobs.submit_incremental(
+                records,
+                new_watermark,
+                n_new_trees=data.get('trees', INCREMENTAL_TREES),
+                max_estimators=data.get('max_trees', INCREMENTAL_MAX_TREES)
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify({
+            'message': 'Incremental training job submitted',
+            'job_id': job_id,
+            'n_records': len(records),
+            'status_url': f'/api/train/{job_id}'
+        }), 202
+
+    except Exception as e:
+        logger.error(f"Error in incremental training: {str(e)}")
+        return jsonify({
+            'error': str(e)
+        }), 500
+
+@app.route('/api/train/<job_id>', methods=['GET'])
+def train_status(job_id):
+    job = training_jobs.get(job_id)
+    if job is None:
+        return jsonify({
+            'error': f'Unknown training job: {job_id}'
+        }), 404
+    return jsonify(job)
+
+@app.route('/api/ingestion/stats', methods=['GET'])
+def ingestion_stats():
+    return jsonify({
+        'mqtt': mqtt_supervisor.stats(),
+        'live_feed': live_feed.stats(),
+        'processor': message_processor.stats(),
+        'writer': ingestion_writer.stats()
+    })
+
+@app.route('/api/stream', methods=['GET'])
+def stream():
+    subscription = live_feed.subscribe()
+    if subscription is None:
+        # Too many open streams: turn the client away instead of pinning another thread
+        return Response(f'retry: {LIVE_FEED_RETRY_SECONDS * 1000}\n\n', status=503,
+                        mimetype='text/event-stream',
+                        headers={'Retry-After': str(LIVE_FEED_RETRY_SECONDS)})
+
+    def generate():
+        try:
+            status_tracker.refresh()
+            yield format_sse('system-status', status_tracker.snapshot())
+            deadline = time.monotonic() + LIVE_FEED_MAX_SECONDS
+            while not subscription.closed and time.monotonic() < deadline:
+                message = subscription.get(timeout=LIVE_FEED_HEARTBEAT)
+                if message is None:
+                    # Also surfaces online -> error transitions when data stops
+                    status_tracker.snapshot()
+                    yield ': keepalive\n\n'
+                else:
+                    yield message
+        finally:
+            live_feed.unsubscribe(subscription)
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route('/api/system-status', methods=['GET'])
 def get_system_status():
     try:
-        logger.info("Fetching system status...")
-        # Get latest sensor data
-        latest_data = SensorData.query.order_by(SensorData.timestamp.desc()).first()
-        
-        if not latest_data:
-            status = "offline"
-            message = "No sensor data available"
-            logger.warning("System status: offline - No sensor data")
-        else:
-            # Check if data is recent (within last 5 minutes)
-            time_diff = datetime.utcnow() - latest_data.timestamp
-            if time_diff.total_seconds() > 300:
-                status = "error"
-                message = "Sensor data is not recent"
-                logger.warning("System status: error - Data not recent")
-            else:
-                status = "online"
-                message = "System is functioning normally"
-                logger.info("System status: online")
-
-        # Create system status entry
-        system_status = SystemStatus(
-            status=status,
-            message=message,
-            sensor_status={
-                'temperature': latest_data.temperature if latest_data else None,
-                'humidity': latest_data.humidity if latest_data else None,
-                'moisture': latest_data.moisture if latest_data else None,
-                'nitrogen': latest_data.nitrogen if latest_data else None,
-                'phosphorus': latest_data.phosphorus if latest_data else None,
-                'potassium': latest_data.potassium if latest_data else None
-            }
-        )
-        db.session.add(system_status)
-        db.session.commit()
-        logger.info("System status saved to database")
-
-        return jsonify(system_status.to_dict())
+        status_tracker.refresh()
+        snapshot = status_tracker.snapshot()
+        etag = weak_etag(snapshot['status'], snapshot['last_seen'])
+        unchanged = not_modified(etag)
+        if unchanged is not None:
+            return unchanged
+        response = jsonify(snapshot)
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
     except Exception as e:
         logger.error(f"Error fetching system status: {str(e)}")
         return jsonify({"error": str(e)}), 500
@@ -0,0 +1,203 @@
+import argparse
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from models import SensorData
+
+logger = logging.getLogger(__name__)
+
+# SQLite may hand out an archived row's id again once the table has been
+# emptied, so archived rows are only duplicates if both id and timestamp match
+ROW_KEY = ['id', 'timestamp']
+
+ARCHIVE_COLUMNS = ['id', 'timestamp', 'temperature', 'humidity', 'moisture',
+                   'nitrogen', 'phosphorus', 'potassium', 'prediction', 'confidence']
+
+ARCHIVE_SCHEMA = pa.schema([
+    ('id', pa.int64()),
+    ('timestamp', pa.timestamp('us')),
+    ('temperature', pa.float32()),
+    ('humidity', pa.float32()),
+    ('moisture', pa.int32()),
+    ('nitrogen', pa.float32()),
+    ('phosphorus', pa.float32()),
+    ('potassium', pa.float32()),
+    ('prediction', pa.string()),
+    ('confidence', pa.float32())
+])
+
+class SensorArchive:
+    """Date-partitioned Parquet archive of SensorData rows.
+
+    Layout: <root>/date=YYYY-MM-DD/part-<uuid>.parquet. Rows are written
+    before they are deleted from the database, so an interrupted run can
+    leave duplicates but never lose data; readers drop duplicate ids.
+    """
+
+    def __init__(self, root='archive/sensor_data'):
+        self.root = root
+        self.marker_path = os.path.join(root, '_last_run')
+
+    def stamp(self):
+        """Cheap change marker, bumped by every archival run"""
+        try:
+            return os.stat(self.marker_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def partitions(self):
+        """Return archived partition dates, oldest first"""
+        if not os.path.isdir(self.root):
+            return []
+        dates = []
+        for name in os.listdir(self.root):
+            if name.startswith('date='):
+                dates.append(datetime.strptime(name[len('date='):], '%Y-%m-%d').date())
+        return sorted(dates)
+
+    def archive_older_than(self, session, cutoff, chunk_size=50000):
+        """Move rows with timestamp < cutoff out of the database"""
+        archived = 0
+        columns = [getattr(SensorData, column) for column in ARCHIVE_COLUMNS]
+        while True:
+            rows = (session.query(*columns)
+                    .filter(SensorData.timestamp < cutoff)
+                    .order_by(SensorData.timestamp, SensorData.id)
+                    .limit(chunk_size).all())
+            if not rows:
+                break
+            df = pd.DataFrame(rows, columns=ARCHIVE_COLUMNS)
+            for day, part in df.groupby(df['timestamp'].dt.date):
+                self._write_partition(day, part)
+            session.query(SensorData).filter(SensorData.id.in_(df['id'].tolist())).delete(synchronize_session=False)
+            session.commit()
+            archived += len(df)
+            logger.info(f"Archived {len(df)} sensor readings")
+        if archived:
+            self._touch_marker()
+        return archived
+
+    def read(self, since=None, until=None):
+        """Read archived rows with since <= timestamp < until as a DataFrame"""
+        frames = []
+        for day in self.partitions():
+            if since is not None and day < since.date():
+                continue
+            if until is not None and day > until.date():
+                continue
+            frames.append(self._read_partition(day))
+        if not frames:
+            return pd.DataFrame(columns=ARCHIVE_COLUMNS)
+        df = pd.concat(frames, ignore_index=True).drop_duplicates(ROW_KEY)
+        if since is not None:
+            df = df[df['timestamp'] >= since]
+        if until is not None:
+            df = df[df['timestamp'] < until]
+        return df.sort_values(['timestamp', 'id'], ignore_index=True)
+
+    def iter_records(self):
+        """Yield every archived row as a SensorData keyword dict, oldest day first"""
+        for day in self.partitions():
+            df = self._read_partition(day).drop_duplicates(ROW_KEY)
+            yield from _records(df.sort_values(['timestamp', 'id']))
+
+    def read_page(self, since=None, until=None, before=None, limit=100):
+        """Newest-first archived rows, continuing below the (timestamp, id)
+        keyset `before`; reads only as many daily partitions as the page needs"""
+        upper = until
+        if before is not None and (upper is None or before[0] < upper):
+            upper = before[0]
+        collected = 0
+        frames = []
+        for day in reversed(self.partitions()):
+            if upper is not None and day > upper.date():
+                continue
+            if since is not None and day < since.date():
+                break
+            df = self._read_partition(day).drop_duplicates(ROW_KEY)
+            if since is not None:
+                df = df[df['timestamp'] >= since]
+            if until is not None:
+                df = df[df['timestamp'] < until]
+            if before is not None:
+                df = df[(df['timestamp'] < before[0]) |
+                        ((df['timestamp'] == before[0]) & (df['id'] < before[1]))]
+            frames.append(df)
+            collected += len(df)
+            if collected >= limit:
+                break
+        if not frames:
+            return []
+        df = pd.concat(frames, ignore_index=True)
+        df = df.sort_values(['timestamp', 'id'], ascending=False).head(limit)
+        return [SensorData(**record) for record in _records(df)]
+
+    def _partition_dir(self, day):
+        return os.path.join(self.root, f'date={day.isoformat()}')
+
+    def _read_partition(self, day):
+        table = pq.read_table(self._partition_dir(day), schema=ARCHIVE_SCHEMA)
+        return table.to_pandas(coerce_temporal_nanoseconds=True)
+
+    def _write_partition(self, day, df):
+        directory = self._partition_dir(day)
+        os.makedirs(directory, exist_ok=True)
+        table = pa.Table.from_pandas(df[ARCHIVE_COLUMNS], schema=ARCHIVE_SCHEMA, preserve_index=False)
+        path = os.path.join(directory, f'part-{uuid.uuid4().hex}.parquet')
+        tmp_path = os.path.join(directory, f'.{os.path.basename(path)}.tmp')
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+
+    def _touch_marker(self):
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.marker_path, 'w') as f:
+            f.write(datetime.utcnow().isoformat())
+
+def _records(df):
+    """DataFrame rows as SensorData keyword dicts with native Python values"""
+    for record in df.to_dict('records'):
+        record['timestamp'] = record['timestamp'].to_pydatetime()
+        for key, value in record.items():
+            if isinstance(value, float) and pd.isna(value):
+                record[key] = None
+        yield record
+
+def read_sensor_history(session, archive, since=None, until=None):
+    """Unified reader over archived and live SensorData, oldest first"""
+    query = session.query(*[getattr(SensorData, column) for column in ARCHIVE_COLUMNS])
+    if since is not None:
+        query = query.filter(SensorData.timestamp >= since)
+    if until is not None:
+        query = query.filter(SensorData.timestamp < until)
+    live = pd.DataFrame(query.all(), columns=ARCHIVE_COLUMNS)
+    archived = archive.read(since, until)
+    frames = [frame for frame in (archived, live) if len(frame)]
+    if not frames:
+        return pd.DataFrame(columns=ARCHIVE_COLUMNS)
+    df = pd.concat(frames, ignore_index=True).drop_duplicates(ROW_KEY, keep='last')
+    return df.sort_values(['timestamp', 'id'], ignore_index=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive old sensor readings to Parquet")
+    parser.add_argument('--retention-days', type=int,
+                        default=int(os.getenv('SENSOR_RETENTION_DAYS', '90')))
+    parser.add_argument('--vacuum', action='store_true', help="Reclaim SQLite space afterwards")
+    args = parser.parse_args()
+
+    # A bare app: importing app.py would also start MQTT ingestion in this process
+    from database import create_db_app
+    from models import db
+    app = create_db_app()
+    sensor_archive = SensorArchive(os.getenv('ARCHIVE_DIR', 'archive/sensor_data'))
+    with app.app_context():
+        cutoff = datetime.utcnow() - timedelta(days=args.retention_days)
+        count = sensor_archive.archive_older_than(db.session, cutoff)
+        print(f"✅ Archived {count} sensor readings older than {cutoff.isoformat()}")
+        if args.vacuum and db.engine.dialect.name == 'sqlite':
+            with db.engine.connect() as connection:
+                connection.exec_driver_sql('VACUUM')
+            print("✅ Database vacuumed")
@@ -0,0 +1,180 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+from forest_engine import FlatForest
+from ml_model import CropRecommendationModel
+from model_backends import BACKENDS, create_estimator, release_cores, serving_predictor
+from dataset_loader import REQUIRED_COLUMNS, read_header
+from synthetic_dataset import generate_dataset
+
+# The public crop recommendation data, relative to backend/
+DEFAULT_DATASET = os.path.join('..', 'data', 'Crop_recommendation.csv')
+FEATURE_SETS = ('model', 'csv')
+
+def _latency_us(predictor, X, rows):
+    """Median and p95 single-row predict_proba latency in microseconds"""
+    timings = []
+    for i in range(min(rows, len(X))):
+        row = X[i:i + 1]
+        start = time.perf_counter()
+        predictor.predict_proba(row)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return float(np.median(timings)), float(np.percentile(timings, 95))
+
+def _measure(name, estimator, predictor, X_test, y_test, fit_seconds, latency_rows):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'model.joblib')
+        joblib.dump(estimator, path)
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        joblib.load(path)
+        load_seconds = time.perf_counter() - start
+
+    # Warm up once so lazy initialisation is not billed to the first row
+    predictor.predict_proba(X_test[:1])
+    start = time.perf_counter()
+    probabilities = predictor.predict_proba(X_test)
+    batch_seconds = time.perf_counter() - start
+    predictions = predictor.classes_[probabilities.argmax(axis=1)]
+    p50, p95 = _latency_us(predictor, X_test, latency_rows)
+    return {
+        'backend': name,
+        'accuracy': float((predictions == y_test).mean()),
+        'fit_seconds': fit_seconds,
+        'size_bytes': size,
+        'load_ms': load_seconds * 1e3,
+        'latency_p50_us': p50,
+        'latency_p95_us': p95,
+        'batch_rows_per_second': len(X_test) / batch_seconds
+    }
+
+def load_csv_features(dataset_path):
+    """(X, y) from a CSV's own numeric columns, for data the model's feature
+    set does not fit (e.g. ph instead of moisture, no categoricals)"""
+    df = pd.read_csv(dataset_path)
+    if 'label' not in df.columns:
+        raise ValueError("Missing required columns: ['label']")
+    columns = [col for col in df.select_dtypes('number').columns if col != 'label']
+    if not columns:
+        raise ValueError(f"No numeric feature columns in {dataset_path}")
+    return df[columns].to_numpy(np.float64), df['label'].astype(str).to_numpy()
+
+def run_benchmark(dataset_path, backends=None, test_size=0.2, latency_rows=200, features=None):
+    """Train every backend on the same split and measure it
+
+    `features` is 'model' (the app's encoded feature set) or 'csv' (the
+    file's own numeric columns); by default 'model' when the file has the
+    columns it needs.
+    """
+    if features is None:
+        header = read_header(dataset_path)
+        features = 'model' if all(col in header for col in REQUIRED_COLUMNS) else 'csv'
+    if features not in FEATURE_SETS:
+        raise ValueError(f"Unknown feature set: {features!r}")
+    if features == 'model':
+        X, y = CropRecommendationModel().load_features(dataset_path)
+    else:
+        X, y = load_csv_features(dataset_path)
+    stratify = y if np.unique(y, return_counts=True)[1].min() >= 2 else None
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=42, stratify=stratify
+    )
+
+    results = []
+    for name in backends or list(BACKENDS):
+        estimator = create_estimator(name)
+        start = time.perf_counter()
+        estimator.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - start
+        # Measured the way the app serves it
+        release_cores(estimator)
+        results.append(_measure(name, estimator, serving_predictor(estimator), X_test, y_test,
+                                fit_seconds, latency_rows))
+        if isinstance(estimator, RandomForestClassifier):
+            # The engine the app serves forests with by default
+            results.append(_measure(f'{name} (flat)', estimator, FlatForest.from_sklearn(estimator),
+                                    X_test, y_test, fit_seconds, latency_rows))
+    for result in results:
+        result['features'] = features
+    return results
+
+def measure_preprocess_memory(dataset_path):
+    """Peak traced memory of turning a loaded dataset into (X, y)
+
+    The loaded frame is allocated before tracing starts, so the peak is
+    what preprocessing itself adds on top of it; ideally just X and y.
+    """
+    model = CropRecommendationModel(feature_cache=False)
+    df = model.load_data(dataset_path)
+    tracemalloc.start()
+    try:
+        X, y = model.preprocess_data(df)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    matrix_bytes = X.nbytes + y.nbytes
+    return {
+        'rows': len(X),
+        'frame_bytes': int(df.memory_usage(deep=True).sum()),
+        'matrix_bytes': matrix_bytes,
+        'peak_bytes': peak,
+        'peak_to_matrix': peak / matrix_bytes
+    }
+
+def format_table(results):
+    """Render benchmark results as a fixed-width table"""
+    header = (f"{'backend':<26}{'accuracy':>9}{'fit s':>8}{'size KiB':>10}"
+              f"{'load ms':>9}{'p50 us':>10}{'p95 us':>10}{'rows/s':>11}")
+    lines = [header, '-' * len(header)]
+    for r in results:
+        lines.append(
+            f"{r['backend']:<26}{r['accuracy']:>9.4f}{r['fit_seconds']:>8.2f}{r['size_bytes'] / 1024:>10.1f}"
+            f"{r['load_ms']:>9.1f}{r['latency_p50_us']:>10.1f}{r['latency_p95_us']:>10.1f}"
+            f"{r['batch_rows_per_second']:>11.0f}"
+        )
+    return '\n'.join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare model backends on accuracy, size, load time and latency")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--dataset', default=DEFAULT_DATASET)
+    source.add_argument('--synthetic', type=int, metavar='SAMPLES',
+                        help="Use this many rows of generated data instead of a CSV")
+    parser.add_argument('--features', choices=FEATURE_SETS,
+                        help="Default: 'model' if the dataset has the app's columns, else 'csv'")
+    parser.add_argument('--backends', nargs='+', choices=list(BACKENDS), help="Default: all backends")
+    parser.add_argument('--latency-rows', type=int, default=200)
+    parser.add_argument('--json', dest='json_path', help="Also write the results to this file")
+    parser.add_argument('--memory', action='store_true',
+                        help="Measure peak preprocessing memory instead of comparing backends")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if args.synthetic is not None:
+            args.dataset = os.path.join(tmpdir, 'synthetic_crop_recommendation.csv')
+            generate_dataset(args.synthetic).to_csv(args.dataset, index=False)
+            print(f"Using {args.synthetic} synthetic samples")
+        if args.memory:
+            results = measure_preprocess_memory(args.dataset)
+            print(f"rows: {results['rows']}")
+            print(f"loaded frame: {results['frame_bytes'] / 1e6:.1f} MB")
+            print(f"X + y: {results['matrix_bytes'] / 1e6:.1f} MB")
+            print(f"peak during preprocessing: {results['peak_bytes'] / 1e6:.1f} MB "
+                  f"({results['peak_to_matrix']:.2f}x X + y)")
+        else:
+            results = run_benchmark(args.dataset, args.backends, latency_rows=args.latency_rows,
+                                    features=args.features)
+            print(f"Features: {results[0]['features']}")
+            print(format_table(results))
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Results written to {args.json_path}")
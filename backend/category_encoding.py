@@ -0,0 +1,85 @@
+from itertools import repeat
+import numpy as np
+from dataset_loader import CATEGORICAL_DEFAULTS
+
+# What to do with a category the model was not trained on:
+#   'error'   - reject the input (UnknownCategoryError)
+#   'average' - predict with every known category of the column in turn and
+#               average the probabilities, so no known category is favoured
+#   'default' - use the column's default category (the value the dataset
+#               loader fills in); columns whose default was never seen are
+#               averaged instead
+UNKNOWN_POLICIES = ('error', 'average', 'default')
+
+class UnknownCategoryError(ValueError):
+    pass
+
+class CategoryEncoder:
+    """Lookup tables for the categorical features of one fitted model.
+
+    Built once per model version from its label encoders: one
+    category -> code dict per column, so encoding costs a hash lookup per
+    value instead of LabelEncoder's sorted search, and a batch is encoded
+    column by column straight into an array. Unseen categories map to a
+    fallback according to `policy` (see UNKNOWN_POLICIES). Values in an
+    averaged column are encoded as 0 and flagged unknown; the model
+    replaces them with every known code (see CropRecommendationModel).
+    """
+
+    def __init__(self, label_encoders, policy='error', defaults=CATEGORICAL_DEFAULTS):
+        if policy not in UNKNOWN_POLICIES:
+            raise ValueError(f"Unknown category policy: {policy!r}")
+        self.policy = policy
+        self.codes = {}
+        self.fallback_codes = {}
+        # Columns whose unseen values are averaged over every known code
+        self.averaged = set()
+        for col, encoder in label_encoders.items():
+            classes = encoder.classes_.tolist()
+            self.codes[col] = {category: code for code, category in enumerate(classes)}
+            if policy == 'default' and defaults.get(col) in self.codes[col]:
+                self.fallback_codes[col] = self.codes[col][defaults[col]]
+            elif policy != 'error':
+                self.averaged.add(col)
+                self.fallback_codes[col] = 0
+
+    def __contains__(self, col):
+        return col in self.codes
+
+    def is_known(self, col, value):
+        try:
+            return value in self.codes[col]
+        except TypeError:
+            return False
+
+    def encode_known(self, col, value):
+        """Return the code of a known value, or -1"""
+        try:
+            return self.codes[col].get(value, -1)
+        except TypeError:
+            return -1
+
+    def encode(self, col, value):
+        """Return (code, known) for one value"""
+        try:
+            return self.codes[col][value], True
+        except (KeyError, TypeError):
+            return self._fallback(col, value), False
+
+    def encode_many(self, col, values):
+        """Return (codes, known mask) for a sequence of values"""
+        table = self.codes[col]
+        try:
+            codes = np.fromiter(map(table.get, values, repeat(-1)), dtype=np.int64, count=len(values))
+        except TypeError:
+            # Unhashable values (lists, dicts) are simply unknown
+            codes = np.array([self.encode_known(col, v) for v in values], dtype=np.int64)
+        known = codes >= 0
+        if not known.all():
+            codes[~known] = self._fallback(col, values[int(np.argmin(known))])
+        return codes, known
+
+    def _fallback(self, col, value):
+        if col not in self.fallback_codes:
+            raise UnknownCategoryError(f"Unknown {col}: {value!r}")
+        return self.fallback_codes[col]
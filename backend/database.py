@@ -0,0 +1,97 @@
+import logging
+import os
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATABASE_URL = 'sqlite:///crop_recommendation.db'
+
+# SQLite connection profile; every pragma is applied to each new connection
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))  # bytes
+SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', '-65536'))  # negative = KiB
+
+# Connection pool sizing, per process
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))  # seconds
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))  # seconds
+
+def database_url():
+    """DATABASE_URL if set (e.g. a pooled PostgreSQL server), else the local SQLite file"""
+    url = os.getenv('DATABASE_URL') or DEFAULT_DATABASE_URL
+    # Heroku-style URLs use a scheme SQLAlchemy 2.0 no longer accepts
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+def _is_memory_sqlite(url):
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+def engine_options(url):
+    """SQLALCHEMY_ENGINE_OPTIONS for the given database URL"""
+    url = make_url(url)
+    if url.get_backend_name() == 'sqlite':
+        if _is_memory_sqlite(url):
+            # Flask-SQLAlchemy pins in-memory databases to a single connection
+            return {}
+        return {
+            # The sqlite3 driver's own lock wait, in seconds, matches busy_timeout
+            'connect_args': {'timeout': SQLITE_BUSY_TIMEOUT_MS / 1000.0, 'check_same_thread': False},
+            'pool_size': DB_POOL_SIZE,
+            'max_overflow': DB_MAX_OVERFLOW,
+            'pool_timeout': DB_POOL_TIMEOUT
+        }
+    return {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': True
+    }
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None):
+    """Put a new SQLite connection into WAL mode with the tuning profile.
+
+    In WAL mode readers see the last committed snapshot and never wait
+    for the ingestion writer; synchronous=NORMAL only fsyncs at
+    checkpoints, which is still crash-safe for WAL.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute(f'PRAGMA synchronous={SQLITE_SYNCHRONOUS}')
+        cursor.execute(f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}')
+        cursor.execute(f'PRAGMA mmap_size={SQLITE_MMAP_SIZE}')
+        cursor.execute(f'PRAGMA cache_size={SQLITE_CACHE_SIZE}')
+    finally:
+        cursor.close()
+
+def configure_engine(engine):
+    """Register per-connection setup for the engine's dialect"""
+    if engine.dialect.name == 'sqlite' and not _is_memory_sqlite(engine.url):
+        event.listen(engine, 'connect', apply_sqlite_pragmas)
+        logger.info("SQLite engine configured for WAL mode")
+    return engine
+
+def create_db_app():
+    """A bare Flask app bound to the configured database, for scripts.
+
+    Importing app.py starts the MQTT client, ingestion writer and model;
+    cron jobs such as archive.py only need the database session, and
+    must not subscribe to the broker and ingest readings themselves.
+    """
+    from dotenv import load_dotenv
+    from flask import Flask
+    from models import db
+    load_dotenv()
+    app = Flask(__name__)  # same root, so relative SQLite paths resolve to the same instance folder
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url()
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        configure_engine(db.engine)
+    return app
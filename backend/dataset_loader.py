@@ -0,0 +1,98 @@
+import logging
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 100000
+
+# Compact dtypes: sensor counts fit in int16, measurements in float32 and the
+# categorical columns repeat a handful of strings
+INTEGER_COLUMNS = ['N', 'P', 'K', 'moisture']
+FLOAT_COLUMNS = ['temperature', 'humidity', 'rainfall']
+NUMERIC_COLUMNS = INTEGER_COLUMNS + FLOAT_COLUMNS
+CATEGORY_COLUMNS = ['soil_type', 'weather', 'region', 'label']
+REQUIRED_COLUMNS = ['N', 'P', 'K', 'temperature', 'humidity', 'moisture', 'rainfall', 'label']
+
+# Filled in when an export does not carry the column at all
+CATEGORICAL_DEFAULTS = {
+    'soil_type': 'alluvial',
+    'weather': 'sunny',
+    'region': 'karnataka'
+}
+
+INT16_MIN, INT16_MAX = np.iinfo(np.int16).min, np.iinfo(np.int16).max
+
+def read_header(file_path):
+    """Return the column names of a CSV without reading its rows"""
+    return list(pd.read_csv(file_path, nrows=0).columns)
+
+def _dataset_columns(file_path):
+    header = read_header(file_path)
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in header]
+    if missing_columns:
+        raise ValueError(f"Missing required columns: {missing_columns}")
+    return [col for col in NUMERIC_COLUMNS + CATEGORY_COLUMNS if col in header]
+
+def _validate_chunk(chunk, first_row):
+    """Check one chunk and narrow its integer columns to int16"""
+    for col in chunk.columns:
+        missing = chunk[col].isna().to_numpy()
+        if missing.any():
+            raise ValueError(f"Missing values in {col} at row {first_row + int(missing.argmax())}")
+    for col in NUMERIC_COLUMNS:
+        infinite = np.isinf(chunk[col].to_numpy())
+        if infinite.any():
+            raise ValueError(f"Infinite value in {col} at row {first_row + int(infinite.argmax())}")
+    for col in INTEGER_COLUMNS:
+        values = chunk[col].to_numpy()
+        bad = (values != np.round(values)) | (values < INT16_MIN) | (values > INT16_MAX)
+        if bad.any():
+            row = int(bad.argmax())
+            raise ValueError(f"Invalid {col} value {values[row]!r} at row {first_row + row}: "
+                             f"expected an integer between {INT16_MIN} and {INT16_MAX}")
+        chunk[col] = values.astype(np.int16)
+    return chunk
+
+def iter_dataset_chunks(file_path, chunksize=DEFAULT_CHUNK_SIZE, validate=True):
+    """Yield validated chunks of a training CSV with compact dtypes
+
+    Only the columns the model uses are parsed. Integer columns are read
+    as float32 first so that values like '90.0' are accepted, then
+    checked and narrowed to int16. With validate=False chunks are passed
+    through as parsed, missing values and all.
+    """
+    columns = _dataset_columns(file_path)
+    dtype = {col: (np.float32 if col in NUMERIC_COLUMNS else 'category') for col in columns}
+    reader = pd.read_csv(file_path, usecols=columns, dtype=dtype, chunksize=chunksize)
+    first_row = 0
+    while True:
+        try:
+            chunk = next(reader)
+        except StopIteration:
+            return
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Could not parse {file_path} after row {first_row}: {e}")
+        yield _validate_chunk(chunk, first_row) if validate else chunk
+        first_row += len(chunk)
+
+def load_dataset(file_path, chunksize=DEFAULT_CHUNK_SIZE):
+    """Load a training CSV chunk by chunk into one compact DataFrame"""
+    chunks = list(iter_dataset_chunks(file_path, chunksize))
+    if not chunks:
+        raise ValueError(f"Dataset {file_path} has no rows")
+    data = {}
+    for col in chunks[0].columns:
+        if col in CATEGORY_COLUMNS:
+            # Sorted categories make the codes match LabelEncoder's encoding
+            data[col] = union_categoricals([chunk[col] for chunk in chunks], sort_categories=True)
+        else:
+            data[col] = np.concatenate([chunk[col].to_numpy() for chunk in chunks])
+    df = pd.DataFrame(data)
+    for col, default in CATEGORICAL_DEFAULTS.items():
+        if col not in df.columns:
+            df[col] = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), [default])
+    logger.info(f"Loaded {len(df)} rows in {len(chunks)} chunks "
+                f"({df.memory_usage(deep=True).sum() / 1e6:.1f} MB)")
+    return df
@@ -0,0 +1,227 @@
+import json
+import time
+from datetime import datetime
+import numpy as np
+from dataset_loader import (DEFAULT_CHUNK_SIZE, INT16_MAX, INT16_MIN, INTEGER_COLUMNS, NUMERIC_COLUMNS,
+                            CATEGORY_COLUMNS, REQUIRED_COLUMNS, iter_dataset_chunks, read_header)
+
+DEFAULT_BINS = 4096
+
+class DatasetStats:
+    """One-pass statistics over all numeric columns of a dataset.
+
+    Every chunk is folded in with a handful of vectorised operations over
+    an (n_rows, n_columns) block: null counts, min/max, and mean/variance
+    merged with Chan's parallel update. Quantiles and IQR outlier counts
+    come from a fixed-size histogram per column whose bins double in
+    width whenever new values fall outside its range, so they are
+    approximate to within one bin (range / bins) and memory stays
+    constant however large the file is.
+    """
+
+    def __init__(self, columns, bins=DEFAULT_BINS):
+        if bins % 2:
+            raise ValueError("bins must be even")
+        self.columns = list(columns)
+        self.bins = bins
+        k = len(self.columns)
+        self.n_rows = 0
+        self.count = np.zeros(k, dtype=np.int64)
+        self.nulls = np.zeros(k, dtype=np.int64)
+        self.non_integer = np.zeros(k, dtype=np.int64)
+        self.non_finite = np.zeros(k, dtype=np.int64)
+        self.minimum = np.full(k, np.inf)
+        self.maximum = np.full(k, -np.inf)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.lo = np.full(k, np.nan)
+        self.width = np.ones(k)
+        self.hist = np.zeros((k, bins), dtype=np.int64)
+        self.category_counts = {}
+        self.category_nulls = {}
+        self._integer = np.array([col in INTEGER_COLUMNS for col in self.columns])
+
+    def update(self, chunk):
+        """Fold one chunk into the running statistics"""
+        self.n_rows += len(chunk)
+        for col in chunk.columns:
+            if col in CATEGORY_COLUMNS:
+                self.category_nulls[col] = self.category_nulls.get(col, 0) + int(chunk[col].isna().sum())
+                counts = self.category_counts.setdefault(col, {})
+                for value, n in chunk[col].value_counts().items():
+                    if n:
+                        counts[value] = counts.get(value, 0) + int(n)
+        if not self.columns or not len(chunk):
+            return
+
+        X = chunk[self.columns].to_numpy(dtype=np.float64)
+        # inf/-inf parse as floats but would break every statistic below,
+        # so they are counted separately and otherwise left out
+        missing = np.isnan(X)
+        present = np.isfinite(X)
+        n_b = present.sum(axis=0)
+        self.nulls += missing.sum(axis=0)
+        self.non_finite += len(X) - n_b - missing.sum(axis=0)
+        with np.errstate(invalid='ignore'):
+            bad = present & ((X != np.round(X)) | (X < INT16_MIN) | (X > INT16_MAX))
+        self.non_integer += (bad & self._integer).sum(axis=0)
+
+        has = n_b > 0
+        if not has.any():
+            return
+        chunk_min = np.where(has, np.nanmin(np.where(present, X, np.inf), axis=0), np.inf)
+        chunk_max = np.where(has, np.nanmax(np.where(present, X, -np.inf), axis=0), -np.inf)
+        self.minimum = np.minimum(self.minimum, chunk_min)
+        self.maximum = np.maximum(self.maximum, chunk_max)
+
+        # Chan et al.: merge (count, mean, M2) of the chunk into the totals
+        safe_n = np.maximum(n_b, 1)
+        mean_b = np.where(present, X, 0.0).sum(axis=0) / safe_n
+        m2_b = np.where(present, X - mean_b, 0.0)
+        m2_b = np.einsum('ij,ij->j', m2_b, m2_b)
+        n_a = self.count
+        n = n_a + n_b
+        safe_total = np.maximum(n, 1)
+        delta = mean_b - self.mean
+        self.mean = np.where(has, self.mean + delta * n_b / safe_total, self.mean)
+        self.m2 = np.where(has, self.m2 + m2_b + delta ** 2 * n_a * n_b / safe_total, self.m2)
+        self.count = n
+
+        self._update_histograms(X, present, chunk_min, chunk_max, has)
+
+    def _update_histograms(self, X, present, chunk_min, chunk_max, has):
+        for j in np.flatnonzero(has):
+            if np.isnan(self.lo[j]):
+                span = chunk_max[j] - chunk_min[j]
+                self.lo[j] = chunk_min[j]
+                self.width[j] = span / (self.bins - 1) if span > 0 else 1.0 / self.bins
+            self._cover(j, chunk_min[j], chunk_max[j])
+        # One bincount for all columns: column j owns bins [j * bins, (j + 1) * bins)
+        index = np.floor((X - self.lo) / self.width)
+        index = np.clip(np.nan_to_num(index, nan=0), 0, self.bins - 1).astype(np.int64)
+        index += np.arange(len(self.columns)) * self.bins
+        counts = np.bincount(index[present], minlength=len(self.columns) * self.bins)
+        self.hist += counts.reshape(len(self.columns), self.bins)
+
+    def _cover(self, j, low, high):
+        """Double column j's bin width until [low, high] fits"""
+        half = self.bins // 2
+        while low < self.lo[j] or high >= self.lo[j] + self.bins * self.width[j]:
+            merged = self.hist[j].reshape(half, 2).sum(axis=1)
+            if low < self.lo[j]:
+                # Grow downwards: the old range becomes the upper half
+                self.lo[j] -= self.bins * self.width[j]
+                self.hist[j] = np.concatenate([np.zeros(half, dtype=np.int64), merged])
+            else:
+                self.hist[j] = np.concatenate([merged, np.zeros(half, dtype=np.int64)])
+            self.width[j] *= 2
+
+    def _rank(self, j, value):
+        """Approximate number of values <= value in column j"""
+        if value < self.minimum[j]:
+            return 0.0
+        if value >= self.maximum[j]:
+            return float(self.count[j])
+        position = (value - self.lo[j]) / self.width[j]
+        b = min(int(position), self.bins - 1)
+        return float(self.hist[j][:b].sum() + self.hist[j][b] * (position - b))
+
+    def quantile(self, j, q):
+        """Approximate q-quantile of column j, interpolated within a bin"""
+        hist = self.hist[j]
+        cumulative = np.cumsum(hist)
+        target = q * self.count[j]
+        b = int(np.searchsorted(cumulative, target))
+        b = min(b, self.bins - 1)
+        before = cumulative[b - 1] if b else 0
+        fraction = (target - before) / hist[b] if hist[b] else 0.0
+        value = self.lo[j] + (b + fraction) * self.width[j]
+        return float(np.clip(value, self.minimum[j], self.maximum[j]))
+
+    def column_report(self, j):
+        col = self.columns[j]
+        if not self.count[j]:
+            return {'count': 0, 'nulls': int(self.nulls[j]), 'non_finite': int(self.non_finite[j])}
+        q1, median, q3 = (self.quantile(j, q) for q in (0.25, 0.5, 0.75))
+        iqr = q3 - q1
+        low_fence, high_fence = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+        outliers_low = round(self._rank(j, np.nextafter(low_fence, -np.inf)))
+        outliers_high = round(self.count[j] - self._rank(j, high_fence))
+        report = {
+            'count': int(self.count[j]),
+            'nulls': int(self.nulls[j]),
+            'non_finite': int(self.non_finite[j]),
+            'min': float(self.minimum[j]),
+            'max': float(self.maximum[j]),
+            'mean': float(self.mean[j]),
+            'std': float(np.sqrt(self.m2[j] / (self.count[j] - 1))) if self.count[j] > 1 else 0.0,
+            'q25': q1,
+            'q50': median,
+            'q75': q3,
+            'outlier_fences': [low_fence, high_fence],
+            'outliers': int(outliers_low + outliers_high),
+            'quantile_resolution': float(self.width[j])
+        }
+        if col in INTEGER_COLUMNS:
+            report['non_integer'] = int(self.non_integer[j])
+        return report
+
+def profile_dataset(file_path, chunksize=DEFAULT_CHUNK_SIZE, bins=DEFAULT_BINS):
+    """Validate and profile a dataset in a single streaming pass
+
+    Returns a JSON-serialisable report; 'valid' is False and 'errors'
+    lists the problems when the file cannot be used for training.
+    """
+    start = time.perf_counter()
+    report = {
+        'file': file_path,
+        'generated_at': datetime.utcnow().isoformat(),
+        'valid': False,
+        'errors': [],
+        'columns': [],
+        'n_rows': 0,
+        'n_chunks': 0
+    }
+    try:
+        header = read_header(file_path)
+        report['columns'] = header
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in header]
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+
+        stats = DatasetStats([col for col in NUMERIC_COLUMNS if col in header], bins=bins)
+        for chunk in iter_dataset_chunks(file_path, chunksize, validate=False):
+            stats.update(chunk)
+            report['n_chunks'] += 1
+    except (OSError, ValueError) as e:
+        report['errors'].append(str(e))
+        report['elapsed_seconds'] = time.perf_counter() - start
+        return report
+
+    report['n_rows'] = stats.n_rows
+    report['numeric'] = {col: stats.column_report(j) for j, col in enumerate(stats.columns)}
+    report['categorical'] = {
+        col: dict(sorted(counts.items())) for col, counts in stats.category_counts.items() if col != 'label'
+    }
+    report['labels'] = dict(sorted(stats.category_counts.get('label', {}).items()))
+
+    if not stats.n_rows:
+        report['errors'].append("Dataset has no rows")
+    for col, column in report['numeric'].items():
+        if column['nulls']:
+            report['errors'].append(f"{column['nulls']} missing values in {col}")
+        if column['non_finite']:
+            report['errors'].append(f"{column['non_finite']} infinite values in {col}")
+        if column.get('non_integer'):
+            report['errors'].append(f"{column['non_integer']} values in {col} are not int16 integers")
+    for col, nulls in stats.category_nulls.items():
+        if nulls:
+            report['errors'].append(f"{nulls} missing values in {col}")
+    report['valid'] = not report['errors']
+    report['elapsed_seconds'] = time.perf_counter() - start
+    return report
+
+def write_report(report, path):
+    """Write a profile report as JSON"""
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+import joblib
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump when preprocessing changes in a way the config below does not capture
+FEATURE_CACHE_VERSION = 1
+
+def file_digest(path, block_size=1 << 20):
+    """sha256 of a file's contents, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class FeatureCache:
+    """Content-addressed cache of encoded training matrices.
+
+    An entry is keyed by the sha256 of the source file and the
+    preprocessing config, and holds X and the label codes as .npy files
+    (loaded memory-mapped), the fitted label encoders and a small
+    meta.json. Entries are built in a temporary directory and renamed
+    into place, so concurrent trainers never see a partial entry. File
+    digests are remembered per (path, inode, size, mtime) so an unchanged
+    file is not re-hashed on every run.
+    """
+
+    def __init__(self, root='models/feature_cache', max_entries=8):
+        self.root = root
+        self.max_entries = max_entries
+        self.digests_path = os.path.join(root, 'digests.json')
+        self._lock = threading.Lock()
+
+    def key(self, file_path, config):
+        """Cache key for a source file and preprocessing config"""
+        config = dict(config, cache_version=FEATURE_CACHE_VERSION)
+        raw = f"{self._digest(file_path)}|{json.dumps(config, sort_keys=True)}"
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def get(self, key, mmap_mode='r'):
+        """Return (X, y, label_encoders) for a key, or None on a miss"""
+        entry = os.path.join(self.root, key)
+        meta_path = os.path.join(entry, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            X = np.load(os.path.join(entry, 'X.npy'), mmap_mode=mmap_mode)
+            codes = np.load(os.path.join(entry, 'y_codes.npy'), mmap_mode=mmap_mode)
+            label_encoders = joblib.load(os.path.join(entry, 'label_encoders.joblib'))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable feature cache entry {key}: {e}")
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        os.utime(meta_path)  # recency for pruning
+        y = np.asarray(meta['label_classes'], dtype=object)[codes]
+        return X, y, label_encoders
+
+    def put(self, key, X, y, label_encoders, source=None):
+        """Store an entry; a concurrent writer of the same key may win"""
+        os.makedirs(self.root, exist_ok=True)
+        label_classes, codes = np.unique(np.asarray(y, dtype=object), return_inverse=True)
+        tmp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=self.root)
+        try:
+            np.save(os.path.join(tmp_dir, 'X.npy'), np.ascontiguousarray(X))
+            np.save(os.path.join(tmp_dir, 'y_codes.npy'), codes.astype(np.int32))
+            joblib.dump(label_encoders, os.path.join(tmp_dir, 'label_encoders.joblib'))
+            with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+                json.dump({
+                    'source': source,
+                    'created_at': datetime.utcnow().isoformat(),
+                    'shape': list(X.shape),
+                    'dtype': str(X.dtype),
+                    'label_classes': label_classes.tolist()
+                }, f)
+            os.replace(tmp_dir, os.path.join(self.root, key))
+        except OSError:
+            # Another process already published this key
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.prune()
+
+    def get_or_build(self, file_path, config, build):
+        """Return cached (X, y, label_encoders), calling build() on a miss"""
+        key = self.key(file_path, config)
+        cached = self.get(key)
+        if cached is not None:
+            logger.info(f"Feature cache hit for {file_path} ({key})")
+            return cached
+        logger.info(f"Feature cache miss for {file_path} ({key})")
+        X, y, label_encoders = build()
+        self.put(key, X, y, label_encoders, source=os.path.abspath(file_path))
+        return X, y, label_encoders
+
+    def entries(self):
+        if not os.path.isdir(self.root):
+            return []
+        return [name for name in os.listdir(self.root)
+                if os.path.exists(os.path.join(self.root, name, 'meta.json'))]
+
+    def prune(self):
+        """Keep only the max_entries most recently used entries"""
+        entries = sorted(self.entries(),
+                         key=lambda name: os.path.getmtime(os.path.join(self.root, name, 'meta.json')))
+        for name in entries[:-self.max_entries]:
+            shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+            logger.info(f"Pruned feature cache entry {name}")
+
+    def _digest(self, file_path):
+        st = os.stat(file_path)
+        stamp = [st.st_ino, st.st_size, st.st_mtime_ns]
+        path = os.path.abspath(file_path)
+        with self._lock:
+            digests = self._read_digests()
+            known = digests.get(path)
+            if known is not None and known['stamp'] == stamp:
+                return known['sha256']
+        digest = file_digest(file_path)
+        with self._lock:
+            digests = self._read_digests()
+            digests[path] = {'stamp': stamp, 'sha256': digest}
+            os.makedirs(self.root, exist_ok=True)
+            tmp_path = f'{self.digests_path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(digests, f)
+            os.replace(tmp_path, self.digests_path)
+        return digest
+
+    def _read_digests(self):
+        try:
+            with open(self.digests_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
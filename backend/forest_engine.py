@@ -0,0 +1,105 @@
+import numpy as np
+
+class FlatForest:
+    """A fitted random forest flattened into contiguous NumPy arrays.
+
+    All trees share one node table in which node i owns the two slots
+    2i (go left) and 2i + 1 (go right). feature and threshold are
+    repeated in both slots and children holds the slot of the next node,
+    so one level of every tree is `slot = children[slot + (x > threshold)]`.
+    Leaves point back at themselves on both sides, which lets all trees
+    be walked in lockstep for a fixed number of levels without per-row
+    branching. Leaf class distributions are normalised per tree and
+    averaged over trees, exactly like sklearn's predict_proba.
+    """
+
+    def __init__(self, feature, threshold, children, leaf_proba, roots, depth, n_features, classes):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.leaf_proba = leaf_proba
+        self.roots = roots
+        self.depth = depth
+        self.n_features = n_features
+        self.classes_ = classes
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        """Flatten a fitted RandomForestClassifier (single output)"""
+        if getattr(forest, 'n_outputs_', 1) != 1:
+            raise ValueError("Only single-output forests can be flattened")
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        sizes = np.array([tree.node_count for tree in trees])
+        offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        n_nodes = int(sizes.sum())
+
+        feature = np.zeros(n_nodes, dtype=np.intp)
+        threshold = np.empty(n_nodes, dtype=np.float64)
+        left = np.empty(n_nodes, dtype=np.intp)
+        right = np.empty(n_nodes, dtype=np.intp)
+        leaf_proba = np.zeros((n_nodes, forest.n_classes_), dtype=np.float64)
+        for tree, offset in zip(trees, offsets):
+            nodes = np.arange(tree.node_count) + offset
+            leaf = tree.children_left == -1
+            feature[nodes] = np.where(leaf, 0, tree.feature)
+            # Leaves compare against +inf and loop back to themselves either way
+            threshold[nodes] = np.where(leaf, np.inf, tree.threshold)
+            left[nodes] = np.where(leaf, nodes, tree.children_left + offset)
+            right[nodes] = np.where(leaf, nodes, tree.children_right + offset)
+            counts = tree.value[:, 0, :]
+            totals = counts.sum(axis=1, keepdims=True)
+            totals[totals == 0] = 1.0
+            leaf_proba[nodes[leaf]] = (counts / totals)[leaf]
+
+        return cls(
+            feature=np.repeat(feature, 2),
+            threshold=np.repeat(threshold, 2),
+            children=2 * np.column_stack((left, right)).ravel(),
+            leaf_proba=leaf_proba,
+            roots=2 * offsets.astype(np.intp),
+            depth=max(tree.max_depth for tree in trees),
+            n_features=forest.n_features_in_,
+            classes=forest.classes_
+        )
+
+    @property
+    def n_estimators(self):
+        return len(self.roots)
+
+    def apply(self, X):
+        """Return the leaf node reached in every tree, shape (n_samples, n_trees)"""
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features per sample")
+        # sklearn compares float32 features against float64 thresholds
+        flat_X = X.astype(np.float32).astype(np.float64).ravel()
+        feature, threshold, children = self.feature, self.threshold, self.children
+        if X.shape[0] == 1:
+            # Single rows skip the per-row offsets entirely
+            slots = self.roots
+            for _ in range(self.depth):
+                slots = children[slots + (flat_X[feature[slots]] > threshold[slots])]
+            return (slots >> 1)[None, :]
+        row_offsets = (np.arange(X.shape[0], dtype=np.intp) * self.n_features)[:, None]
+        slots = np.repeat(self.roots[None, :], X.shape[0], axis=0)
+        for _ in range(self.depth):
+            values = flat_X[row_offsets + feature[slots]]
+            slots = children[slots + (values > threshold[slots])]
+        return slots >> 1
+
+    def predict_proba(self, X):
+        """Class probabilities averaged over all trees"""
+        leaves = self.apply(X)
+        if leaves.shape[0] == 1:
+            return self.leaf_proba[leaves[0]].sum(axis=0, keepdims=True) / self.n_estimators
+        # Accumulate tree by tree, in sklearn's order, instead of
+        # materialising an (n_samples, n_trees, n_classes) gather
+        proba = np.zeros((leaves.shape[0], self.leaf_proba.shape[1]), dtype=np.float64)
+        for j in range(leaves.shape[1]):
+            proba += self.leaf_proba[leaves[:, j]]
+        proba /= self.n_estimators
+        return proba
+
+    def predict(self, X):
+        """Most probable class of every sample"""
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
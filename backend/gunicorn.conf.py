@@ -0,0 +1,27 @@
+import gc
+import os
+
+# Import the app (and load the model) once in the master before forking, so
+# all workers share the same copy-on-write pages of the forest
+preload_app = os.getenv('MODEL_PRELOAD', 'true').lower() in ('1', 'true', 'yes')
+
+# Threaded workers, so long-lived /api/stream connections do not each pin a
+# process. Each stream still holds a thread, so the app only accepts
+# LIVE_FEED_MAX_CLIENTS of them (default: half of these threads) per worker
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+
+def when_ready(server):
+    # Move everything allocated during preload into the permanent generation
+    # so the garbage collector never touches (and un-shares) those pages
+    if preload_app:
+        gc.freeze()
+
+def post_fork(server, worker):
+    # Database connections opened in the master must not be shared with workers
+    if preload_app:
+        from app import app, db, live_feed_tailer
+        with app.app_context():
+            db.engine.dispose()
+        # MQTT ingestion runs in the master; relay its rows to this worker's clients
+        live_feed_tailer.start()
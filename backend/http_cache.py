@@ -0,0 +1,49 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+def weak_etag(*parts):
+    """Build an opaque ETag value from the parts that determine a response"""
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+    return digest[:20]
+
+class ResponseCache:
+    """Small LRU of pre-serialized response bodies, each tagged with its ETag.
+
+    An entry is only served while the caller's current ETag still matches,
+    so entries written by a stale view of the data are never returned.
+    `clear` is called when ingestion commits new rows.
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, etag):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == etag:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, key, etag, value):
+        with self._lock:
+            self._entries[key] = (etag, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self, *args):
+        # Accepts and ignores hook arguments so it can be an after_commit hook
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
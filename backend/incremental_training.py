@@ -0,0 +1,47 @@
+from datetime import datetime
+from sqlalchemy import and_, or_
+from models import FarmerInput
+
+# FarmerInput column -> model feature column
+FEATURE_COLUMNS = {
+    'nitrogen': 'N',
+    'phosphorus': 'P',
+    'potassium': 'K',
+    'temperature': 'temperature',
+    'humidity': 'humidity',
+    'moisture': 'moisture',
+    'rainfall': 'rainfall',
+    'soil_type': 'soil_type',
+    'weather': 'weather',
+    'region': 'region'
+}
+
+def encode_watermark(row):
+    """JSON-friendly watermark pointing just past `row`"""
+    return [row.confirmed_at.isoformat(), row.id]
+
+def load_confirmed_inputs(watermark=None):
+    """Return confirmed FarmerInput rows after `watermark` as training
+    records, oldest first, together with the watermark of the last row
+
+    Rows are ordered by (confirmed_at, id), so inputs confirmed late are
+    still picked up by the next incremental run. Rows missing any feature
+    are left out.
+    """
+    query = FarmerInput.query.filter(FarmerInput.confirmed_crop.isnot(None),
+                                     FarmerInput.confirmed_at.isnot(None))
+    for column in FEATURE_COLUMNS:
+        query = query.filter(getattr(FarmerInput, column).isnot(None))
+    if watermark is not None:
+        confirmed_at, row_id = datetime.fromisoformat(watermark[0]), watermark[1]
+        query = query.filter(or_(
+            FarmerInput.confirmed_at > confirmed_at,
+            and_(FarmerInput.confirmed_at == confirmed_at, FarmerInput.id > row_id)
+        ))
+    rows = query.order_by(FarmerInput.confirmed_at, FarmerInput.id).all()
+    records = [
+        dict({feature: getattr(row, column) for column, feature in FEATURE_COLUMNS.items()},
+             label=row.confirmed_crop)
+        for row in rows
+    ]
+    return records, (encode_watermark(rows[-1]) if rows else watermark)
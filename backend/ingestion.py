@@ -0,0 +1,281 @@
+import atexit
+import logging
+import math
+import queue
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import insert
+from models import SensorData
+
+logger = logging.getLogger(__name__)
+
+# SensorData column -> type a reading must convert to
+SENSOR_FIELDS = {
+    'temperature': float,
+    'humidity': float,
+    'moisture': int,
+    'nitrogen': float,
+    'phosphorus': float,
+    'potassium': float
+}
+
+def coerce_sensor_reading(payload):
+    """Return the sensor fields of a decoded payload converted to their
+    column types, raising ValueError for a missing or non-numeric field
+
+    Checked before a reading is queued, so one bad payload can never make
+    a whole batch insert fail.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Payload is not an object")
+    reading = {}
+    for field, kind in SENSOR_FIELDS.items():
+        if field not in payload:
+            raise ValueError(f"Missing field: {field}")
+        value = payload[field]
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError(f"Invalid {field}: {value!r}")
+        try:
+            number = float(value)
+        except ValueError:
+            raise ValueError(f"Invalid {field}: {value!r}")
+        if not math.isfinite(number) or (kind is int and not number.is_integer()):
+            raise ValueError(f"Invalid {field}: {value!r}")
+        reading[field] = kind(number)
+    return reading
+
+class SensorIngestionWriter:
+    """Buffers sensor readings and bulk-inserts them from a writer thread.
+
+    Rows are flushed in one transaction once `batch_size` rows are waiting
+    or `flush_interval` seconds have passed since the first buffered row.
+    When the queue is full, `submit` blocks for up to `put_timeout` seconds
+    (backpressure) and then drops the row.
+
+    If a batch insert fails, its rows are retried one at a time so only
+    the rows that cannot be stored are counted as failed.
+
+    Each `before_commit(session, rows)` hook runs inside the insert
+    transaction, so derived tables stay consistent with the raw rows;
+    `after_commit(rows)` hooks run once the rows are durable.
+    """
+
+    def __init__(self, app, db, max_queue_size=10000, batch_size=500,
+                 flush_interval=1.0, put_timeout=1.0, before_commit=None, after_commit=None):
+        self.app = app
+        self.db = db
+        self.before_commit = list(before_commit or [])
+        self.after_commit = list(after_commit or [])
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+    def start(self):
+        """Start the writer thread (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='sensor-ingestion-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def submit(self, row):
+        """Queue a SensorData row mapping; returns False if it was dropped"""
+        try:
+            self.queue.put(row, timeout=self.put_timeout)
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+            logger.warning("Ingestion queue full, dropping sensor reading")
+            return False
+        with self._stats_lock:
+            self.submitted += 1
+        return True
+
+    def stop(self, timeout=10):
+        """Flush everything still queued and stop the writer thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        # Anything left (e.g. the thread was never started) is flushed inline
+        self._flush(self._drain())
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'queue_depth': self.queue.qsize(),
+                'queue_capacity': self.queue.maxsize,
+                'submitted': self.submitted,
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'batches': self.batches
+            }
+
+    def _drain(self, limit=None):
+        rows = []
+        while limit is None or len(rows) < limit:
+            try:
+                rows.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                first = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._flush(batch)
+        self._flush(self._drain())
+
+    def _flush(self, rows):
+        if not rows:
+            return
+        with self.app.app_context():
+            try:
+                self._write(rows)
+                written = rows
+            except Exception as e:
+                self.db.session.rollback()
+                logger.error(f"Error writing {len(rows)} sensor readings: {str(e)}")
+                written = self._write_each(rows) if len(rows) > 1 else []
+            for hook in self.after_commit if written else []:
+                try:
+                    hook(written)
+                except Exception as e:
+                    logger.error(f"Error in ingestion after-commit hook: {str(e)}")
+        with self._stats_lock:
+            self.failed += len(rows) - len(written)
+            self.written += len(written)
+            self.batches += 1 if written else 0
+        if written:
+            logger.info(f"Wrote {len(written)} sensor readings")
+
+    def _write(self, rows):
+        """Insert rows and run the before-commit hooks in one transaction"""
+        self.db.session.execute(insert(SensorData), rows)
+        for hook in self.before_commit:
+            hook(self.db.session, rows)
+        self.db.session.commit()
+
+    def _write_each(self, rows):
+        """Retry a failed batch row by row; returns the rows written"""
+        written = []
+        for row in rows:
+            try:
+                self._write([row])
+                written.append(row)
+            except Exception as e:
+                self.db.session.rollback()
+                logger.error(f"Dropping sensor reading {row!r}: {str(e)}")
+        return written
+
+class MqttMessageProcessor:
+    """Processes raw MQTT payloads on a pool of worker threads.
+
+    The paho network thread only calls `enqueue`, which never blocks; a
+    full queue drops the message so a burst cannot stall keepalives.
+    `handler(payload, received_at)` does the decoding, validation and
+    hand-off to the writer.
+    """
+
+    def __init__(self, handler, workers=2, max_queue_size=10000):
+        self.handler = handler
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self._threads = []
+        self._stats_lock = threading.Lock()
+        self.received = 0
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def start(self):
+        """Start the worker threads (idempotent)"""
+        if any(t.is_alive() for t in self._threads):
+            return
+        self._threads = [
+            threading.Thread(target=self._run, name=f'mqtt-processor-{i}', daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        atexit.register(self.stop)
+
+    def enqueue(self, payload):
+        """Queue a raw payload without blocking; returns False if dropped"""
+        try:
+            self.queue.put_nowait((time.monotonic(), datetime.utcnow(), payload))
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+            return False
+        with self._stats_lock:
+            self.received += 1
+        return True
+
+    def stop(self, timeout=10):
+        """Process what is already queued and stop the workers"""
+        for _ in self._threads:
+            self.queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'queue_depth': self.queue.qsize(),
+                'queue_capacity': self.queue.maxsize,
+                'workers': len(self._threads),
+                'received': self.received,
+                'processed': self.processed,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'last_lag_seconds': self.last_lag,
+                'max_lag_seconds': self.max_lag
+            }
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            enqueued_at, received_at, payload = item
+            lag = time.monotonic() - enqueued_at
+            try:
+                self.handler(payload, received_at)
+                failed = 0
+            except Exception as e:
+                failed = 1
+                logger.error(f"Error processing MQTT message: {str(e)}")
+            with self._stats_lock:
+                self.processed += 1
+                self.failed += failed
+                self.last_lag = lag
+                self.max_lag = max(self.max_lag, lag)
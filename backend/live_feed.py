@@ -0,0 +1,162 @@
+import json
+import logging
+import queue
+import threading
+from datetime import datetime
+from models import SensorData
+
+logger = logging.getLogger(__name__)
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+def format_sse(event, data):
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=_default)}\n\n"
+
+class Subscription:
+    """One client's bounded event buffer"""
+
+    def __init__(self, buffer_size):
+        self.queue = queue.Queue(maxsize=buffer_size)
+        self.dropped = 0
+        self.closed = False
+
+    def get(self, timeout):
+        """Return the next formatted event, or None after `timeout` seconds"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class EventBroadcaster:
+    """Fans events out to every subscribed client.
+
+    Publishing never blocks: when a client's buffer is full its oldest
+    event is discarded, and a client that has dropped more than
+    `max_dropped` events is disconnected so it can reconnect and resync.
+
+    With `max_subscribers`, subscribe() returns None once that many
+    clients are connected, so streams cannot take every server thread.
+    """
+
+    def __init__(self, buffer_size=100, max_dropped=100, max_subscribers=None):
+        self.buffer_size = buffer_size
+        self.max_dropped = max_dropped
+        self.max_subscribers = max_subscribers
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self.published = 0
+        self.disconnected = 0
+        self.rejected = 0
+
+    def subscribe(self):
+        """Return a new Subscription, or None when the feed is full"""
+        subscription = Subscription(self.buffer_size)
+        with self._lock:
+            if self.max_subscribers is not None and len(self._subscribers) >= self.max_subscribers:
+                self.rejected += 1
+                return None
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+    def publish(self, event, data):
+        """Queue an event for every subscriber"""
+        message = format_sse(event, data)
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.published += 1
+        for subscription in subscribers:
+            self._offer(subscription, message)
+
+    def _offer(self, subscription, message):
+        while True:
+            try:
+                subscription.queue.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    subscription.queue.get_nowait()
+                except queue.Empty:
+                    pass
+                subscription.dropped += 1
+                if subscription.dropped > self.max_dropped:
+                    subscription.closed = True
+                    self.unsubscribe(subscription)
+                    with self._lock:
+                        self.disconnected += 1
+                    logger.warning("Disconnected slow live feed client")
+                    return
+
+    def stats(self):
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'max_subscribers': self.max_subscribers,
+                'rejected_clients': self.rejected,
+                'published': self.published,
+                'disconnected_slow_clients': self.disconnected
+            }
+
+class SensorDataTailer:
+    """Publishes rows committed by another process (e.g. the gunicorn master).
+
+    While clients are subscribed, polls for SensorData ids above the last
+    one seen every `interval` seconds: one indexed query per process,
+    however many dashboards are open.
+    """
+
+    def __init__(self, app, broadcaster, publish_rows, interval=2.0, batch_size=1000):
+        self.app = app
+        self.broadcaster = broadcaster
+        self.publish_rows = publish_rows
+        self.interval = interval
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_id = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='sensor-data-tailer', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Error tailing sensor data: {str(e)}")
+
+    def poll(self):
+        with self.app.app_context():
+            if self.broadcaster.subscriber_count() == 0:
+                # Nobody is listening; restart from the newest row next time
+                self._last_id = None
+                return
+            if self._last_id is None:
+                latest = SensorData.query.order_by(SensorData.id.desc()).first()
+                self._last_id = latest.id if latest else 0
+                return
+            rows = (SensorData.query.filter(SensorData.id > self._last_id)
+                    .order_by(SensorData.id).limit(self.batch_size).all())
+            if rows:
+                self._last_id = rows[-1].id
+                self.publish_rows([dict(row.to_dict(), timestamp=row.timestamp) for row in rows])
@@ -5,41 +5,83 @@ from sklearn.preprocessing import LabelEncoder
 import joblib
 import os
 import logging
+import threading
+import time
+from model_registry import ModelRegistry
+from prediction_cache import PredictionCache
+from forest_engine import FlatForest
+from model_backends import DEFAULT_BACKEND, BACKENDS, create_estimator, release_cores, serving_predictor
+from model_search import search_hyperparameters
+from dataset_loader import DEFAULT_CHUNK_SIZE, load_dataset
+from feature_cache import FeatureCache
+from category_encoding import UNKNOWN_POLICIES, CategoryEncoder, UnknownCategoryError
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rows remapped at a time when encoding categorical columns
+ENCODE_BLOCK_ROWS = 65536
+# Most rows one prediction call may expand to when averaging unseen categories
+MAX_AVERAGED_ROWS = 100000
+
 class CropRecommendationModel:
-    def __init__(self):
+    INFERENCE_ENGINES = ('sklearn', 'flat')
+
+    def __init__(self, cache_size=0, cache_ttl=300, cache_precision=1,
+                 model_dir='models', mmap_mode=None, refresh_interval=1.0,
+                 inference_engine='sklearn', backend=DEFAULT_BACKEND, feature_cache=True,
+                 unknown_policy='error', max_averaged_rows=MAX_AVERAGED_ROWS):
+        if inference_engine not in self.INFERENCE_ENGINES:
+            raise ValueError(f"Unknown inference engine: {inference_engine!r}")
+        if unknown_policy not in UNKNOWN_POLICIES:
+            raise ValueError(f"Unknown category policy: {unknown_policy!r}")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown model backend: {backend!r}")
+        self.backend = backend
         self.model = None
+        # What predictions actually run on: the model itself or its flattened form
+        self.predictor = None
+        self.inference_engine = inference_engine
         self.label_encoders = {}
         self.feature_columns = [
             'N', 'P', 'K', 'temperature', 'humidity', 'moisture', 'rainfall',
             'soil_type', 'weather', 'region'
         ]
         self.categorical_columns = ['soil_type', 'weather', 'region']
-        self.model_path = 'models/crop_model.joblib'
-        self.encoders_path = 'models/label_encoders.joblib'
+        # How unseen categories are encoded, see category_encoding
+        self.unknown_policy = unknown_policy
+        self.encoder = CategoryEncoder({}, unknown_policy)
+        self.max_averaged_rows = max_averaged_rows
+        self.generation = 0
+        self._swap_lock = threading.Lock()
+        self.registry = ModelRegistry(model_dir)
+        self.mmap_mode = mmap_mode
+        self.refresh_interval = refresh_interval
+        self.version = None
+        self._manifest_stamp = None
+        self._next_refresh = 0.0
+        # Pre-registry artifacts, only used when no manifest exists yet
+        self.model_path = os.path.join(model_dir, 'crop_model.joblib')
+        self.encoders_path = os.path.join(model_dir, 'label_encoders.joblib')
+        # Encoded training matrices, keyed by dataset content
+        self.feature_cache = FeatureCache(os.path.join(model_dir, 'feature_cache')) if feature_cache else None
+        self.cache = None
+        if cache_size > 0:
+            self.cache = PredictionCache(
+                self.feature_columns,
+                self.categorical_columns,
+                max_size=cache_size,
+                ttl=cache_ttl,
+                precision=cache_precision
+            )
         
-    def load_data(self, file_path):
+    def load_data(self, file_path, chunksize=DEFAULT_CHUNK_SIZE):
         """Load and preprocess the dataset"""
         try:
             logger.info(f"Loading dataset from {file_path}")
-            df = pd.read_csv(file_path)
-            
-            # Verify required columns
-            required_columns = ['N', 'P', 'K', 'temperature', 'humidity', 'moisture', 'rainfall', 'label']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            if missing_columns:
-                raise ValueError(f"Missing required columns: {missing_columns}")
-            
-            # Add categorical columns if not present
-            if 'soil_type' not in df.columns:
-                df['soil_type'] = 'alluvial'  # Default soil type
-            if 'weather' not in df.columns:
-                df['weather'] = 'sunny'  # Default weather
-            if 'region' not in df.columns:
-                df['region'] = 'karnataka'  # Default region
+            # Streamed in validated chunks with compact dtypes; categorical
+            # columns missing from the file get their defaults
+            df = load_dataset(file_path, chunksize)
                 
             logger.info(f"Dataset loaded successfully with {len(df)} samples")
             return df
@@ -49,16 +91,45 @@ class CropRecommendationModel:
             raise
             
     def preprocess_data(self, df):
-        """Preprocess the data for training"""
+        """Encode a training frame into (X, y) without modifying it
+
+        X is a single preallocated C-contiguous float32 matrix (the dtype
+        the forest trains on), filled one column at a time straight from
+        the frame's own arrays, so no encoded copy of the frame is ever
+        built. Categorical columns read from the dataset loader are
+        encoded from their category codes; plain string columns go
+        through LabelEncoder.
+        """
         try:
-            # Create label encoders for categorical variables
-            for col in self.categorical_columns:
-                self.label_encoders[col] = LabelEncoder()
-                df[col] = self.label_encoders[col].fit_transform(df[col])
-            
-            # Prepare features and target
-            X = df[self.feature_columns]
-            y = df['label']
+            X = np.empty((len(df), len(self.feature_columns)), dtype=np.float32)
+            label_encoders = {}
+            for j, col in enumerate(self.feature_columns):
+                if col not in self.categorical_columns:
+                    X[:, j] = df[col].to_numpy()
+                    continue
+                encoder = LabelEncoder()
+                values = df[col].array
+                if isinstance(values, pd.Categorical):
+                    # Sorted categories are exactly LabelEncoder's classes once
+                    # the unused ones are dropped, so only the codes are remapped
+                    used = np.zeros(len(values.categories), dtype=bool)
+                    used[values.codes] = True
+                    encoder.classes_ = np.asarray(values.categories[used], dtype=object)
+                    remap = (np.cumsum(used) - 1).astype(np.float32)
+                    # Block-wise, so the remapped temporary stays small
+                    for start in range(0, len(X), ENCODE_BLOCK_ROWS):
+                        stop = start + ENCODE_BLOCK_ROWS
+                        X[start:stop, j] = remap[values.codes[start:stop]]
+                else:
+                    X[:, j] = encoder.fit_transform(values)
+                label_encoders[col] = encoder
+            self.label_encoders = label_encoders
+            labels = df['label'].array
+            if isinstance(labels, pd.Categorical):
+                # Indexing the categories directly avoids pandas' second copy
+                y = np.asarray(labels.categories, dtype=object)[labels.codes]
+            else:
+                y = np.asarray(labels, dtype=object)
             
             logger.info("Data preprocessing completed")
             return X, y
@@ -67,70 +138,344 @@ class CropRecommendationModel:
             logger.error(f"Error preprocessing data: {str(e)}")
             raise
             
-    def train(self, file_path):
-        """Train the model"""
+    def load_features(self, file_path):
+        """Return the encoded (X, y) for a dataset, from the feature cache
+        when the same file was encoded before
+
+        X is a float32 matrix (memory-mapped on a cache hit) and
+        self.label_encoders is set to the encoders it was built with.
+        """
+        def build():
+            X, y = self.preprocess_data(self.load_data(file_path))
+            return X, y, self.label_encoders
+
+        if self.feature_cache is None:
+            X, y, _ = build()
+            return X, y
+        config = {
+            'feature_columns': self.feature_columns,
+            'categorical_columns': self.categorical_columns,
+            'dtype': 'float32'
+        }
+        X, y, self.label_encoders = self.feature_cache.get_or_build(file_path, config, build)
+        return X, y
+
+    def train(self, file_path, backend=None, search=None, cv=5, n_iter=20, n_jobs=-1):
+        """Train the model, with `backend` overriding the configured one
+
+        With search='cv', 'grid' or 'random' the hyperparameters are first
+        chosen by k-fold cross-validation (see model_search); the report is
+        stored in the version's metadata under 'cv_results'. The final fit
+        uses `n_jobs` cores (-1 = all).
+        """
         try:
-            # Load and preprocess data
-            df = self.load_data(file_path)
-            X, y = self.preprocess_data(df)
-            
+            # Load and preprocess data, or reuse a cached encoding of it
+            X, y = self.load_features(file_path)
+            backend = backend or self.backend
+            metadata = {
+                'dataset_path': file_path,
+                'n_samples': len(X),
+                'backend': backend
+            }
+
+            params = {}
+            if search is not None:
+                params, metadata['cv_results'] = search_hyperparameters(
+                    backend, X, y, mode=search, cv=cv, n_iter=n_iter, n_jobs=n_jobs
+                )
+
             # Initialize and train model
-            self.model = RandomForestClassifier(
-                n_estimators=100,
-                max_depth=10,
-                random_state=42
-            )
-            self.model.fit(X, y)
+            model = create_estimator(backend, n_jobs=n_jobs, **params)
+            model.fit(X, y)
+            release_cores(model)
             
-            # Save model and encoders
-            os.makedirs('models', exist_ok=True)
-            joblib.dump(self.model, self.model_path)
-            joblib.dump(self.label_encoders, self.encoders_path)
+            # Save model and encoders as one versioned artifact
+            version = self.registry.save(model, self.label_encoders, metadata=metadata)
+            self.swap_model(model, self.label_encoders, version=version)
             
-            logger.info("Model trained and saved successfully")
+            logger.info(f"Model trained and saved successfully as version {version}")
+            return version
             
         except Exception as e:
             logger.error(f"Error training model: {str(e)}")
             raise
             
-    def load_model(self):
-        """Load the trained model and encoders"""
+    def train_incremental(self, records, watermark=None, n_new_trees=10, max_estimators=None,
+                          min_samples=10, n_jobs=-1):
+        """Grow the active forest with trees fitted on new labelled records only
+
+        Each record holds the feature columns and a 'label'. The trees of
+        the active version are kept and `n_new_trees` are added with
+        warm_start, so the cost scales with the new data, not the history.
+        Records with crops or categories the model has never seen are
+        skipped; those need a full retrain. With `max_estimators` the
+        oldest trees are retired once the forest grows past it.
+        """
         try:
+            artifact = self.registry.load()
+            model, label_encoders = artifact['model'], artifact['label_encoders']
+            if not isinstance(model, RandomForestClassifier):
+                raise ValueError("Incremental training requires the random_forest backend")
+            encoder = CategoryEncoder(label_encoders)
+            known_crops = set(model.classes_.tolist())
+
+            usable = [
+                record for record in records
+                if record['label'] in known_crops
+                and all(encoder.is_known(col, record[col]) for col in self.categorical_columns)
+            ]
+            skipped = len(records) - len(usable)
+            if len(usable) < min_samples:
+                raise ValueError(f"Need at least {min_samples} usable records, got {len(usable)} "
+                                 f"({skipped} skipped)")
+
+            # warm_start refits classes_ from y; one zero-weight row per known
+            # crop keeps every new tree's class columns aligned with the old ones
+            X = np.vstack([
+                self._encode_batch(usable, encoder)[0],
+                np.zeros((len(model.classes_), len(self.feature_columns)))
+            ])
+            y = np.concatenate([np.array([record['label'] for record in usable], dtype=object),
+                                model.classes_.astype(object)])
+            sample_weight = np.concatenate([np.ones(len(usable)), np.zeros(len(model.classes_))])
+
+            n_trees = len(model.estimators_) + n_new_trees
+            model.set_params(warm_start=True, n_estimators=n_trees, n_jobs=n_jobs)
+            model.fit(X, y, sample_weight=sample_weight)
+            model.set_params(warm_start=False)
+            release_cores(model)
+            if max_estimators is not None and len(model.estimators_) > max_estimators:
+                model.estimators_ = model.estimators_[-max_estimators:]
+                model.n_estimators = max_estimators
+
+            parent = artifact['metadata']
+            version = self.registry.save(model, label_encoders, metadata={
+                'dataset_path': parent.get('dataset_path'),
+                'n_samples': parent.get('n_samples', 0) + len(usable),
+                'backend': 'random_forest',
+                'parent_version': artifact['version'],
+                'n_new_samples': len(usable),
+                'n_skipped_samples': skipped,
+                'n_estimators': len(model.estimators_),
+                'incremental_watermark': watermark
+            })
+            self.swap_model(model, label_encoders, version=version)
+
+            logger.info(f"Model version {version} grown by {n_new_trees} trees from {len(usable)} new samples")
+            return version
+
+        except Exception as e:
+            logger.error(f"Error in incremental training: {str(e)}")
+            raise
+
+    def load_model(self, mmap_mode=None):
+        """Load the active model version and its encoders
+
+        Pass mmap_mode='r' to memory-map the numpy arrays stored in the
+        joblib artifact instead of copying them onto the heap.
+        """
+        try:
+            mmap_mode = mmap_mode or self.mmap_mode
+            # Stat before reading so a rollout during the load is seen next time
+            stamp = self.registry.manifest_stamp()
+            if stamp is not None:
+                artifact = self.registry.load(mmap_mode=mmap_mode)
+                self.swap_model(artifact['model'], artifact['label_encoders'],
+                                version=artifact['version'], stamp=stamp)
+                logger.info(f"Model version {artifact['version']} loaded successfully")
+                return
+
             if not os.path.exists(self.model_path) or not os.path.exists(self.encoders_path):
                 raise FileNotFoundError("Model files not found. Please train the model first.")
                 
-            self.model = joblib.load(self.model_path)
-            self.label_encoders = joblib.load(self.encoders_path)
+            model = joblib.load(self.model_path, mmap_mode=mmap_mode)
+            label_encoders = joblib.load(self.encoders_path, mmap_mode=mmap_mode)
+            self.swap_model(model, label_encoders)
             logger.info("Model and encoders loaded successfully")
             
         except Exception as e:
             logger.error(f"Error loading model: {str(e)}")
             raise
             
+    def refresh_if_changed(self, force=False):
+        """Reload the model if another process activated a new version"""
+        now = time.monotonic()
+        if not force and now < self._next_refresh:
+            return False
+        self._next_refresh = now + self.refresh_interval
+        stamp = self.registry.manifest_stamp()
+        if stamp is None or stamp == self._manifest_stamp:
+            return False
+        self.load_model()
+        return True
+
+    def swap_model(self, model, label_encoders, version=None, stamp=None):
+        """Atomically replace the live model and encoders"""
+        encoder = CategoryEncoder(label_encoders, self.unknown_policy)
+        predictor = self._compile(model)
+        with self._swap_lock:
+            self.model = model
+            self.predictor = predictor
+            self.label_encoders = label_encoders
+            self.encoder = encoder
+            self.version = version
+            self._manifest_stamp = stamp or self.registry.manifest_stamp()
+            self.generation += 1
+        self.clear_cache()
+
+    def _compile(self, model):
+        """Build the predictor for the configured inference engine"""
+        if self.inference_engine == 'flat' and isinstance(model, RandomForestClassifier):
+            return FlatForest.from_sklearn(model)
+        return serving_predictor(model)
+
+    def clear_cache(self):
+        """Invalidate cached predictions made by the previous model"""
+        if self.cache is not None:
+            self.cache.clear()
+
+    def _snapshot(self):
+        """Return a consistent (predictor, encoder, generation) triple"""
+        if self.model is None:
+            self.load_model()
+        else:
+            self.refresh_if_changed()
+        with self._swap_lock:
+            return self.predictor, self.encoder, self.generation
+
+    def _encode_batch(self, records, encoder):
+        """Encode a list of input records into a feature matrix
+
+        Returns the matrix and, for each categorical column holding
+        categories the model has not seen, a mask of the affected records.
+        """
+        X = np.empty((len(records), len(self.feature_columns)), dtype=np.float64)
+        unknown = {}
+        for j, col in enumerate(self.feature_columns):
+            values = [record[col] for record in records]
+            if col in encoder:
+                X[:, j], known = encoder.encode_many(col, values)
+                if not known.all():
+                    unknown[col] = ~known
+            else:
+                X[:, j] = values
+        return X, unknown
+
+    def _predict_proba(self, predictor, encoder, X, unknown):
+        """predict_proba, averaging rows with unseen categories in averaged
+        columns over every known category of those columns
+
+        `unknown` maps a column to the mask of rows whose value in it was
+        not seen in training. Each affected row is expanded to every
+        combination of known codes of its unseen columns and all expanded
+        rows go through one call; more than `max_averaged_rows` of them
+        raise UnknownCategoryError instead.
+        """
+        unknown = {col: mask for col, mask in unknown.items() if col in encoder.averaged}
+        if not unknown:
+            return predictor.predict_proba(X)
+        affected = np.zeros(len(X), dtype=bool)
+        for mask in unknown.values():
+            affected |= mask
+        # Combinations per affected row
+        sizes = np.ones(int(affected.sum()), dtype=np.int64)
+        for col, mask in unknown.items():
+            sizes[mask[affected]] *= len(encoder.codes[col])
+        total = int(sizes.sum())
+        if total > self.max_averaged_rows:
+            raise UnknownCategoryError(
+                f"Averaging unseen {', '.join(unknown)} would predict {total} rows "
+                f"(max {self.max_averaged_rows}); send known categories or smaller batches"
+            )
+
+        expanded = np.repeat(X[affected], sizes, axis=0)
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        # Position of each expanded row within its row's combinations,
+        # read as a mixed-radix number with one digit per unseen column
+        position = np.arange(total) - np.repeat(starts, sizes)
+        stride = np.ones(len(sizes), dtype=np.int64)
+        for col, mask in unknown.items():
+            n_codes = len(encoder.codes[col])
+            rows = mask[affected]
+            expanded_rows = np.repeat(rows, sizes)
+            digit = position // np.repeat(stride, sizes) % n_codes
+            expanded[expanded_rows, self.feature_columns.index(col)] = digit[expanded_rows]
+            stride[rows] *= n_codes
+
+        expanded_proba = predictor.predict_proba(np.vstack([X[~affected], expanded]))
+        n_plain = len(X) - len(sizes)
+        probabilities = np.empty((len(X), expanded_proba.shape[1]))
+        probabilities[~affected] = expanded_proba[:n_plain]
+        probabilities[affected] = np.add.reduceat(expanded_proba[n_plain:], starts, axis=0) / sizes[:, None]
+        return probabilities
+
     def predict(self, input_data):
         """Make predictions"""
         try:
-            if self.model is None:
-                self.load_model()
-                
-            # Prepare input data
-            input_df = pd.DataFrame([input_data])
-            
-            # Transform categorical variables
-            for col in self.categorical_columns:
-                if col in input_df.columns:
-                    input_df[col] = self.label_encoders[col].transform(input_df[col])
-            
-            # Make prediction
-            prediction = self.model.predict(input_df)[0]
-            probabilities = self.model.predict_proba(input_df)[0]
-            confidence = max(probabilities)
-            
-            return {
-                'crop': prediction,
-                'confidence': float(confidence)
+            predictor, encoder, generation = self._snapshot()
+
+            if self.cache is not None:
+                cache_key = (generation,) + self.cache.make_key(input_data)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return dict(cached)
+
+            # Build the feature row directly, without a DataFrame or encoder calls
+            row = np.empty((1, len(self.feature_columns)), dtype=np.float64)
+            unknown = []
+            for j, col in enumerate(self.feature_columns):
+                value = input_data[col]
+                if col in encoder:
+                    row[0, j], known = encoder.encode(col, value)
+                    if not known:
+                        unknown.append(col)
+                else:
+                    row[0, j] = value
+
+            # Derive both the crop and its confidence from one forest walk
+            probabilities = self._predict_proba(predictor, encoder, row,
+                                                {col: np.ones(1, dtype=bool) for col in unknown})[0]
+            best = probabilities.argmax()
+
+            result = {
+                'crop': str(predictor.classes_[best]),
+                'confidence': float(probabilities[best])
             }
-            
+            if unknown:
+                # Encoded with the fallback policy; a retrain would learn them
+                result['unknown_categories'] = unknown
+            if self.cache is not None:
+                self.cache.put(cache_key, dict(result))
+            return result
+
         except Exception as e:
             logger.error(f"Error making prediction: {str(e)}")
-            raise 
\ No newline at end of file
+            raise
+
+    def predict_batch(self, records):
+        """Make predictions for a batch of input records"""
+        try:
+            predictor, encoder, _ = self._snapshot()
+
+            if not records:
+                return []
+
+            # Encode every record at once and walk the forest a single time
+            X, unknown = self._encode_batch(records, encoder)
+            probabilities = self._predict_proba(predictor, encoder, X, unknown)
+            best = probabilities.argmax(axis=1)
+            crops = predictor.classes_[best]
+            confidences = probabilities[np.arange(len(records)), best]
+
+            results = [
+                {'crop': str(crop), 'confidence': float(confidence)}
+                for crop, confidence in zip(crops, confidences)
+            ]
+            for col, mask in unknown.items():
+                for i in np.flatnonzero(mask):
+                    results[i].setdefault('unknown_categories', []).append(col)
+            return results
+
+        except Exception as e:
+            logger.error(f"Error making batch prediction: {str(e)}")
+            raise
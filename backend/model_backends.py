@@ -0,0 +1,118 @@
+import inspect
+import numpy as np
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import GaussianNB
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+DEFAULT_BACKEND = 'random_forest'
+
+# Factories take the number of cores the fit may use (None = library default)
+
+def random_forest(n_jobs=None):
+    return RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42, n_jobs=n_jobs)
+
+def gradient_boosting(n_jobs=None):
+    return HistGradientBoostingClassifier(max_iter=200, learning_rate=0.1, random_state=42)
+
+def catboost(n_jobs=None):
+    try:
+        from catboost import CatBoostClassifier
+    except ImportError:
+        raise ValueError("The catboost backend requires the catboost package")
+    return CatBoostClassifier(iterations=300, depth=6, learning_rate=0.1, thread_count=n_jobs or -1,
+                              random_seed=42, verbose=False, allow_writing_files=False)
+
+def logistic_regression(n_jobs=None):
+    return make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000))
+
+def naive_bayes(n_jobs=None):
+    return GaussianNB()
+
+# Every backend exposes fit, predict_proba and classes_
+BACKENDS = {
+    'random_forest': random_forest,
+    'gradient_boosting': gradient_boosting,
+    'catboost': catboost,
+    'logistic_regression': logistic_regression,
+    'naive_bayes': naive_bayes
+}
+
+# Hyperparameter candidates for GridSearchCV / RandomizedSearchCV
+SEARCH_SPACES = {
+    'random_forest': {
+        'n_estimators': [100, 200, 400],
+        'max_depth': [10, 20, None],
+        'min_samples_leaf': [1, 2, 4],
+        'max_features': ['sqrt', 0.5]
+    },
+    'gradient_boosting': {
+        'learning_rate': [0.05, 0.1, 0.2],
+        'max_iter': [100, 200, 400],
+        'max_leaf_nodes': [15, 31, 63],
+        'l2_regularization': [0.0, 1.0]
+    },
+    'catboost': {
+        'depth': [4, 6, 8],
+        'learning_rate': [0.05, 0.1, 0.2],
+        'iterations': [200, 400]
+    },
+    'logistic_regression': {
+        'logisticregression__C': [0.01, 0.1, 1.0, 10.0, 100.0]
+    },
+    'naive_bayes': {
+        'var_smoothing': [1e-11, 1e-10, 1e-9, 1e-8, 1e-7]
+    }
+}
+
+def create_estimator(backend=DEFAULT_BACKEND, n_jobs=None, **params):
+    """Return a new, unfitted estimator for the named backend"""
+    try:
+        factory = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown model backend: {backend!r}")
+    estimator = factory(n_jobs)
+    if params:
+        estimator.set_params(**params)
+    return estimator
+
+def release_cores(estimator):
+    """Make a fitted estimator predict single-threaded again.
+
+    A forest fitted with n_jobs=-1 would otherwise fan every prediction,
+    even a single row, out over a thread pool. A fitted CatBoost model
+    cannot change its params; serving_predictor limits it instead.
+    """
+    if 'n_jobs' in estimator.get_params():
+        estimator.set_params(n_jobs=None)
+    return estimator
+
+def _takes_thread_count(estimator):
+    # CatBoost's predict methods; a default thread_count is not in get_params()
+    return 'thread_count' in inspect.signature(estimator.predict_proba).parameters
+
+class ThreadLimitedPredictor:
+    """Serves a CatBoost model on `thread_count` threads.
+
+    CatBoost's predict methods take their own thread_count, defaulting to
+    every core whatever the model was fitted with, so it has to be passed
+    on each call.
+    """
+
+    def __init__(self, estimator, thread_count=1):
+        self.estimator = estimator
+        self.thread_count = thread_count
+        self.classes_ = np.asarray(estimator.classes_)
+
+    def predict_proba(self, X):
+        return self.estimator.predict_proba(X, thread_count=self.thread_count)
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+def serving_predictor(estimator):
+    """What predictions should call for a fitted estimator"""
+    if _takes_thread_count(estimator):
+        return ThreadLimitedPredictor(estimator)
+    return estimator
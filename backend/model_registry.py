@@ -0,0 +1,118 @@
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+import joblib
+
+logger = logging.getLogger(__name__)
+
+class ModelRegistry:
+    """Versioned model store with an atomically updated manifest.
+
+    Each version is a single joblib artifact holding the model and its label
+    encoders, written to a temporary file and renamed into place. The
+    manifest names the active version; readers detect a rollout by stat-ing
+    the manifest instead of re-reading the artifacts.
+    """
+
+    def __init__(self, root='models', keep_versions=5):
+        self.root = root
+        self.versions_dir = os.path.join(root, 'versions')
+        self.manifest_path = os.path.join(root, 'manifest.json')
+        self.keep_versions = keep_versions
+
+    def save(self, model, label_encoders, metadata=None, activate=True):
+        """Write a new model version and optionally make it the active one"""
+        os.makedirs(self.versions_dir, exist_ok=True)
+        version = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:8]}"
+        artifact = {
+            'version': version,
+            'model': model,
+            'label_encoders': label_encoders,
+            'metadata': metadata or {}
+        }
+        path = self._artifact_path(version)
+        self._atomic_write(path, lambda f: joblib.dump(artifact, f))
+        logger.info(f"Saved model version {version}")
+        if activate:
+            self.activate(version, metadata)
+        return version
+
+    def activate(self, version, metadata=None):
+        """Point the manifest at an existing version"""
+        if not os.path.exists(self._artifact_path(version)):
+            raise FileNotFoundError(f"Model version not found: {version}")
+        manifest = {
+            'active_version': version,
+            'activated_at': datetime.utcnow().isoformat(),
+            'metadata': metadata or {}
+        }
+        self._atomic_write(self.manifest_path, lambda f: f.write(json.dumps(manifest).encode()))
+        logger.info(f"Activated model version {version}")
+        self.prune()
+
+    def read_manifest(self):
+        """Return the manifest, or None if no version has been activated"""
+        if not os.path.exists(self.manifest_path):
+            return None
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def active_version(self):
+        """Return the active version id, or None"""
+        manifest = self.read_manifest()
+        return manifest['active_version'] if manifest else None
+
+    def manifest_stamp(self):
+        """Cheap change marker for the manifest (None if it does not exist)"""
+        try:
+            st = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return None
+        # os.replace gives the manifest a new inode even within one mtime tick
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def load(self, version=None, mmap_mode=None):
+        """Load a version (the active one by default) as an artifact dict"""
+        version = version or self.active_version()
+        if version is None:
+            raise FileNotFoundError("No active model version. Please train the model first.")
+        return joblib.load(self._artifact_path(version), mmap_mode=mmap_mode)
+
+    def list_versions(self):
+        """Return all stored version ids, oldest first"""
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(
+            name[:-len('.joblib')] for name in os.listdir(self.versions_dir)
+            if name.endswith('.joblib')
+        )
+
+    def prune(self):
+        """Delete the oldest inactive versions beyond keep_versions"""
+        active = self.active_version()
+        inactive = [v for v in self.list_versions() if v != active]
+        for version in inactive[:max(len(inactive) - self.keep_versions, 0)]:
+            try:
+                os.remove(self._artifact_path(version))
+            except FileNotFoundError:
+                pass
+
+    def _artifact_path(self, version):
+        if os.path.basename(version) != version:
+            raise ValueError(f"Invalid model version: {version}")
+        return os.path.join(self.versions_dir, f'{version}.joblib')
+
+    def _atomic_write(self, path, write):
+        tmp_path = f'{path}.tmp-{os.getpid()}-{uuid.uuid4().hex[:8]}'
+        try:
+            with open(tmp_path, 'wb') as f:
+                write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,71 @@
+import logging
+import os
+import time
+import numpy as np
+from sklearn.model_selection import GridSearchCV, ParameterGrid, RandomizedSearchCV, StratifiedKFold
+from model_backends import SEARCH_SPACES, create_estimator
+
+logger = logging.getLogger(__name__)
+
+# 'cv' only cross-validates the backend's default hyperparameters
+SEARCH_MODES = ('cv', 'grid', 'random')
+
+def _native(value):
+    """Convert numpy scalars so reports stay JSON serialisable"""
+    return value.item() if isinstance(value, np.generic) else value
+
+def search_hyperparameters(backend, X, y, mode='grid', cv=5, n_iter=20, n_jobs=-1, random_state=42):
+    """Cross-validate hyperparameter candidates in a process pool.
+
+    Candidates and folds are spread over `n_jobs` worker processes; each
+    candidate itself fits single-threaded so the pool is not
+    oversubscribed. Returns the winning parameters and a report with the
+    score and timings of every candidate.
+    """
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode: {mode!r}")
+    if cv < 2:
+        raise ValueError("cv must be at least 2")
+
+    estimator = create_estimator(backend, n_jobs=1)
+    folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state)
+    space = SEARCH_SPACES[backend] if mode != 'cv' else {}
+    if mode == 'random':
+        n_iter = min(n_iter, len(ParameterGrid(space)))
+        search = RandomizedSearchCV(estimator, space, n_iter=n_iter, cv=folds, scoring='accuracy',
+                                    n_jobs=n_jobs, refit=False, random_state=random_state)
+    else:
+        search = GridSearchCV(estimator, space, cv=folds, scoring='accuracy', n_jobs=n_jobs, refit=False)
+
+    start = time.perf_counter()
+    search.fit(X, y)
+    elapsed = time.perf_counter() - start
+
+    results = search.cv_results_
+    candidates = [
+        {
+            'params': {key: _native(value) for key, value in params.items()},
+            'mean_score': float(results['mean_test_score'][i]),
+            'std_score': float(results['std_test_score'][i]),
+            'mean_fit_seconds': float(results['mean_fit_time'][i]),
+            'mean_score_seconds': float(results['mean_score_time'][i]),
+            'rank': int(results['rank_test_score'][i])
+        }
+        for i, params in enumerate(results['params'])
+    ]
+    candidates.sort(key=lambda candidate: candidate['rank'])
+    best_params = {key: _native(value) for key, value in search.best_params_.items()}
+    report = {
+        'mode': mode,
+        'backend': backend,
+        'cv': cv,
+        'scoring': 'accuracy',
+        'n_jobs': os.cpu_count() if n_jobs == -1 else n_jobs,
+        'elapsed_seconds': elapsed,
+        'best_params': best_params,
+        'best_score': float(search.best_score_),
+        'candidates': candidates
+    }
+    logger.info(f"{mode} search over {len(candidates)} candidates for {backend} took {elapsed:.1f}s, "
+                f"best accuracy {report['best_score']:.4f} with {best_params}")
+    return best_params, report
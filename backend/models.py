@@ -1,11 +1,15 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect
 
 db = SQLAlchemy()
 
 class SensorData(db.Model):
+    # Never reuse ids of archived rows (SQLite otherwise restarts at max(id) + 1)
+    __table_args__ = {'sqlite_autoincrement': True}
+
     id = db.Column(db.Integer, primary_key=True)
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     temperature = db.Column(db.Float)
     humidity = db.Column(db.Float)
     moisture = db.Column(db.Integer)
@@ -41,8 +45,11 @@ class FarmerInput(db.Model):
     nitrogen = db.Column(db.Float)        # Nitrogen content
     phosphorus = db.Column(db.Float)      # Phosphorus content
     potassium = db.Column(db.Float)       # Potassium content
+    rainfall = db.Column(db.Float)        # Rainfall
     prediction = db.Column(db.String(50)) # Recommended crop
     confidence = db.Column(db.Float)      # Prediction confidence
+    confirmed_crop = db.Column(db.String(50))  # Crop the farmer actually planted, once confirmed
+    confirmed_at = db.Column(db.DateTime, index=True)
 
     def to_dict(self):
         return {
@@ -57,8 +64,11 @@ class FarmerInput(db.Model):
             'nitrogen': self.nitrogen,
             'phosphorus': self.phosphorus,
             'potassium': self.potassium,
+            'rainfall': self.rainfall,
             'prediction': self.prediction,
-            'confidence': self.confidence
+            'confidence': self.confidence,
+            'confirmed_crop': self.confirmed_crop,
+            'confirmed_at': self.confirmed_at.isoformat() if self.confirmed_at else None
         }
 
 class SystemStatus(db.Model):
@@ -75,4 +85,74 @@ class SystemStatus(db.Model):
             'status': self.status,
             'message': self.message,
             'sensor_status': self.sensor_status
-        } 
\ No newline at end of file
+        }
+
+class SensorRollup(db.Model):
+    """Per-minute/hour/day aggregates of SensorData, updated on ingestion"""
+    __table_args__ = (db.UniqueConstraint('resolution', 'bucket_start'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    resolution = db.Column(db.String(10), nullable=False)   # 'minute', 'hour', 'day'
+    bucket_start = db.Column(db.DateTime, nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    temperature_min = db.Column(db.Float)
+    temperature_max = db.Column(db.Float)
+    temperature_sum = db.Column(db.Float)
+    temperature_count = db.Column(db.Integer)
+    humidity_min = db.Column(db.Float)
+    humidity_max = db.Column(db.Float)
+    humidity_sum = db.Column(db.Float)
+    humidity_count = db.Column(db.Integer)
+    moisture_min = db.Column(db.Float)
+    moisture_max = db.Column(db.Float)
+    moisture_sum = db.Column(db.Float)
+    moisture_count = db.Column(db.Integer)
+    nitrogen_min = db.Column(db.Float)
+    nitrogen_max = db.Column(db.Float)
+    nitrogen_sum = db.Column(db.Float)
+    nitrogen_count = db.Column(db.Integer)
+    phosphorus_min = db.Column(db.Float)
+    phosphorus_max = db.Column(db.Float)
+    phosphorus_sum = db.Column(db.Float)
+    phosphorus_count = db.Column(db.Integer)
+    potassium_min = db.Column(db.Float)
+    potassium_max = db.Column(db.Float)
+    potassium_sum = db.Column(db.Float)
+    potassium_count = db.Column(db.Integer)
+
+    METRICS = ['temperature', 'humidity', 'moisture', 'nitrogen', 'phosphorus', 'potassium']
+
+    def to_dict(self):
+        data = {
+            'resolution': self.resolution,
+            'bucket_start': self.bucket_start.isoformat(),
+            'count': self.count
+        }
+        for metric in self.METRICS:
+            count = getattr(self, f'{metric}_count') or 0
+            data[metric] = {
+                'min': getattr(self, f'{metric}_min'),
+                'max': getattr(self, f'{metric}_max'),
+                'mean': getattr(self, f'{metric}_sum') / count if count else None,
+                'count': count
+            }
+        return data
+
+def create_missing_columns(engine):
+    """Add nullable columns added to models after their tables already existed"""
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    connection.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}')
+
+def create_missing_indexes(engine):
+    """Create indexes added to models after their tables already existed"""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
@@ -0,0 +1,83 @@
+import logging
+import random
+import threading
+import paho.mqtt.client as mqtt
+
+logger = logging.getLogger(__name__)
+
+def backoff_delay(attempt, min_delay, max_delay):
+    """Exponential backoff with jitter: a random delay in [cap/2, cap]"""
+    cap = min(max_delay, min_delay * (2 ** attempt))
+    return cap / 2 + random.uniform(0, cap / 2)
+
+class MqttSupervisor:
+    """Owns the MQTT network loop on a background thread.
+
+    Connecting, running the loop and reconnecting after failures all
+    happen on that thread, with exponential backoff and jitter between
+    attempts, so neither paho callbacks nor app startup ever sleep.
+    """
+
+    def __init__(self, client, host, port, keepalive=60, min_delay=1.0, max_delay=120.0):
+        self.client = client
+        self.host = host
+        self.port = port
+        self.keepalive = keepalive
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self._stop = threading.Event()
+        self._thread = None
+        self.connected = False
+        self.attempts = 0
+        self.next_retry_in = None
+
+    def start(self):
+        """Start the supervisor thread (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='mqtt-supervisor', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=5):
+        """Disconnect and stop the supervisor thread"""
+        self._stop.set()
+        try:
+            self.client.disconnect()
+        except Exception:
+            pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self):
+        return {
+            'connected': self.connected,
+            'failed_attempts': self.attempts,
+            'next_retry_in': self.next_retry_in
+        }
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                logger.info(f"Connecting to MQTT broker at {self.host}:{self.port}...")
+                self.client.connect(self.host, self.port, self.keepalive)
+                rc = mqtt.MQTT_ERR_SUCCESS
+                while not self._stop.is_set() and rc == mqtt.MQTT_ERR_SUCCESS:
+                    rc = self.client.loop(timeout=1.0)
+                    self.connected = self.client.is_connected()
+                    if self.connected:
+                        self.attempts = 0
+                        self.next_retry_in = None
+                if not self._stop.is_set():
+                    logger.warning(f"MQTT network loop ended: {mqtt.error_string(rc)}")
+            except Exception as e:
+                logger.error(f"Error connecting to MQTT broker: {str(e)}")
+            self.connected = False
+            if self._stop.is_set():
+                break
+            delay = backoff_delay(self.attempts, self.min_delay, self.max_delay)
+            self.attempts += 1
+            self.next_retry_in = delay
+            logger.info(f"Reconnecting to MQTT broker in {delay:.1f} seconds")
+            self._stop.wait(delay)
@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import OrderedDict
+
+class PredictionCache:
+    """Bounded LRU cache with TTL for prediction results.
+
+    Keys are the canonicalized feature tuple, with numeric features rounded
+    to `precision` decimal places so that sensor jitter maps to the same
+    entry. `precision` may also be a dict of per-column overrides.
+    """
+
+    def __init__(self, feature_columns, categorical_columns, max_size=1024, ttl=300, precision=1):
+        self.feature_columns = list(feature_columns)
+        self.categorical_columns = set(categorical_columns)
+        self.max_size = max_size
+        self.ttl = ttl
+        if isinstance(precision, dict):
+            self.precision = {col: precision.get(col, 1) for col in self.feature_columns}
+        else:
+            self.precision = {col: precision for col in self.feature_columns}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, input_data):
+        """Build the canonical cache key for a prediction request"""
+        key = []
+        for col in self.feature_columns:
+            value = input_data[col]
+            if col in self.categorical_columns:
+                key.append(str(value))
+            else:
+                key.append(round(float(value), self.precision[col]))
+        return tuple(key)
+
+    def get(self, key):
+        """Return the cached result for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """Store a result, evicting the least recently used entries if full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every cached result (e.g. after the model is replaced)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters and the current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
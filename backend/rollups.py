@@ -0,0 +1,163 @@
+import itertools
+import math
+import os
+from datetime import datetime, time, timedelta
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import SensorData, SensorRollup
+
+RESOLUTIONS = {
+    'minute': lambda ts: ts.replace(second=0, microsecond=0),
+    'hour': lambda ts: ts.replace(minute=0, second=0, microsecond=0),
+    'day': lambda ts: ts.replace(hour=0, minute=0, second=0, microsecond=0)
+}
+
+BUCKET_SECONDS = {'minute': 60, 'hour': 3600, 'day': 86400}
+DEFAULT_ROLLUP_LIMIT = 100
+MAX_ROLLUP_LIMIT = 10000
+
+def parse_rollup_limit(value, resolution, since=None, until=None):
+    """Parse the rollup limit query parameter
+
+    Without an explicit limit, a request with `since` gets every bucket
+    in [since, until or now), so a 7-day hourly chart receives all 168
+    buckets instead of a fixed-size page.
+    """
+    if value is not None:
+        try:
+            limit = int(value)
+        except ValueError:
+            raise ValueError(f"Invalid limit: {value!r}")
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        return min(limit, MAX_ROLLUP_LIMIT)
+    if since is None or resolution not in BUCKET_SECONDS:
+        return DEFAULT_ROLLUP_LIMIT
+    span = ((until or datetime.utcnow()) - since).total_seconds()
+    # +1 for the partial bucket `since` falls into
+    return max(1, min(math.ceil(span / BUCKET_SECONDS[resolution]) + 1, MAX_ROLLUP_LIMIT))
+
+def aggregate(rows, resolution):
+    """Aggregate SensorData mappings into {bucket_start: column values}"""
+    truncate = RESOLUTIONS[resolution]
+    buckets = {}
+    for row in rows:
+        bucket_start = truncate(row['timestamp'])
+        bucket = buckets.get(bucket_start)
+        if bucket is None:
+            bucket = {'resolution': resolution, 'bucket_start': bucket_start, 'count': 0}
+            for metric in SensorRollup.METRICS:
+                bucket[f'{metric}_min'] = None
+                bucket[f'{metric}_max'] = None
+                bucket[f'{metric}_sum'] = 0.0
+                bucket[f'{metric}_count'] = 0
+            buckets[bucket_start] = bucket
+        bucket['count'] += 1
+        for metric in SensorRollup.METRICS:
+            value = row.get(metric)
+            if value is None:
+                continue
+            value = float(value)
+            low, high = bucket[f'{metric}_min'], bucket[f'{metric}_max']
+            bucket[f'{metric}_min'] = value if low is None else min(low, value)
+            bucket[f'{metric}_max'] = value if high is None else max(high, value)
+            bucket[f'{metric}_sum'] += value
+            bucket[f'{metric}_count'] += 1
+    return buckets
+
+UPSERT_DIALECTS = {
+    # dialect name: (insert construct, scalar least, scalar greatest)
+    'sqlite': (sqlite_insert, func.min, func.max),
+    'postgresql': (postgresql_insert, func.least, func.greatest)
+}
+
+def _merge_columns(excluded, least=func.min, greatest=func.max):
+    """ON CONFLICT update clause merging new bucket stats into stored ones"""
+    table = SensorRollup.__table__.c
+    columns = {'count': table['count'] + excluded['count']}
+    for metric in SensorRollup.METRICS:
+        low, high = f'{metric}_min', f'{metric}_max'
+        # SQLite's scalar min()/max() return NULL if either side is NULL
+        columns[low] = least(func.coalesce(table[low], excluded[low]),
+                             func.coalesce(excluded[low], table[low]))
+        columns[high] = greatest(func.coalesce(table[high], excluded[high]),
+                                 func.coalesce(excluded[high], table[high]))
+        for suffix in ('sum', 'count'):
+            name = f'{metric}_{suffix}'
+            columns[name] = func.coalesce(table[name], 0) + excluded[name]
+    return columns
+
+def apply_rollups(session, rows):
+    """Fold newly ingested SensorData mappings into every rollup resolution"""
+    if not rows:
+        return
+    dialect = session.get_bind().dialect.name
+    if dialect not in UPSERT_DIALECTS:
+        raise ValueError(f"Rollups are not supported on {dialect}")
+    insert, least, greatest = UPSERT_DIALECTS[dialect]
+    for resolution in RESOLUTIONS:
+        values = list(aggregate(rows, resolution).values())
+        stmt = insert(SensorRollup)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['resolution', 'bucket_start'],
+            set_=_merge_columns(stmt.excluded, least, greatest)
+        )
+        session.execute(stmt, values)
+
+def _archived_rows(session, archive):
+    """Archived rows that are not also still live (an interrupted archival
+    run can leave both copies; the live one wins, as in read_sensor_history)"""
+    partitions = archive.partitions()
+    if not partitions:
+        return
+    end = datetime.combine(partitions[-1] + timedelta(days=1), time.min)
+    live = set(session.query(SensorData.id, SensorData.timestamp).filter(SensorData.timestamp < end).all())
+    for record in archive.iter_records():
+        if (record['id'], record['timestamp']) not in live:
+            yield record
+
+def rebuild_rollups(session, archive=None, chunk_size=5000):
+    """Recompute all rollups from the raw SensorData table
+
+    Pass the SensorArchive older readings were moved to, otherwise the
+    buckets of every archived range are lost.
+    """
+    session.query(SensorRollup).delete()
+    columns = [SensorData.timestamp] + [getattr(SensorData, m) for m in SensorRollup.METRICS]
+    live = (row._asdict() for row in
+            session.query(*columns).order_by(SensorData.timestamp).yield_per(chunk_size))
+    rows = itertools.chain(_archived_rows(session, archive) if archive is not None else (), live)
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            apply_rollups(session, chunk)
+            chunk = []
+    apply_rollups(session, chunk)
+    session.commit()
+
+def query_rollups(resolution, since=None, until=None, limit=1000):
+    """Return rollup buckets for a resolution in chronological order"""
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Invalid resolution: {resolution!r} (expected one of {list(RESOLUTIONS)})")
+    query = SensorRollup.query.filter(SensorRollup.resolution == resolution)
+    if since is not None:
+        query = query.filter(SensorRollup.bucket_start >= RESOLUTIONS[resolution](since))
+    if until is not None:
+        query = query.filter(SensorRollup.bucket_start < until)
+    # Take the newest `limit` buckets, then return them oldest first for charting
+    rows = query.order_by(SensorRollup.bucket_start.desc()).limit(limit).all()
+    return rows[::-1]
+
+if __name__ == "__main__":
+    # Backfill rollups for readings stored before rollups were maintained
+    # A bare app: importing app.py would also start MQTT ingestion in this process
+    from archive import SensorArchive
+    from database import create_db_app
+    from models import db
+    app = create_db_app()
+    sensor_archive = SensorArchive(os.getenv('ARCHIVE_DIR', 'archive/sensor_data'))
+    with app.app_context():
+        rebuild_rollups(db.session, sensor_archive)
+        print("✅ Sensor rollups rebuilt")
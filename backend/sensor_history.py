@@ -0,0 +1,82 @@
+import base64
+from datetime import datetime
+from sqlalchemy import or_
+from models import SensorData
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+def parse_timestamp(value):
+    """Parse an ISO 8601 query parameter into a naive UTC datetime"""
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"Invalid timestamp: {value!r}")
+    if parsed.tzinfo is not None:
+        parsed = (parsed - parsed.utcoffset()).replace(tzinfo=None)
+    return parsed
+
+def encode_cursor(row):
+    """Opaque keyset cursor pointing just past `row`"""
+    raw = f"{row.timestamp.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor"""
+    try:
+        timestamp, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+def parse_limit(value):
+    """Parse the page size query parameter, capped at MAX_PAGE_SIZE"""
+    if value is None:
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError(f"Invalid limit: {value!r}")
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return min(limit, MAX_PAGE_SIZE)
+
+def sensor_page_query(since=None, until=None, before=None):
+    """SensorData newest first, strictly before the (timestamp, id) key `before`
+
+    The keyset condition is written as timestamp <= t AND (timestamp < t
+    OR id < i) rather than the equivalent OR of the two cases: only the
+    first form gives SQLite an upper bound to SEARCH the timestamp index
+    with, so a deep page does not walk every newer row.
+    """
+    query = SensorData.query
+    if since is not None:
+        query = query.filter(SensorData.timestamp >= since)
+    if until is not None:
+        query = query.filter(SensorData.timestamp < until)
+    if before is not None:
+        timestamp, row_id = before
+        query = query.filter(
+            SensorData.timestamp <= timestamp,
+            or_(SensorData.timestamp < timestamp, SensorData.id < row_id)
+        )
+    return query.order_by(SensorData.timestamp.desc(), SensorData.id.desc())
+
+def query_sensor_page(since=None, until=None, limit=DEFAULT_PAGE_SIZE, cursor=None, archive=None):
+    """Return one page of SensorData, newest first, and the next cursor.
+
+    Uses the timestamp index for both the range filter and the keyset
+    pagination, so the cost is proportional to the page, not the table.
+    When the live table runs out, the page continues from `archive`
+    (a SensorArchive) with the same ordering and cursor format.
+    """
+    before = decode_cursor(cursor) if cursor is not None else None
+    rows = sensor_page_query(since, until, before).limit(limit).all()
+    if archive is not None and len(rows) < limit:
+        if rows:
+            before = (rows[-1].timestamp, rows[-1].id)
+        rows += archive.read_page(since, until, before, limit - len(rows))
+    next_cursor = encode_cursor(rows[-1]) if len(rows) == limit else None
+    return rows, next_cursor
@@ -0,0 +1,89 @@
+import logging
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+SENSOR_FIELDS = ['temperature', 'humidity', 'moisture', 'nitrogen', 'phosphorus', 'potassium']
+
+STATUS_MESSAGES = {
+    'offline': "No sensor data available",
+    'error': "Sensor data is not recent",
+    'online': "System is functioning normally"
+}
+
+class SensorStatusTracker:
+    """In-memory "last seen" tracker behind /api/system-status.
+
+    The ingestion path calls `observe` with each committed batch. Reads
+    only look at an immutable (timestamp, reading) tuple that is replaced
+    atomically, so they take no locks and never touch the database,
+    except for an occasional `refresh_interval` resync via `loader` (for
+    processes that do not ingest themselves). `on_transition(snapshot)` is
+    called when the computed status changes, e.g. to persist history.
+    """
+
+    def __init__(self, stale_after=300, refresh_interval=5.0, loader=None, on_transition=None):
+        self.stale_after = stale_after
+        self.refresh_interval = refresh_interval
+        self.loader = loader
+        self.on_transition = on_transition
+        self._latest = None
+        self._last_status = None
+        self._next_refresh = 0.0
+        self._transition_lock = threading.Lock()
+
+    def observe(self, rows):
+        """Record newly ingested SensorData mappings"""
+        if not rows:
+            return
+        newest = max(rows, key=lambda row: row['timestamp'])
+        latest = self._latest
+        if latest is None or newest['timestamp'] >= latest[0]:
+            self._latest = (newest['timestamp'], {field: newest.get(field) for field in SENSOR_FIELDS})
+        self.snapshot()
+
+    def refresh(self, force=False):
+        """Resync the last seen reading from the database via `loader`"""
+        now = time.monotonic()
+        if self.loader is None or (not force and now < self._next_refresh):
+            return
+        self._next_refresh = now + self.refresh_interval
+        row = self.loader()
+        if row is not None and (self._latest is None or row.timestamp > self._latest[0]):
+            self._latest = (row.timestamp, {field: getattr(row, field) for field in SENSOR_FIELDS})
+
+    def snapshot(self, now=None):
+        """Compute the current status from the last seen reading"""
+        now = now or datetime.utcnow()
+        latest = self._latest
+        if latest is None:
+            status = 'offline'
+        elif (now - latest[0]).total_seconds() > self.stale_after:
+            status = 'error'
+        else:
+            status = 'online'
+        snapshot = {
+            'timestamp': now.isoformat(),
+            'status': status,
+            'message': STATUS_MESSAGES[status],
+            'last_seen': latest[0].isoformat() if latest else None,
+            'sensor_status': dict(latest[1]) if latest else {field: None for field in SENSOR_FIELDS}
+        }
+        if status != self._last_status:
+            self._transition(snapshot)
+        return snapshot
+
+    def _transition(self, snapshot):
+        with self._transition_lock:
+            previous = self._last_status
+            if snapshot['status'] == previous:
+                return
+            self._last_status = snapshot['status']
+        logger.info(f"System status: {previous} -> {snapshot['status']}")
+        if self.on_transition is not None:
+            try:
+                self.on_transition(snapshot)
+            except Exception as e:
+                logger.error(f"Error recording status transition: {str(e)}")
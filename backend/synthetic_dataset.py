@@ -0,0 +1,50 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+# Per-crop means of N, P, K, temperature, humidity, moisture, rainfall.
+# Loosely follows the public crop recommendation data; moisture is in the
+# ESP32 sensor's raw units, which that data does not have
+CROP_PROFILES = {
+    'rice': (80, 48, 40, 23.7, 82.3, 720, 236.2),
+    'maize': (78, 48, 20, 22.4, 65.1, 480, 84.8),
+    'cotton': (118, 46, 20, 24.0, 79.8, 430, 80.4),
+    'chickpea': (40, 68, 80, 18.9, 16.9, 260, 80.1),
+    'banana': (100, 82, 50, 27.4, 80.4, 610, 104.6),
+    'coffee': (101, 29, 30, 25.5, 58.9, 560, 158.1)
+}
+NUMERIC_SPREAD = (12, 10, 8, 2.5, 5.0, 60, 20.0)
+NUMERIC_COLUMNS = ['N', 'P', 'K', 'temperature', 'humidity', 'moisture', 'rainfall']
+CATEGORIES = {
+    'soil_type': ['alluvial', 'black', 'red', 'laterite'],
+    'weather': ['sunny', 'rainy', 'cloudy'],
+    'region': ['karnataka', 'kerala', 'tamil_nadu', 'maharashtra']
+}
+
+def generate_dataset(n_samples=5000, seed=42):
+    """Synthetic training data with every column the model expects"""
+    rng = np.random.default_rng(seed)
+    labels = rng.choice(list(CROP_PROFILES), n_samples)
+    means = np.array([CROP_PROFILES[label] for label in labels])
+    values = rng.normal(means, NUMERIC_SPREAD)
+    df = pd.DataFrame(values, columns=NUMERIC_COLUMNS)
+    for col in ['N', 'P', 'K', 'moisture']:
+        df[col] = df[col].round().clip(lower=0).astype(int)
+    for col in ['temperature', 'humidity', 'rainfall']:
+        df[col] = df[col].clip(lower=0).round(2)
+    df['humidity'] = df['humidity'].clip(upper=100)
+    for col, choices in CATEGORIES.items():
+        df[col] = rng.choice(choices, n_samples)
+    df['label'] = labels
+    return df
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic crop recommendation dataset")
+    parser.add_argument('--output', default=os.path.join('data', 'synthetic_crop_recommendation.csv'))
+    parser.add_argument('--samples', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    generate_dataset(args.samples, args.seed).to_csv(args.output, index=False)
+    print(f"✅ Wrote {args.samples} synthetic samples to {args.output}")
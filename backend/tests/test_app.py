@@ -1,7 +1,9 @@
 import unittest
+from unittest import mock
 from app import app, db
 from models import SensorData, FarmerInput, SystemStatus
 import json
+from datetime import datetime, timedelta
 
 class TestApp(unittest.TestCase):
     def setUp(self):
@@ -35,6 +37,56 @@ class TestApp(unittest.TestCase):
         self.assertEqual(len(data), 1)
         self.assertEqual(data[0]['temperature'], 25.5)
 
+    def test_sensor_data_pagination(self):
+        start = datetime(2025, 1, 1)
+        with app.app_context():
+            for i in range(5):
+                db.session.add(SensorData(
+                    timestamp=start + timedelta(minutes=i),
+                    temperature=20.0 + i,
+                    humidity=60.0,
+                    moisture=500,
+                    nitrogen=45.0,
+                    phosphorus=35.0,
+                    potassium=40.0
+                ))
+            db.session.commit()
+
+        response = self.client.get('/api/sensor-data?limit=2')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual([row['temperature'] for row in data], [24.0, 23.0])
+        cursor = response.headers['X-Next-Cursor']
+
+        response = self.client.get(f'/api/sensor-data?limit=2&cursor={cursor}')
+        data = json.loads(response.data)
+        self.assertEqual([row['temperature'] for row in data], [22.0, 21.0])
+
+        response = self.client.get('/api/sensor-data?since=2025-01-01T00:03:00')
+        data = json.loads(response.data)
+        self.assertEqual([row['temperature'] for row in data], [24.0, 23.0])
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+        response = self.client.get('/api/sensor-data?since=yesterday')
+        self.assertEqual(response.status_code, 400)
+
+    def test_sensor_data_etag(self):
+        response = self.client.get('/api/sensor-data')
+        etag = response.headers['ETag']
+        self.assertTrue(etag.startswith('W/'))
+
+        response = self.client.get('/api/sensor-data', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        with app.app_context():
+            db.session.add(SensorData(temperature=25.5, humidity=60.0, moisture=500,
+                                      nitrogen=45.0, phosphorus=35.0, potassium=40.0))
+            db.session.commit()
+        response = self.client.get('/api/sensor-data', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.data)), 1)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
     def test_predict_crop(self):
         # Create test sensor data
         with app.app_context():
@@ -63,6 +115,72 @@ class TestApp(unittest.TestCase):
         self.assertIn('crop', data)
         self.assertIn('confidence', data)
 
+    def test_confirm_prediction(self):
+        with app.app_context():
+            farmer_input = FarmerInput(soil_type='alluvial', weather='sunny', region='karnataka',
+                                       prediction='rice', confidence=0.8)
+            db.session.add(farmer_input)
+            db.session.commit()
+            input_id = farmer_input.id
+
+        response = self.client.post(f'/api/predict/{input_id}/confirm', json={'crop': 'maize'})
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['confirmed_crop'], 'maize')
+        self.assertIsNotNone(data['confirmed_at'])
+
+        self.assertEqual(self.client.post(f'/api/predict/{input_id}/confirm', json={}).status_code, 400)
+        self.assertEqual(self.client.post('/api/predict/999999/confirm', json={'crop': 'rice'}).status_code, 404)
+        response = self.client.post(f'/api/predict/{input_id}/confirm', json={'crop': 'rice'})
+        self.assertEqual(response.status_code, 409)
+        with app.app_context():
+            self.assertEqual(db.session.get(FarmerInput, input_id).confirmed_crop, 'maize')
+
+    def test_predict_records_input_only_on_request(self):
+        payload = {'N': 90, 'P': 42, 'K': 43, 'temperature': 20.8, 'humidity': 82.0, 'moisture': 500,
+                   'rainfall': 202.9, 'soil_type': 'alluvial', 'weather': 'sunny', 'region': 'karnataka'}
+        with mock.patch('app.model.predict', return_value={'crop': 'rice', 'confidence': 0.9}):
+            response = self.client.post('/api/predict', json=payload)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('input_id', response.get_json())
+            with app.app_context():
+                self.assertEqual(FarmerInput.query.count(), 0)
+
+            response = self.client.post('/api/predict', json=dict(payload, record=True))
+            self.assertIsNotNone(response.get_json()['input_id'])
+
+            # A failed write does not fail the prediction
+            with mock.patch.object(db.session, 'commit', side_effect=RuntimeError('database is locked')):
+                response = self.client.post('/api/predict', json=dict(payload, record=True))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()['crop'], 'rice')
+            self.assertIsNone(response.get_json()['input_id'])
+
+    def test_stream_pushes_sensor_data(self):
+        from app import live_feed
+        response = self.client.get('/api/stream', buffered=False)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        chunks = iter(response.response)
+        self.assertTrue(next(chunks).startswith(b'event: system-status'))
+        live_feed.publish('sensor-data', {'temperature': 25.5})
+        message = next(chunks)
+        while message.startswith(b'event: system-status'):
+            message = next(chunks)
+        self.assertTrue(message.startswith(b'event: sensor-data'))
+        self.assertIn(b'25.5', message)
+        response.close()
+
+    def test_stream_turns_clients_away_when_full(self):
+        from app import live_feed
+        max_subscribers, live_feed.max_subscribers = live_feed.max_subscribers, 0
+        try:
+            response = self.client.get('/api/stream')
+        finally:
+            live_feed.max_subscribers = max_subscribers
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response.headers)
+        self.assertTrue(response.data.startswith(b'retry: '))
+
     def test_system_status(self):
         # Test GET /api/system-status
         response = self.client.get('/api/system-status')
@@ -72,5 +190,9 @@ class TestApp(unittest.TestCase):
         self.assertIn('message', data)
         self.assertIn('sensor_status', data)
 
+        response = self.client.get('/api/system-status',
+                                   headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,83 @@
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from models import db, SensorData
+from archive import SensorArchive, read_sensor_history
+from sensor_history import query_sensor_page, encode_cursor
+from tests.test_ingestion import make_app, make_reading
+
+class TestSensorArchive(unittest.TestCase):
+    def setUp(self):
+        self.app = make_app()
+        self.root = tempfile.mkdtemp()
+        self.archive = SensorArchive(self.root)
+        start = datetime(2025, 1, 1, 22, 0)
+        with self.app.app_context():
+            for i in range(8):
+                row = make_reading(i)
+                row['timestamp'] = start + timedelta(hours=i)
+                db.session.add(SensorData(**row))
+            db.session.commit()
+        self.cutoff = start + timedelta(hours=5)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_archive_moves_rows(self):
+        with self.app.app_context():
+            self.assertIsNone(self.archive.stamp())
+            moved = self.archive.archive_older_than(db.session, self.cutoff, chunk_size=2)
+            self.assertEqual(moved, 5)
+            self.assertEqual(SensorData.query.count(), 3)
+            self.assertEqual(len(self.archive.partitions()), 2)
+            self.assertIsNotNone(self.archive.stamp())
+
+            history = read_sensor_history(db.session, self.archive)
+            self.assertEqual(list(history['id']), list(range(1, 9)))
+            self.assertAlmostEqual(history['temperature'].iloc[0], 25.0, places=4)
+
+    def test_pages_continue_into_archive(self):
+        with self.app.app_context():
+            self.archive.archive_older_than(db.session, self.cutoff)
+            rows, cursor = query_sensor_page(limit=5, archive=self.archive)
+            self.assertEqual([r.id for r in rows], [8, 7, 6, 5, 4])
+            rows, cursor = query_sensor_page(limit=5, cursor=cursor, archive=self.archive)
+            self.assertEqual([r.id for r in rows], [3, 2, 1])
+            self.assertIsNone(cursor)
+            # Archived rows keep the API shape and produce valid cursors
+            self.assertEqual(rows[0].to_dict()['moisture'], make_reading(2)['moisture'])
+            self.assertTrue(encode_cursor(rows[0]))
+
+    def test_range_filter_prunes_archive(self):
+        with self.app.app_context():
+            self.archive.archive_older_than(db.session, self.cutoff)
+            since = datetime(2025, 1, 2, 0, 0)
+            rows, _ = query_sensor_page(since=since, until=self.cutoff, archive=self.archive)
+            self.assertEqual([r.id for r in rows], [5, 4, 3])
+    def test_ids_are_not_reused_after_archiving(self):
+        with self.app.app_context():
+            self.archive.archive_older_than(db.session, datetime(2030, 1, 1))
+            row = SensorData(**make_reading())
+            db.session.add(row)
+            db.session.commit()
+            self.assertEqual(row.id, 9)
+
+    def test_reused_ids_are_not_deduplicated(self):
+        # Databases created before sqlite_autoincrement can still reuse ids
+        with self.app.app_context():
+            self.archive.archive_older_than(db.session, datetime(2030, 1, 1))
+            db.session.add(SensorData(**dict(make_reading(), id=1, timestamp=datetime(2025, 1, 3))))
+            db.session.commit()
+            self.archive.archive_older_than(db.session, datetime(2030, 1, 1))
+            history = read_sensor_history(db.session, self.archive)
+            self.assertEqual(len(history), 9)
+            self.assertEqual(len(self.archive.read()), 9)
+            rows, _ = query_sensor_page(limit=20, archive=self.archive)
+            self.assertEqual(len(rows), 9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+from sklearn.preprocessing import LabelEncoder
+from category_encoding import CategoryEncoder, UnknownCategoryError
+
+def fitted(values):
+    return LabelEncoder().fit(values)
+
+class TestCategoryEncoder(unittest.TestCase):
+    def setUp(self):
+        self.label_encoders = {
+            'soil_type': fitted(['alluvial', 'black', 'red']),
+            'region': fitted(['kerala', 'tamil_nadu'])
+        }
+
+    def test_known_values_match_label_encoder(self):
+        encoder = CategoryEncoder(self.label_encoders)
+        values = ['red', 'alluvial', 'black', 'red']
+        codes, known = encoder.encode_many('soil_type', values)
+        np.testing.assert_array_equal(codes, self.label_encoders['soil_type'].transform(values))
+        self.assertTrue(known.all())
+        self.assertEqual(encoder.encode('soil_type', 'black'), (1, True))
+
+    def test_error_policy(self):
+        encoder = CategoryEncoder(self.label_encoders)
+        with self.assertRaisesRegex(UnknownCategoryError, "Unknown region: 'punjab'"):
+            encoder.encode('region', 'punjab')
+        with self.assertRaises(UnknownCategoryError):
+            encoder.encode_many('region', ['kerala', 'punjab'])
+
+    def test_average_policy_flags_unseen_values(self):
+        encoder = CategoryEncoder(self.label_encoders, policy='average')
+        self.assertEqual(encoder.averaged, {'soil_type', 'region'})
+        self.assertEqual(encoder.encode('region', 'punjab'), (0, False))
+        self.assertEqual(encoder.encode('region', ['not', 'hashable']), (0, False))
+        codes, known = encoder.encode_many('soil_type', ['red', 'volcanic', 'black', 'peat'])
+        np.testing.assert_array_equal(codes, [2, 0, 1, 0])
+        np.testing.assert_array_equal(known, [True, False, True, False])
+        codes, known = encoder.encode_many('region', ['kerala', {'name': 'punjab'}])
+        np.testing.assert_array_equal(known, [True, False])
+
+    def test_default_policy(self):
+        encoder = CategoryEncoder(self.label_encoders, policy='default')
+        # alluvial is the loader's default soil type; karnataka was never
+        # seen, so unseen regions are averaged instead
+        self.assertEqual(encoder.encode('soil_type', 'volcanic'), (0, False))
+        self.assertEqual(encoder.averaged, {'region'})
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            CategoryEncoder(self.label_encoders, policy='ignore')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from models import SensorRollup
+from database import database_url, engine_options, configure_engine
+from rollups import UPSERT_DIALECTS, _merge_columns
+
+class TestDatabaseProfile(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        url = f"sqlite:///{os.path.join(self.tmpdir, 'test.db')}"
+        self.engine = configure_engine(create_engine(url, **engine_options(url)))
+
+    def tearDown(self):
+        self.engine.dispose()
+        shutil.rmtree(self.tmpdir)
+
+    def test_pragmas_applied(self):
+        with self.engine.connect() as connection:
+            pragma = lambda name: connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+            self.assertEqual(pragma('journal_mode'), 'wal')
+            self.assertEqual(pragma('synchronous'), 1)  # NORMAL
+            self.assertEqual(pragma('busy_timeout'), 5000)
+
+    def test_reader_not_blocked_by_writer(self):
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql('CREATE TABLE t (x INTEGER)')
+            connection.exec_driver_sql('INSERT INTO t VALUES (1)')
+        writer = self.engine.connect()
+        try:
+            writer.exec_driver_sql('BEGIN IMMEDIATE')
+            writer.exec_driver_sql('INSERT INTO t VALUES (2)')
+            # The open write transaction is invisible to, and does not block, readers
+            with self.engine.connect() as reader:
+                self.assertEqual(reader.exec_driver_sql('SELECT COUNT(*) FROM t').scalar(), 1)
+        finally:
+            writer.rollback()
+            writer.close()
+
+    def test_archive_cli_does_not_start_the_app(self):
+        from models import db
+        db.metadata.create_all(self.engine)
+        backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, DATABASE_URL=str(self.engine.url), ARCHIVE_DIR=os.path.join(self.tmpdir, 'archive'))
+        result = subprocess.run([sys.executable, os.path.join(backend, 'archive.py'), '--retention-days', '1'],
+                                cwd=backend, env=env, capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn('Archived 0 sensor readings', result.stdout)
+        # app.py announces itself (and connects to MQTT) on import
+        self.assertNotIn('Starting application', result.stdout)
+
+    def test_server_database_url(self):
+        with mock.patch.dict(os.environ, {'DATABASE_URL': 'postgres://u:p@db:5432/crops'}):
+            url = database_url()
+        self.assertEqual(url, 'postgresql://u:p@db:5432/crops')
+        options = engine_options(url)
+        self.assertTrue(options['pool_pre_ping'])
+        self.assertNotIn('connect_args', options)
+
+    def test_postgresql_rollup_upsert(self):
+        insert, least, greatest = UPSERT_DIALECTS['postgresql']
+        stmt = insert(SensorRollup)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['resolution', 'bucket_start'],
+            set_=_merge_columns(stmt.excluded, least, greatest)
+        )
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        self.assertIn('ON CONFLICT', sql)
+        self.assertIn('least(', sql)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from dataset_loader import iter_dataset_chunks, load_dataset
+from validate_dataset import validate_dataset
+from tests.test_ml_model import write_dataset
+
+class TestDatasetLoader(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'crops.csv')
+        self.df = write_dataset(self.path, n_samples=500)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, df):
+        path = os.path.join(self.tmpdir, 'modified.csv')
+        df.to_csv(path, index=False)
+        return path
+
+    def test_compact_dtypes_across_chunks(self):
+        df = load_dataset(self.path, chunksize=64)
+        self.assertEqual(df['N'].dtype, np.int16)
+        self.assertEqual(df['temperature'].dtype, np.float32)
+        self.assertIsInstance(df['soil_type'].dtype, pd.CategoricalDtype)
+        self.assertEqual(df['label'].cat.categories.tolist(), ['cotton', 'maize', 'rice'])
+        self.assertEqual(df['soil_type'].astype(str).tolist(), self.df['soil_type'].tolist())
+        np.testing.assert_array_equal(df['K'], self.df['K'])
+        self.assertLess(df.memory_usage(deep=True).sum(), pd.read_csv(self.path).memory_usage(deep=True).sum() / 4)
+
+    def test_defaults_for_missing_categorical_columns(self):
+        df = load_dataset(self.write(self.df.drop(columns=['region'])))
+        self.assertEqual(set(df['region'].astype(str)), {'karnataka'})
+
+    def test_integer_columns_accept_whole_floats(self):
+        df = load_dataset(self.write(self.df.assign(N=self.df['N'].astype(float))))
+        self.assertEqual(df['N'].dtype, np.int16)
+
+    def test_streaming_validation_errors(self):
+        with self.assertRaisesRegex(ValueError, 'Missing required columns'):
+            load_dataset(self.write(self.df.drop(columns=['moisture'])))
+        broken = self.df.copy()
+        broken.loc[300, 'humidity'] = np.nan
+        with self.assertRaisesRegex(ValueError, 'Missing values in humidity at row 300'):
+            list(iter_dataset_chunks(self.write(broken), chunksize=100))
+        broken = self.df.assign(P=self.df['P'].astype(float))
+        broken.loc[10, 'P'] = 1.5
+        with self.assertRaisesRegex(ValueError, 'Invalid P value'):
+            load_dataset(self.write(broken))
+        broken = self.df.copy()
+        broken.loc[42, 'rainfall'] = np.inf
+        with self.assertRaisesRegex(ValueError, 'Infinite value in rainfall at row 42'):
+            load_dataset(self.write(broken))
+        broken = self.df.astype({'moisture': object})
+        broken.loc[5, 'moisture'] = 'wet'
+        with self.assertRaisesRegex(ValueError, 'Could not parse'):
+            load_dataset(self.write(broken))
+
+    def test_validate_dataset(self):
+        self.assertTrue(validate_dataset(self.path))
+        self.assertFalse(validate_dataset(self.write(self.df.drop(columns=['label']))))
+
+if __name__ == '__main__':
+    unittest.main()
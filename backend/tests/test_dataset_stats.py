@@ -0,0 +1,80 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from dataset_stats import DatasetStats, profile_dataset
+from tests.test_ml_model import write_dataset
+
+class TestDatasetStats(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'crops.csv')
+        self.df = write_dataset(self.path, n_samples=3000)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_matches_pandas(self):
+        report = profile_dataset(self.path, chunksize=256)
+        self.assertTrue(report['valid'])
+        self.assertEqual(report['n_rows'], 3000)
+        self.assertEqual(report['n_chunks'], 12)
+        self.assertEqual(sum(report['labels'].values()), 3000)
+        self.assertEqual(set(report['categorical']), {'soil_type', 'weather', 'region'})
+        json.dumps(report)
+        for col in ['N', 'K', 'temperature', 'rainfall']:
+            stats = report['numeric'][col]
+            values = self.df[col].astype(np.float32).astype(np.float64)
+            self.assertEqual(stats['count'], len(values))
+            self.assertEqual(stats['min'], values.min())
+            self.assertEqual(stats['max'], values.max())
+            self.assertAlmostEqual(stats['mean'], values.mean(), places=6)
+            self.assertAlmostEqual(stats['std'], values.std(), places=6)
+            for key, q in (('q25', 0.25), ('q50', 0.5), ('q75', 0.75)):
+                self.assertLess(abs(stats[key] - values.quantile(q)), 2 * stats['quantile_resolution'] + 1)
+
+    def test_histogram_grows_in_both_directions(self):
+        stats = DatasetStats(['temperature'], bins=64)
+        stats.update(pd.DataFrame({'temperature': np.linspace(0, 10, 1000)}))
+        stats.update(pd.DataFrame({'temperature': [1000.0] * 5}))
+        stats.update(pd.DataFrame({'temperature': [-1000.0] * 5}))
+        self.assertEqual(stats.hist.sum(), 1010)
+        self.assertEqual(stats.minimum[0], -1000.0)
+        self.assertLess(abs(stats.quantile(0, 0.5) - 5.0), stats.width[0])
+        self.assertEqual(stats.column_report(0)['outliers'], 10)
+
+    def test_reports_problems(self):
+        broken = self.df.assign(N=self.df['N'].astype(float))
+        broken.loc[[3, 4], 'humidity'] = np.nan
+        broken.loc[7, 'N'] = 2.5
+        broken.loc[9, 'label'] = np.nan
+        path = os.path.join(self.tmpdir, 'broken.csv')
+        broken.to_csv(path, index=False)
+        report = profile_dataset(path)
+        self.assertFalse(report['valid'])
+        self.assertEqual(report['numeric']['humidity']['nulls'], 2)
+        self.assertEqual(report['numeric']['N']['non_integer'], 1)
+        self.assertIn('1 missing values in label', report['errors'])
+
+        self.df.drop(columns=['moisture']).to_csv(path, index=False)
+        report = profile_dataset(path)
+        self.assertFalse(report['valid'])
+        self.assertIn('moisture', report['errors'][0])
+    def test_infinite_values_are_errors(self):
+        path = os.path.join(self.tmpdir, 'inf.csv')
+        self.df.head(2).assign(temperature=['inf', '-inf']).to_csv(path, index=False)
+        report = profile_dataset(path)
+        self.assertFalse(report['valid'])
+        self.assertEqual(report['numeric']['temperature'], {'count': 0, 'nulls': 0, 'non_finite': 2})
+        self.assertIn('2 infinite values in temperature', report['errors'])
+        json.dumps(report)
+
+        stats = DatasetStats(['temperature'], bins=64)
+        stats.update(pd.DataFrame({'temperature': [1.0, np.inf, 3.0]}))
+        self.assertEqual((stats.count[0], stats.non_finite[0], stats.maximum[0]), (2, 1, 3.0))
+
+if __name__ == '__main__':
+    unittest.main()
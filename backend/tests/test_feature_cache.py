@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from feature_cache import FeatureCache
+from ml_model import CropRecommendationModel
+from validate_dataset import prepare_dataset
+from tests.test_ml_model import write_dataset
+
+class TestFeatureCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'crops.csv')
+        self.df = write_dataset(self.path, n_samples=300)
+        self.model_dir = os.path.join(self.tmpdir, 'models')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_second_load_skips_parsing(self):
+        first = CropRecommendationModel(model_dir=self.model_dir)
+        X, y = first.load_features(self.path)
+
+        second = CropRecommendationModel(model_dir=self.model_dir)
+        with mock.patch.object(second, 'load_data', side_effect=AssertionError("parsed again")):
+            X_cached, y_cached = second.load_features(self.path)
+        self.assertIsInstance(X_cached, np.memmap)
+        np.testing.assert_array_equal(X_cached, X)
+        np.testing.assert_array_equal(y_cached, y)
+        self.assertEqual(second.label_encoders['region'].classes_.tolist(),
+                         first.label_encoders['region'].classes_.tolist())
+
+        # Training from the cached matrix behaves like a fresh one
+        second.train(self.path)
+        self.assertIn(second.predict(self.df.iloc[0].to_dict())['crop'],
+                      {'rice', 'maize', 'cotton'})
+
+    def test_key_follows_content_and_config(self):
+        cache = FeatureCache(os.path.join(self.tmpdir, 'cache'))
+        key = cache.key(self.path, {'dtype': 'float64'})
+        copy = os.path.join(self.tmpdir, 'copy.csv')
+        shutil.copy(self.path, copy)
+        self.assertEqual(cache.key(copy, {'dtype': 'float64'}), key)
+        self.assertNotEqual(cache.key(self.path, {'dtype': 'float32'}), key)
+
+        self.df.iloc[:-1].to_csv(self.path, index=False)
+        self.assertNotEqual(cache.key(self.path, {'dtype': 'float64'}), key)
+
+    def test_prune_keeps_most_recent(self):
+        cache = FeatureCache(os.path.join(self.tmpdir, 'cache'), max_entries=2)
+        for i, key in enumerate(['a', 'b', 'c']):
+            cache.put(key, np.full((2, 2), i, dtype=np.float64), np.array(['x', 'y'], dtype=object), {})
+            os.utime(os.path.join(cache.root, key, 'meta.json'), (i, i))
+        cache.put('d', np.zeros((2, 2)), np.array(['x', 'y'], dtype=object), {})
+        self.assertEqual(sorted(cache.entries()), ['c', 'd'])
+        self.assertIsNone(cache.get('a'))
+
+    def test_prepare_dataset_fills_cache_without_csv_copy(self):
+        self.assertEqual(prepare_dataset(self.path, self.model_dir), self.path)
+        self.assertEqual(sorted(os.listdir(self.tmpdir)), ['crops.csv', 'models'])
+        self.assertEqual(len(FeatureCache(os.path.join(self.model_dir, 'feature_cache')).entries()), 1)
+
+if __name__ == '__main__':
+    unittest.main()
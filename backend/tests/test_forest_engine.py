@@ -0,0 +1,36 @@
+import unittest
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from forest_engine import FlatForest
+
+class TestFlatForest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(0)
+        X = rng.uniform(0, 200, (600, 10))
+        y = rng.choice(['rice', 'maize', 'cotton', 'jute'], 600)
+        cls.forest = RandomForestClassifier(n_estimators=25, max_depth=8, random_state=42).fit(X, y)
+        cls.flat = FlatForest.from_sklearn(cls.forest)
+        cls.X = rng.uniform(0, 200, (200, 10))
+
+    def test_leaves_match_sklearn(self):
+        np.testing.assert_array_equal(self.flat.apply(self.X) - self.flat.roots // 2, self.forest.apply(self.X))
+
+    def test_predict_proba_matches_sklearn(self):
+        np.testing.assert_allclose(self.flat.predict_proba(self.X), self.forest.predict_proba(self.X), rtol=0, atol=1e-12)
+        np.testing.assert_allclose(self.flat.predict_proba(self.X[:1]), self.forest.predict_proba(self.X[:1]), rtol=0, atol=1e-12)
+        np.testing.assert_array_equal(self.flat.predict(self.X), self.forest.predict(self.X))
+
+    def test_thresholds_compared_in_float32(self):
+        # Values that only differ from a threshold after float32 rounding
+        tree = self.forest.estimators_[0].tree_
+        row = np.full((1, 10), 100.0)
+        row[0, tree.feature[0]] = np.nextafter(tree.threshold[0], np.inf)
+        np.testing.assert_array_equal(self.flat.apply(row) - self.flat.roots // 2, self.forest.apply(row))
+
+    def test_wrong_feature_count(self):
+        with self.assertRaises(ValueError):
+            self.flat.predict_proba(np.zeros((1, 3)))
+
+if __name__ == '__main__':
+    unittest.main()
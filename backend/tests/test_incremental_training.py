@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+import numpy as np
+from models import db, FarmerInput
+from ml_model import CropRecommendationModel
+from incremental_training import load_confirmed_inputs
+from tests.test_ml_model import write_dataset
+from tests.test_ingestion import make_app
+
+class TestIncrementalTraining(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmpdir = tempfile.mkdtemp()
+        os.chdir(self.tmpdir)
+        self.dataset_path = os.path.join(self.tmpdir, 'crops.csv')
+        write_dataset(self.dataset_path)
+        self.model = CropRecommendationModel()
+        self.base_version = self.model.train(self.dataset_path)
+        new = write_dataset(os.path.join(self.tmpdir, 'new.csv'), n_samples=40, seed=1)
+        self.records = new.to_dict('records')
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmpdir)
+
+    def test_grows_forest_and_keeps_classes_aligned(self):
+        version = self.model.train_incremental(self.records, watermark=['2025-01-01T00:00:00', 7], n_new_trees=5)
+        forest = self.model.model
+        self.assertEqual(len(forest.estimators_), 105)
+        self.assertTrue(all(tree.n_classes_ == len(forest.classes_) for tree in forest.estimators_))
+        X = self.model._encode_batch(self.records, self.model.encoder)[0]
+        np.testing.assert_allclose(forest.predict_proba(X).sum(axis=1), 1.0)
+
+        metadata = self.model.registry.read_manifest()['metadata']
+        self.assertEqual(self.model.version, version)
+        self.assertEqual(metadata['parent_version'], self.base_version)
+        self.assertEqual(metadata['n_new_samples'], 40)
+        self.assertEqual(metadata['incremental_watermark'], ['2025-01-01T00:00:00', 7])
+
+    def test_sliding_window_retires_oldest_trees(self):
+        self.model.train_incremental(self.records, n_new_trees=20, max_estimators=50)
+        forest = self.model.model
+        self.assertEqual(len(forest.estimators_), 50)
+        self.assertEqual(forest.n_estimators, 50)
+        self.assertIn('crop', self.model.predict(self.records[0]))
+
+    def test_skips_unknown_crops_and_categories(self):
+        records = [dict(record, label='banana') for record in self.records[:5]]
+        records += [dict(record, soil_type='volcanic') for record in self.records[5:10]]
+        records += self.records[10:]
+        self.model.train_incremental(records, n_new_trees=2)
+        metadata = self.model.registry.read_manifest()['metadata']
+        self.assertEqual(metadata['n_skipped_samples'], 10)
+        with self.assertRaises(ValueError):
+            self.model.train_incremental(self.records[:3])
+
+    def test_requires_forest_backend(self):
+        model = CropRecommendationModel(backend='naive_bayes')
+        model.train(self.dataset_path)
+        with self.assertRaises(ValueError):
+            model.train_incremental(self.records)
+
+class TestConfirmedInputs(unittest.TestCase):
+    def setUp(self):
+        self.app = make_app()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def add_input(self, confirmed_at, crop='rice', rainfall=120.0):
+        db.session.add(FarmerInput(
+            soil_type='alluvial', weather='sunny', region='karnataka', temperature=25.0,
+            humidity=60.0, moisture=500, nitrogen=90.0, phosphorus=40.0, potassium=40.0,
+            rainfall=rainfall, prediction='rice', confidence=0.9,
+            confirmed_crop=crop, confirmed_at=confirmed_at
+        ))
+
+    def test_watermark_returns_only_new_rows(self):
+        start = datetime(2025, 1, 1)
+        with self.app.app_context():
+            self.add_input(start)
+            self.add_input(start + timedelta(minutes=1), crop='maize')
+            self.add_input(None, crop=None)  # not confirmed yet
+            self.add_input(start, rainfall=None)  # incomplete features
+            db.session.commit()
+
+            records, watermark = load_confirmed_inputs()
+            self.assertEqual([r['label'] for r in records], ['rice', 'maize'])
+            self.assertEqual(records[0]['N'], 90.0)
+            self.assertEqual(watermark, [(start + timedelta(minutes=1)).isoformat(), 2])
+
+            self.add_input(start + timedelta(minutes=2), crop='cotton')
+            db.session.commit()
+            records, next_watermark = load_confirmed_inputs(watermark)
+            self.assertEqual([r['label'] for r in records], ['cotton'])
+            self.assertEqual(load_confirmed_inputs(next_watermark), ([], next_watermark))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+from datetime import datetime
+from flask import Flask
+from models import db, SensorData
+from ingestion import SensorIngestionWriter, MqttMessageProcessor, coerce_sensor_reading
+
+def make_app():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+def make_reading(i=0):
+    return {
+        'timestamp': datetime.utcnow(),
+        'temperature': 25.0 + i,
+        'humidity': 60.0,
+        'moisture': 500,
+        'nitrogen': 45.0,
+        'phosphorus': 35.0,
+        'potassium': 40.0
+    }
+
+class TestSensorIngestionWriter(unittest.TestCase):
+    def setUp(self):
+        self.app = make_app()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_flushes_in_batches(self):
+        writer = SensorIngestionWriter(self.app, db, batch_size=10, flush_interval=0.05)
+        writer.start()
+        for i in range(25):
+            self.assertTrue(writer.submit(make_reading(i)))
+        writer.stop()
+        with self.app.app_context():
+            self.assertEqual(SensorData.query.count(), 25)
+        stats = writer.stats()
+        self.assertEqual(stats['written'], 25)
+        self.assertGreaterEqual(stats['batches'], 2)
+
+    def test_stop_flushes_without_thread(self):
+        writer = SensorIngestionWriter(self.app, db)
+        writer.submit(make_reading())
+        writer.stop()
+        with self.app.app_context():
+            self.assertEqual(SensorData.query.count(), 1)
+
+    def test_backpressure_drops_when_full(self):
+        writer = SensorIngestionWriter(self.app, db, max_queue_size=1, put_timeout=0.01)
+        self.assertTrue(writer.submit(make_reading()))
+        self.assertFalse(writer.submit(make_reading()))
+        self.assertEqual(writer.stats()['dropped'], 1)
+        writer.stop()
+
+    def test_bad_row_only_drops_itself(self):
+        after = []
+        writer = SensorIngestionWriter(self.app, db, after_commit=[after.append])
+        for i in range(5):
+            writer.submit(make_reading(i))
+        writer.submit(dict(make_reading(), temperature='n/a'))
+        writer.stop()
+        with self.app.app_context():
+            self.assertEqual(SensorData.query.count(), 5)
+        stats = writer.stats()
+        self.assertEqual((stats['written'], stats['failed']), (5, 1))
+        self.assertEqual(len(after[0]), 5)
+
+    def test_coerce_sensor_reading(self):
+        reading = dict(make_reading(), moisture='450', temperature='21.5')
+        coerced = coerce_sensor_reading(reading)
+        self.assertEqual((coerced['moisture'], coerced['temperature']), (450, 21.5))
+        self.assertNotIn('timestamp', coerced)
+        for field, value in [('temperature', 'n/a'), ('humidity', None), ('moisture', 4.5),
+                             ('nitrogen', True), ('potassium', float('nan'))]:
+            with self.subTest(field=field, value=value):
+                with self.assertRaises(ValueError):
+                    coerce_sensor_reading(dict(make_reading(), **{field: value}))
+        with self.assertRaisesRegex(ValueError, 'Missing field: phosphorus'):
+            coerce_sensor_reading({k: v for k, v in make_reading().items() if k != 'phosphorus'})
+
+class TestMqttMessageProcessor(unittest.TestCase):
+    def test_processes_payloads_on_workers(self):
+        handled = []
+        processor = MqttMessageProcessor(lambda payload, received_at: handled.append(payload), workers=2)
+        processor.start()
+        for i in range(10):
+            self.assertTrue(processor.enqueue(f'{i}'.encode()))
+        processor.stop()
+        self.assertEqual(sorted(handled), sorted(f'{i}'.encode() for i in range(10)))
+        stats = processor.stats()
+        self.assertEqual(stats['processed'], 10)
+        self.assertEqual(stats['queue_depth'], 0)
+
+    def test_enqueue_never_blocks_when_full(self):
+        processor = MqttMessageProcessor(lambda payload, received_at: None, max_queue_size=1)
+        self.assertTrue(processor.enqueue(b'a'))
+        self.assertFalse(processor.enqueue(b'b'))
+        self.assertEqual(processor.stats()['dropped'], 1)
+
+    def test_handler_errors_are_counted(self):
+        def handler(payload, received_at):
+            raise ValueError('bad payload')
+        processor = MqttMessageProcessor(handler, workers=1)
+        processor.start()
+        processor.enqueue(b'x')
+        processor.stop()
+        self.assertEqual(processor.stats()['failed'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
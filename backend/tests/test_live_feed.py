@@ -0,0 +1,79 @@
+import unittest
+import json
+from models import db, SensorData
+from live_feed import EventBroadcaster, SensorDataTailer, format_sse
+from tests.test_ingestion import make_app, make_reading
+
+def parse(message):
+    lines = message.strip().split('\n')
+    return lines[0][len('event: '):], json.loads(lines[1][len('data: '):])
+
+class TestEventBroadcaster(unittest.TestCase):
+    def test_fan_out(self):
+        broadcaster = EventBroadcaster()
+        first, second = broadcaster.subscribe(), broadcaster.subscribe()
+        broadcaster.publish('sensor-data', {'temperature': 25.0})
+        for subscription in (first, second):
+            event, data = parse(subscription.get(timeout=0.1))
+            self.assertEqual(event, 'sensor-data')
+            self.assertEqual(data['temperature'], 25.0)
+
+    def test_slow_consumer_drops_oldest_then_disconnects(self):
+        broadcaster = EventBroadcaster(buffer_size=2, max_dropped=3)
+        slow = broadcaster.subscribe()
+        for i in range(4):
+            broadcaster.publish('sensor-data', {'n': i})
+        self.assertEqual([parse(slow.get(0.1))[1]['n'] for _ in range(2)], [2, 3])
+        for i in range(10):
+            broadcaster.publish('sensor-data', {'n': i})
+        self.assertTrue(slow.closed)
+        self.assertEqual(broadcaster.subscriber_count(), 0)
+
+    def test_unsubscribe(self):
+        broadcaster = EventBroadcaster()
+        subscription = broadcaster.subscribe()
+        broadcaster.unsubscribe(subscription)
+        broadcaster.publish('sensor-data', {})
+        self.assertIsNone(subscription.get(timeout=0.01))
+
+    def test_max_subscribers(self):
+        broadcaster = EventBroadcaster(max_subscribers=2)
+        first, second = broadcaster.subscribe(), broadcaster.subscribe()
+        self.assertIsNone(broadcaster.subscribe())
+        broadcaster.unsubscribe(first)
+        self.assertIsNotNone(broadcaster.subscribe())
+        self.assertEqual(broadcaster.stats()['rejected_clients'], 1)
+
+    def test_format_sse_serializes_datetimes(self):
+        event, data = parse(format_sse('sensor-data', make_reading()))
+        self.assertIsInstance(data['timestamp'], str)
+
+class TestSensorDataTailer(unittest.TestCase):
+    def setUp(self):
+        self.app = make_app()
+        self.published = []
+        self.broadcaster = EventBroadcaster()
+        self.tailer = SensorDataTailer(self.app, self.broadcaster, self.published.extend)
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def add_reading(self, i):
+        with self.app.app_context():
+            db.session.add(SensorData(**make_reading(i)))
+            db.session.commit()
+
+    def test_publishes_only_new_rows_while_subscribed(self):
+        self.add_reading(0)
+        self.tailer.poll()
+        self.broadcaster.subscribe()
+        self.tailer.poll()
+        self.add_reading(1)
+        self.add_reading(2)
+        self.tailer.poll()
+        self.assertEqual([row['temperature'] for row in self.published], [26.0, 27.0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import itertools
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from ml_model import CropRecommendationModel
+from category_encoding import UnknownCategoryError
+
+def write_dataset(path, n_samples=200, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'N': rng.integers(0, 140, n_samples),
+        'P': rng.integers(5, 145, n_samples),
+        'K': rng.integers(5, 205, n_samples),
+        'temperature': rng.uniform(10, 40, n_samples).round(2),
+        'humidity': rng.uniform(15, 99, n_samples).round(2),
+        'moisture': rng.integers(100, 900, n_samples),
+        'rainfall': rng.uniform(20, 300, n_samples).round(2),
+        'soil_type': rng.choice(['alluvial', 'black', 'red'], n_samples),
+        'weather': rng.choice(['sunny', 'rainy', 'cloudy'], n_samples),
+        'region': rng.choice(['karnataka', 'kerala'], n_samples)
+    })
+    df['label'] = np.where(df['N'] > 70, 'rice', np.where(df['K'] > 100, 'maize', 'cotton'))
+    df.to_csv(path, index=False)
+    return df
+
+class TestCropRecommendationModel(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmpdir = tempfile.mkdtemp()
+        os.chdir(self.tmpdir)
+        self.dataset_path = os.path.join(self.tmpdir, 'crops.csv')
+        self.df = write_dataset(self.dataset_path)
+        self.model = CropRecommendationModel()
+        self.model.train(self.dataset_path)
+        self.records = self.df.drop(columns='label').head(20).to_dict('records')
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmpdir)
+
+    def test_predict_matches_sklearn(self):
+        result = self.model.predict(self.records[0])
+        X = self.model._encode_batch(self.records[:1], self.model.encoder)[0]
+        probabilities = self.model.model.predict_proba(X)[0]
+        self.assertEqual(result['crop'], self.model.model.predict(X)[0])
+        self.assertAlmostEqual(result['confidence'], probabilities.max())
+
+    def test_predict_batch_matches_predict(self):
+        batch = self.model.predict_batch(self.records)
+        self.assertEqual(len(batch), len(self.records))
+        for record, result in zip(self.records, batch):
+            single = self.model.predict(record)
+            self.assertEqual(single['crop'], result['crop'])
+            self.assertAlmostEqual(single['confidence'], result['confidence'])
+
+    def test_flat_engine_matches_sklearn(self):
+        flat = CropRecommendationModel(inference_engine='flat')
+        flat.load_model()
+        for expected, result in zip(self.model.predict_batch(self.records), flat.predict_batch(self.records)):
+            self.assertEqual(result['crop'], expected['crop'])
+            self.assertAlmostEqual(result['confidence'], expected['confidence'], places=12)
+        self.assertEqual(flat.predict(self.records[0]), self.model.predict(self.records[0]))
+
+    def test_preprocess_leaves_frame_untouched(self):
+        df = self.model.load_data(self.dataset_path)
+        before = df.copy()
+        X, y = self.model.preprocess_data(df)
+        pd.testing.assert_frame_equal(df, before)
+        self.assertEqual(X.dtype, np.float32)
+        self.assertTrue(X.flags['C_CONTIGUOUS'])
+        self.assertEqual(y.tolist(), self.df['label'].tolist())
+        # Same encoding as LabelEncoder on the raw strings
+        raw_X, raw_y = self.model.preprocess_data(pd.read_csv(self.dataset_path))
+        np.testing.assert_array_equal(X, raw_X)
+        np.testing.assert_array_equal(y, raw_y)
+
+    def test_predict_batch_empty(self):
+        self.assertEqual(self.model.predict_batch([]), [])
+
+    def test_predict_unknown_category(self):
+        record = dict(self.records[0], soil_type='volcanic')
+        with self.assertRaises(ValueError):
+            self.model.predict(record)
+
+    def test_unknown_category_fallback(self):
+        model = CropRecommendationModel(unknown_policy='default')
+        model.load_model()
+        record = dict(self.records[0], region='punjab')
+        result = model.predict(record)
+        self.assertEqual(result['unknown_categories'], ['region'])
+        self.assertEqual(result['crop'], model.predict(dict(record, region='karnataka'))['crop'])
+        batch = model.predict_batch([self.records[1], record])
+        self.assertNotIn('unknown_categories', batch[0])
+        self.assertEqual(batch[1], result)
+
+    def test_unknown_category_averaged_over_known(self):
+        model = CropRecommendationModel(unknown_policy='average')
+        model.load_model()
+        record = dict(self.records[0], soil_type='volcanic', weather='foggy')
+        soils = model.label_encoders['soil_type'].classes_
+        weathers = model.label_encoders['weather'].classes_
+        X = model._encode_batch([dict(record, soil_type=s, weather=w) for s in soils for w in weathers],
+                                model.encoder)[0]
+        expected = model.model.predict_proba(X).mean(axis=0)
+        result = model.predict(record)
+        self.assertEqual(result['crop'], model.model.classes_[expected.argmax()])
+        self.assertAlmostEqual(result['confidence'], expected.max())
+        self.assertEqual(result['unknown_categories'], ['soil_type', 'weather'])
+        batch = model.predict_batch([self.records[1], record, self.records[2]])
+        self.assertEqual(batch[1], result)
+        self.assertEqual(batch[0], model.predict(self.records[1]))
+        self.assertEqual(batch[2], model.predict(self.records[2]))
+
+    def test_averaging_mixed_unseen_columns_in_one_batch(self):
+        model = CropRecommendationModel(unknown_policy='average')
+        model.load_model()
+        records = [
+            dict(self.records[0], region='punjab'),
+            self.records[1],
+            dict(self.records[2], soil_type='volcanic', region='punjab'),
+            dict(self.records[3], weather='foggy')
+        ]
+        for record, result in zip(records, model.predict_batch(records)):
+            unseen = [col for col in model.categorical_columns if not model.encoder.is_known(col, record[col])]
+            variants = [dict(record, **dict(zip(unseen, values))) for values in
+                        itertools.product(*(model.label_encoders[col].classes_ for col in unseen))]
+            expected = model.model.predict_proba(model._encode_batch(variants, model.encoder)[0]).mean(axis=0)
+            self.assertEqual(result['crop'], model.model.classes_[expected.argmax()])
+            self.assertAlmostEqual(result['confidence'], expected.max())
+
+    def test_averaging_is_capped(self):
+        model = CropRecommendationModel(unknown_policy='average', max_averaged_rows=20)
+        model.load_model()
+        record = dict(self.records[0], soil_type='volcanic', weather='foggy', region='punjab')
+        with self.assertRaisesRegex(UnknownCategoryError, 'max 20'):
+            model.predict_batch([record] * 3)
+        self.assertIn('crop', model.predict_batch([dict(record, soil_type='alluvial', weather='sunny')])[0])
+
+    def test_prediction_cache_invalidated_on_train(self):
+        model = CropRecommendationModel(cache_size=16)
+        model.train(self.dataset_path)
+        first = model.predict(self.records[0])
+        self.assertEqual(model.predict(self.records[0]), first)
+        self.assertEqual(model.cache.stats()['hits'], 1)
+        model.train(self.dataset_path)
+        self.assertEqual(model.cache.stats()['size'], 0)
+
+    def test_other_instances_pick_up_new_version(self):
+        other = CropRecommendationModel(refresh_interval=0)
+        other.load_model()
+        self.assertEqual(other.version, self.model.version)
+        version = self.model.train(self.dataset_path)
+        other.predict(self.records[0])
+        self.assertEqual(other.version, version)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from ml_model import CropRecommendationModel
+from dataset_loader import load_dataset
+from model_backends import BACKENDS, create_estimator, release_cores, serving_predictor
+from benchmark import measure_preprocess_memory, run_benchmark
+from synthetic_dataset import generate_dataset
+from tests.test_ml_model import write_dataset
+
+class TestModelBackends(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmpdir = tempfile.mkdtemp()
+        os.chdir(self.tmpdir)
+        self.dataset_path = os.path.join(self.tmpdir, 'crops.csv')
+        self.records = write_dataset(self.dataset_path).drop(columns='label').head(5).to_dict('records')
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmpdir)
+
+    def test_every_backend_trains_and_predicts(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                model = CropRecommendationModel(backend=backend, inference_engine='flat')
+                version = model.train(self.dataset_path)
+                self.assertEqual(model.registry.read_manifest()['active_version'], version)
+                self.assertEqual(model.registry.load()['metadata']['backend'], backend)
+                results = model.predict_batch(self.records)
+                self.assertEqual(results[0], model.predict(self.records[0]))
+                self.assertIn(results[0]['crop'], {'rice', 'maize', 'cotton'})
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            create_estimator('xgboost')
+        with self.assertRaises(ValueError):
+            CropRecommendationModel(backend='xgboost')
+
+    def test_catboost_is_served_single_threaded(self):
+        model = CropRecommendationModel(backend='catboost')
+        X, y = model.load_features(self.dataset_path)
+        estimator = create_estimator('catboost').fit(X, y)
+        predictor = serving_predictor(release_cores(estimator))
+        self.assertEqual(predictor.thread_count, 1)
+        np.testing.assert_allclose(predictor.predict_proba(X[:5]), estimator.predict_proba(X[:5]))
+        np.testing.assert_array_equal(predictor.predict(X[:5]), estimator.predict(X[:5]).ravel())
+        forest = create_estimator('random_forest')
+        self.assertIs(serving_predictor(forest), forest)
+
+    def test_benchmark_reports_each_backend(self):
+        results = run_benchmark(self.dataset_path, ['random_forest', 'naive_bayes'], latency_rows=5)
+        self.assertEqual([r['backend'] for r in results],
+                         ['random_forest', 'random_forest (flat)', 'naive_bayes'])
+        for result in results:
+            self.assertGreater(result['accuracy'], 0.5)
+            self.assertGreater(result['size_bytes'], 0)
+            self.assertGreater(result['latency_p50_us'], 0)
+
+    def test_benchmark_trains_on_the_public_dataset_columns(self):
+        path = os.path.join(os.path.dirname(__file__), '..', '..', 'data', 'Crop_recommendation.csv')
+        results = run_benchmark(path, ['naive_bayes'], latency_rows=5)
+        self.assertEqual(results[0]['features'], 'csv')
+        self.assertGreater(results[0]['accuracy'], 0.9)
+        with self.assertRaises(ValueError):
+            run_benchmark(path, ['naive_bayes'], features='model')
+
+    def test_synthetic_dataset_has_every_training_column(self):
+        path = os.path.join(self.tmpdir, 'synthetic.csv')
+        generate_dataset(300).to_csv(path, index=False)
+        df = load_dataset(path)
+        self.assertEqual(len(df), 300)
+        results = run_benchmark(path, ['naive_bayes'], latency_rows=5)
+        self.assertEqual(results[0]['features'], 'model')
+        self.assertGreater(results[0]['accuracy'], 0.5)
+
+    def test_preprocessing_peak_memory_is_the_matrix(self):
+        path = os.path.join(self.tmpdir, 'large.csv')
+        write_dataset(path, n_samples=200000)
+        result = measure_preprocess_memory(path)
+        self.assertEqual(result['rows'], 200000)
+        self.assertLess(result['peak_to_matrix'], 1.1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import os
+import shutil
+import tempfile
+from model_registry import ModelRegistry
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.registry = ModelRegistry(self.tmpdir, keep_versions=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_save_activates_version(self):
+        self.assertIsNone(self.registry.active_version())
+        version = self.registry.save({'trees': 1}, {'soil_type': 'encoder'})
+        self.assertEqual(self.registry.active_version(), version)
+        artifact = self.registry.load()
+        self.assertEqual(artifact['model'], {'trees': 1})
+        self.assertEqual(artifact['label_encoders'], {'soil_type': 'encoder'})
+
+    def test_manifest_stamp_changes_on_activation(self):
+        first = self.registry.save('a', {})
+        stamp = self.registry.manifest_stamp()
+        second = self.registry.save('b', {})
+        self.assertNotEqual(self.registry.manifest_stamp(), stamp)
+        self.registry.activate(first)
+        self.assertEqual(self.registry.load()['model'], 'a')
+        self.assertIn(second, self.registry.list_versions())
+
+    def test_prune_keeps_active_and_recent(self):
+        versions = [self.registry.save(i, {}) for i in range(4)]
+        self.assertEqual(self.registry.list_versions(), versions[-2:])
+        self.assertFalse([f for f in os.listdir(self.registry.versions_dir) if '.tmp' in f])
+
+    def test_rejects_path_traversal(self):
+        with self.assertRaises(ValueError):
+            self.registry.load('../manifest')
+
+if __name__ == '__main__':
+    unittest.main()
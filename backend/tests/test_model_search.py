@@ -0,0 +1,55 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from ml_model import CropRecommendationModel
+from model_backends import SEARCH_SPACES
+from model_search import search_hyperparameters
+from tests.test_ml_model import write_dataset
+
+class TestModelSearch(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmpdir = tempfile.mkdtemp()
+        os.chdir(self.tmpdir)
+        self.dataset_path = os.path.join(self.tmpdir, 'crops.csv')
+        write_dataset(self.dataset_path)
+        self.model = CropRecommendationModel()
+        self.X, self.y = self.model.preprocess_data(self.model.load_data(self.dataset_path))
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmpdir)
+
+    def test_grid_search_reports_every_candidate(self):
+        params, report = search_hyperparameters('logistic_regression', self.X, self.y, mode='grid', cv=3, n_jobs=2)
+        grid = SEARCH_SPACES['logistic_regression']['logisticregression__C']
+        self.assertEqual(len(report['candidates']), len(grid))
+        self.assertEqual(report['candidates'][0]['rank'], 1)
+        self.assertEqual(report['candidates'][0]['params'], params)
+        self.assertEqual(report['best_score'], report['candidates'][0]['mean_score'])
+        self.assertGreater(report['candidates'][0]['mean_fit_seconds'], 0)
+        json.dumps(report)
+
+    def test_random_search_caps_iterations(self):
+        _, report = search_hyperparameters('naive_bayes', self.X, self.y, mode='random', cv=3, n_iter=100, n_jobs=1)
+        self.assertEqual(len(report['candidates']), len(SEARCH_SPACES['naive_bayes']['var_smoothing']))
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            search_hyperparameters('naive_bayes', self.X, self.y, mode='bayes')
+        with self.assertRaises(ValueError):
+            search_hyperparameters('naive_bayes', self.X, self.y, cv=1)
+
+    def test_train_persists_winner_and_results(self):
+        version = self.model.train(self.dataset_path, backend='random_forest', search='cv', cv=3, n_jobs=2)
+        metadata = self.model.registry.read_manifest()['metadata']
+        self.assertEqual(self.model.version, version)
+        self.assertEqual(metadata['cv_results']['mode'], 'cv')
+        self.assertEqual(metadata['cv_results']['best_params'], {})
+        # The served forest must not fan single predictions out over threads
+        self.assertIsNone(self.model.model.n_jobs)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+import time
+from mqtt_supervisor import MqttSupervisor, backoff_delay
+
+class FailingClient:
+    def __init__(self):
+        self.connect_calls = 0
+
+    def connect(self, host, port, keepalive):
+        self.connect_calls += 1
+        raise OSError('broker unreachable')
+
+    def disconnect(self):
+        pass
+
+class TestMqttSupervisor(unittest.TestCase):
+    def test_backoff_grows_and_is_capped(self):
+        for attempt in range(10):
+            cap = min(30.0, 1.0 * 2 ** attempt)
+            delay = backoff_delay(attempt, 1.0, 30.0)
+            self.assertGreaterEqual(delay, cap / 2)
+            self.assertLessEqual(delay, cap)
+
+    def test_start_does_not_block_and_retries(self):
+        client = FailingClient()
+        supervisor = MqttSupervisor(client, 'localhost', 1883, min_delay=0.01, max_delay=0.02)
+        started = time.monotonic()
+        supervisor.start()
+        self.assertLess(time.monotonic() - started, 0.5)
+        time.sleep(0.2)
+        supervisor.stop()
+        self.assertGreater(client.connect_calls, 1)
+        self.assertFalse(supervisor.stats()['connected'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from unittest import mock
+from prediction_cache import PredictionCache
+
+FEATURES = ['N', 'temperature', 'soil_type']
+
+class TestPredictionCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = PredictionCache(FEATURES, ['soil_type'], max_size=2, ttl=60, precision=1)
+
+    def test_key_rounds_numeric_features(self):
+        a = self.cache.make_key({'N': 90, 'temperature': 25.51, 'soil_type': 'red'})
+        b = self.cache.make_key({'N': 90.02, 'temperature': 25.49, 'soil_type': 'red'})
+        self.assertEqual(a, b)
+
+    def test_hit_and_miss_counters(self):
+        self.assertIsNone(self.cache.get(('a',)))
+        self.cache.put(('a',), {'crop': 'rice'})
+        self.assertEqual(self.cache.get(('a',)), {'crop': 'rice'})
+        stats = self.cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_lru_eviction(self):
+        self.cache.put(('a',), 1)
+        self.cache.put(('b',), 2)
+        self.cache.get(('a',))
+        self.cache.put(('c',), 3)
+        self.assertIsNone(self.cache.get(('b',)))
+        self.assertEqual(self.cache.get(('a',)), 1)
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_ttl_expiry(self):
+        with mock.patch('prediction_cache.time.monotonic', return_value=0):
+            self.cache.put(('a',), 1)
+        with mock.patch('prediction_cache.time.monotonic', return_value=61):
+            self.assertIsNone(self.cache.get(('a',)))
+
+    def test_clear(self):
+        self.cache.put(('a',), 1)
+        self.cache.clear()
+        self.assertEqual(self.cache.stats()['size'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
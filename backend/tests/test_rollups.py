@@ -0,0 +1,95 @@
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from models import db, SensorData
+from archive import SensorArchive
+from ingestion import SensorIngestionWriter
+from rollups import MAX_ROLLUP_LIMIT, apply_rollups, parse_rollup_limit, rebuild_rollups, query_rollups
+from tests.test_ingestion import make_app, make_reading
+
+class TestRollups(unittest.TestCase):
+    def setUp(self):
+        self.app = make_app()
+        start = datetime(2025, 1, 1, 10, 0)
+        self.rows = []
+        for i in range(6):
+            row = make_reading(i)
+            row['timestamp'] = start + timedelta(seconds=30 * i)
+            self.rows.append(row)
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def ingest(self, batches):
+        writer = SensorIngestionWriter(self.app, db, before_commit=[apply_rollups])
+        for batch in batches:
+            for row in batch:
+                writer.submit(row)
+            writer.stop()
+
+    def test_incremental_rollups(self):
+        # Two separate flushes must merge into the same buckets
+        self.ingest([self.rows[:3], self.rows[3:]])
+        with self.app.app_context():
+            minutes = [r.to_dict() for r in query_rollups('minute')]
+            self.assertEqual([m['count'] for m in minutes], [2, 2, 2])
+            hour = query_rollups('hour')[0].to_dict()
+            self.assertEqual(hour['count'], 6)
+            self.assertEqual(hour['temperature']['min'], 25.0)
+            self.assertEqual(hour['temperature']['max'], 30.0)
+            self.assertAlmostEqual(hour['temperature']['mean'], 27.5)
+            self.assertEqual(len(query_rollups('day')), 1)
+
+    def test_rebuild_matches_incremental(self):
+        self.ingest([self.rows])
+        with self.app.app_context():
+            incremental = [r.to_dict() for r in query_rollups('minute')]
+            rebuild_rollups(db.session)
+            self.assertEqual([r.to_dict() for r in query_rollups('minute')], incremental)
+
+    def test_rebuild_keeps_archived_buckets(self):
+        start = datetime(2025, 1, 1, 20, 0)
+        rows = [dict(make_reading(i), timestamp=start + timedelta(hours=i)) for i in range(8)]
+        self.ingest([rows])
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        archive = SensorArchive(root)
+        with self.app.app_context():
+            before = {r: [b.to_dict() for b in query_rollups(r)] for r in ('hour', 'day')}
+            # The cutoff splits 2025-01-02 between the archive and the table
+            archive.archive_older_than(db.session, start + timedelta(hours=6))
+            # An interrupted run leaves a row in both places; count it once
+            db.session.add(SensorData(id=6, **rows[5]))
+            db.session.commit()
+            rebuild_rollups(db.session, archive)
+            self.assertEqual({r: [b.to_dict() for b in query_rollups(r)] for r in ('hour', 'day')}, before)
+            self.assertEqual([b['count'] for b in before['day']], [4, 4])
+
+    def test_invalid_resolution(self):
+        with self.app.app_context():
+            with self.assertRaises(ValueError):
+                query_rollups('week')
+    def test_rollup_limit_covers_the_requested_span(self):
+        until = datetime(2025, 1, 8, 10, 30)
+        self.assertEqual(parse_rollup_limit(None, 'hour', until - timedelta(days=7), until), 169)
+        self.assertEqual(parse_rollup_limit(None, 'day', until - timedelta(days=30), until), 31)
+        self.assertEqual(parse_rollup_limit(None, 'minute', datetime(2000, 1, 1), until), MAX_ROLLUP_LIMIT)
+        self.assertEqual(parse_rollup_limit(None, 'hour'), 100)
+        self.assertEqual(parse_rollup_limit('24', 'hour', until - timedelta(days=7), until), 24)
+        with self.assertRaises(ValueError):
+            parse_rollup_limit('0', 'hour')
+
+    def test_week_of_hourly_buckets(self):
+        start = datetime(2025, 1, 1)
+        rows = [dict(make_reading(), timestamp=start + timedelta(hours=h)) for h in range(168)]
+        self.ingest([rows])
+        with self.app.app_context():
+            since = start
+            limit = parse_rollup_limit(None, 'hour', since, start + timedelta(days=7))
+            self.assertEqual(len(query_rollups('hour', since, start + timedelta(days=7), limit)), 168)
+
+if __name__ == '__main__':
+    unittest.main()
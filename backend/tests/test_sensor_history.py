@@ -0,0 +1,48 @@
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from models import db, SensorData
+from sensor_history import decode_cursor, query_sensor_page, sensor_page_query
+from tests.test_ingestion import make_app, make_reading
+
+class TestSensorHistory(unittest.TestCase):
+    def setUp(self):
+        self.app = make_app()
+        self.start = datetime(2024, 1, 1)
+        # Pairs of rows share a timestamp so the id tie-break is exercised
+        rows = [dict(make_reading(i), timestamp=self.start + timedelta(minutes=i // 2)) for i in range(50)]
+        with self.app.app_context():
+            db.session.execute(insert(SensorData), rows)
+            db.session.commit()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_cursor_pages_cover_every_row_once(self):
+        with self.app.app_context():
+            seen, cursor = [], None
+            while True:
+                rows, cursor = query_sensor_page(limit=7, cursor=cursor)
+                seen += [(row.timestamp, row.id) for row in rows]
+                if cursor is None:
+                    break
+            self.assertEqual(len(seen), 50)
+            self.assertEqual(seen, sorted(seen, reverse=True))
+
+    def test_cursor_page_searches_the_timestamp_index(self):
+        with self.app.app_context():
+            rows, cursor = query_sensor_page(limit=10)
+            statement = sensor_page_query(before=decode_cursor(cursor)).limit(10).statement
+            compiled = statement.compile(dialect=db.engine.dialect)
+            params = tuple(compiled.params[name] for name in compiled.positiontup)
+            with db.engine.connect() as connection:
+                plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).fetchall()
+            details = ' '.join(row[-1] for row in plan)
+            self.assertIn('SEARCH', details)
+            self.assertIn('timestamp<', details)
+            self.assertNotIn('SCAN', details)
+
+if __name__ == '__main__':
+    unittest.main()
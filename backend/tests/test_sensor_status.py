@@ -0,0 +1,57 @@
+import unittest
+from datetime import datetime, timedelta
+from sensor_status import SensorStatusTracker
+
+def reading(timestamp, temperature=25.0):
+    return {
+        'timestamp': timestamp,
+        'temperature': temperature,
+        'humidity': 60.0,
+        'moisture': 500,
+        'nitrogen': 45.0,
+        'phosphorus': 35.0,
+        'potassium': 40.0
+    }
+
+class TestSensorStatusTracker(unittest.TestCase):
+    def setUp(self):
+        self.transitions = []
+        self.tracker = SensorStatusTracker(
+            stale_after=300,
+            on_transition=lambda snapshot: self.transitions.append(snapshot['status'])
+        )
+
+    def test_offline_without_data(self):
+        snapshot = self.tracker.snapshot()
+        self.assertEqual(snapshot['status'], 'offline')
+        self.assertIsNone(snapshot['sensor_status']['temperature'])
+
+    def test_transitions_recorded_once(self):
+        now = datetime.utcnow()
+        self.tracker.snapshot(now)
+        self.tracker.observe([reading(now - timedelta(seconds=5), 20.0), reading(now, 21.0)])
+        for _ in range(3):
+            snapshot = self.tracker.snapshot(now)
+        self.assertEqual(snapshot['status'], 'online')
+        self.assertEqual(snapshot['sensor_status']['temperature'], 21.0)
+        self.tracker.snapshot(now + timedelta(seconds=301))
+        self.tracker.snapshot(now + timedelta(seconds=400))
+        self.assertEqual(self.transitions, ['offline', 'online', 'error'])
+
+    def test_older_batch_does_not_rewind(self):
+        now = datetime.utcnow()
+        self.tracker.observe([reading(now, 21.0)])
+        self.tracker.observe([reading(now - timedelta(minutes=10), 19.0)])
+        self.assertEqual(self.tracker.snapshot(now)['sensor_status']['temperature'], 21.0)
+
+    def test_refresh_uses_loader(self):
+        class Row:
+            timestamp = datetime.utcnow()
+            temperature, humidity, moisture = 22.0, 55.0, 400
+            nitrogen, phosphorus, potassium = 1.0, 2.0, 3.0
+        tracker = SensorStatusTracker(loader=lambda: Row())
+        tracker.refresh()
+        self.assertEqual(tracker.snapshot()['status'], 'online')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import os
+import shutil
+import tempfile
+import time
+from ml_model import CropRecommendationModel
+from training_jobs import TrainingJobManager
+from tests.test_ml_model import write_dataset
+
+class TestTrainingJobManager(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmpdir = tempfile.mkdtemp()
+        os.chdir(self.tmpdir)
+        self.dataset_path = os.path.join(self.tmpdir, 'crops.csv')
+        self.df = write_dataset(self.dataset_path)
+        self.model = CropRecommendationModel()
+        self.jobs = TrainingJobManager(self.model)
+
+    def tearDown(self):
+        self.jobs.shutdown()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmpdir)
+
+    def wait_for(self, job_id, timeout=60):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            job = self.jobs.get(job_id)
+            if job['status'] in ('completed', 'failed'):
+                return job
+            time.sleep(0.1)
+        self.fail(f'Training job {job_id} did not finish')
+
+    def test_job_swaps_live_model(self):
+        job_id = self.jobs.submit(self.dataset_path)
+        job = self.wait_for(job_id)
+        self.assertEqual(job['status'], 'completed')
+        self.assertEqual(self.model.generation, 1)
+        record = self.df.drop(columns='label').iloc[0].to_dict()
+        self.assertIn('crop', self.model.predict(record))
+
+    def test_job_waiting_for_a_worker_is_queued(self):
+        first = self.jobs.submit(self.dataset_path)
+        second = self.jobs.submit(self.dataset_path)
+        # One worker: the second job cannot start before the first finishes
+        self.assertEqual(self.jobs.get(second)['status'], 'queued')
+        self.assertIsNone(self.jobs.get(second)['started_at'])
+        deadline = time.time() + 60
+        while self.jobs.get(first)['status'] == 'queued' and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertIn(self.jobs.get(first)['status'], ('running', 'completed'))
+        first_job, second_job = self.wait_for(first), self.wait_for(second)
+        self.assertEqual(second_job['status'], 'completed')
+        self.assertGreaterEqual(second_job['started_at'], first_job['started_at'])
+        self.assertEqual(TrainingJobManager(self.model).get(second)['started_at'], second_job['started_at'])
+
+    def test_failed_job_keeps_model(self):
+        job_id = self.jobs.submit(os.path.join(self.tmpdir, 'missing.csv'))
+        job = self.wait_for(job_id)
+        self.assertEqual(job['status'], 'failed')
+        self.assertIsNotNone(job['error'])
+        self.assertEqual(self.model.generation, 0)
+
+    def test_job_with_cross_validation(self):
+        job_id = self.jobs.submit(self.dataset_path, backend='naive_bayes', search='grid', cv=3)
+        job = self.wait_for(job_id)
+        self.assertEqual(job['status'], 'completed')
+        self.assertEqual(job['backend'], 'naive_bayes')
+        self.assertIn('var_smoothing', job['cv_best_params'])
+        self.assertGreater(job['cv_best_score'], 0.5)
+        with self.assertRaises(ValueError):
+            self.jobs.submit(self.dataset_path, search='exhaustive')
+
+    def test_incremental_job_grows_live_model(self):
+        self.wait_for(self.jobs.submit(self.dataset_path))
+        records = write_dataset(os.path.join(self.tmpdir, 'new.csv'), n_samples=40, seed=1).to_dict('records')
+        job_id = self.jobs.submit_incremental(records, ['2025-01-01T00:00:00', 7], n_new_trees=5)
+        job = self.wait_for(job_id)
+        self.assertEqual(job['status'], 'completed', job['error'])
+        self.assertEqual(job['mode'], 'incremental')
+        self.assertEqual(job['n_records'], 40)
+        self.assertEqual(self.model.version, job['model_version'])
+        self.assertEqual(len(self.model.model.estimators_), 105)
+
+    def test_status_readable_from_another_manager(self):
+        job_id = self.jobs.submit(self.dataset_path)
+        self.wait_for(job_id)
+        other = TrainingJobManager(CropRecommendationModel())
+        self.assertEqual(other.get(job_id)['status'], 'completed')
+        self.assertIsNone(other.get('not-a-job'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+import json
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from ml_model import CropRecommendationModel
+from model_backends import BACKENDS
+from model_search import SEARCH_MODES
+
+logger = logging.getLogger(__name__)
+
+def run_training(dataset_path, model_dir, backend=None, search=None, cv=5, n_iter=20, n_jobs=-1):
+    """Train and activate a new model version in a worker process"""
+    trainer = CropRecommendationModel(model_dir=model_dir)
+    return trainer.train(dataset_path, backend=backend, search=search, cv=cv, n_iter=n_iter, n_jobs=n_jobs)
+
+def run_incremental_training(model_dir, records, watermark, n_new_trees=10, max_estimators=None, n_jobs=-1):
+    """Grow and activate the active forest in a worker process"""
+    trainer = CropRecommendationModel(model_dir=model_dir)
+    return trainer.train_incremental(records, watermark=watermark, n_new_trees=n_new_trees,
+                                     max_estimators=max_estimators, n_jobs=n_jobs)
+
+def _write_job(jobs_dir, job):
+    os.makedirs(jobs_dir, exist_ok=True)
+    path = os.path.join(jobs_dir, f"{job['job_id']}.json")
+    # Per-process temp name: the pool worker writes the same record
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(job, f)
+    os.replace(tmp_path, path)
+
+def _run_job(jobs_dir, job, fn, *args):
+    """Mark the job running once a pool worker picks it up, then run it"""
+    _write_job(jobs_dir, dict(job, status='running', started_at=datetime.utcnow().isoformat()))
+    return fn(*args)
+
+class TrainingJobManager:
+    """Runs training jobs in a process pool and hot-swaps the live model.
+
+    Each job activates a new version in the model registry; this process
+    reloads it as soon as the job finishes.
+
+    Job records are also written to `jobs_dir` so that any worker process
+    can answer a status query, not only the one that accepted the job.
+    """
+
+    def __init__(self, model, jobs_dir='models/jobs', max_workers=1, n_jobs=-1):
+        self.model = model
+        self.jobs_dir = jobs_dir
+        self.max_workers = max_workers
+        # Cores each job may use for cross-validation and the final fit
+        self.n_jobs = n_jobs
+        self._executor = None
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Created lazily so that gunicorn workers each get their own pool
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def submit(self, dataset_path, backend=None, search=None, cv=5, n_iter=20):
+        """Queue a full training job and return its id"""
+        backend = backend or self.model.backend
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown model backend: {backend!r}")
+        if search is not None and search not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {search!r}")
+        if not isinstance(cv, int) or cv < 2:
+            raise ValueError("cv must be an integer of at least 2")
+        if not isinstance(n_iter, int) or n_iter < 1:
+            raise ValueError("n_iter must be a positive integer")
+        job = self._new_job('full', dataset_path=dataset_path, backend=backend, search=search)
+        self._start(job, run_training, dataset_path, self.model.registry.root, backend, search, cv, n_iter, self.n_jobs)
+        logger.info(f"Training job {job['job_id']} submitted for {dataset_path} ({backend})")
+        return job['job_id']
+
+    def submit_incremental(self, records, watermark, n_new_trees=10, max_estimators=None):
+        """Queue a job growing the active forest from new records and return its id"""
+        if not isinstance(n_new_trees, int) or n_new_trees < 1:
+            raise ValueError("trees must be a positive integer")
+        if max_estimators is not None and (not isinstance(max_estimators, int) or max_estimators < n_new_trees):
+            raise ValueError("max_trees must be an integer of at least trees")
+        job = self._new_job('incremental', backend='random_forest', n_records=len(records))
+        self._start(job, run_incremental_training, self.model.registry.root, records, watermark,
+                    n_new_trees, max_estimators, self.n_jobs)
+        logger.info(f"Incremental training job {job['job_id']} submitted with {len(records)} records")
+        return job['job_id']
+
+    def _new_job(self, mode, dataset_path=None, backend=None, search=None, n_records=None):
+        return {
+            'job_id': uuid.uuid4().hex,
+            'mode': mode,
+            'status': 'queued',
+            'dataset_path': dataset_path,
+            'backend': backend,
+            'search': search,
+            'n_records': n_records,
+            'submitted_at': datetime.utcnow().isoformat(),
+            'started_at': None,
+            'finished_at': None,
+            'model_version': None,
+            'cv_best_score': None,
+            'cv_best_params': None,
+            'error': None
+        }
+
+    def _start(self, job, fn, *args):
+        job_id = job['job_id']
+        with self._lock:
+            self._jobs[job_id] = job
+            # Saved as queued before the worker can overwrite it with running
+            self._save(job)
+            future = self._get_executor().submit(_run_job, self.jobs_dir, dict(job), fn, *args)
+        future.add_done_callback(lambda f: self._on_done(job_id, f))
+
+    def _on_done(self, job_id, future):
+        status, error, version, cv_results = 'completed', None, None, None
+        try:
+            version = future.result()
+            # Other workers pick the new version up from the manifest
+            self.model.refresh_if_changed(force=True)
+            manifest = self.model.registry.read_manifest() or {}
+            if manifest.get('active_version') == version:
+                cv_results = manifest['metadata'].get('cv_results')
+            logger.info(f"Training job {job_id} completed, live model swapped to {version}")
+        except Exception as e:
+            status, error = 'failed', str(e)
+            logger.error(f"Training job {job_id} failed: {error}")
+        stored = self._load(job_id) or {}
+        with self._lock:
+            job = self._jobs[job_id]
+            job['started_at'] = stored.get('started_at')
+            job['status'] = status
+            job['error'] = error
+            job['model_version'] = version
+            if cv_results is not None:
+                job['cv_best_score'] = cv_results['best_score']
+                job['cv_best_params'] = cv_results['best_params']
+            job['finished_at'] = datetime.utcnow().isoformat()
+            self._save(job)
+
+    def get(self, job_id):
+        """Return the job record, or None if the id is unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job = dict(job)
+        if job is not None and job['status'] != 'queued':
+            return job
+        # Only the pool worker knows when a queued job starts running
+        stored = self._load(job_id)
+        if job is None or stored is None:
+            return job or stored
+        if stored['status'] == 'running':
+            job.update(status='running', started_at=stored['started_at'])
+        return job
+
+    def shutdown(self, wait=True):
+        """Stop the process pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def _job_path(self, job_id):
+        # Job ids are uuid4 hex strings; reject anything else to keep paths safe
+        if len(job_id) != 32 or not all(c in '0123456789abcdef' for c in job_id):
+            return None
+        return os.path.join(self.jobs_dir, f'{job_id}.json')
+
+    def _load(self, job_id):
+        path = self._job_path(job_id)
+        if path is None or not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _save(self, job):
+        _write_job(self.jobs_dir, job)
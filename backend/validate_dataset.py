@@ -2,104 +2,86 @@ import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 import os
+import argparse
+from dataset_loader import DEFAULT_CHUNK_SIZE
+from dataset_stats import profile_dataset, write_report
+from ml_model import CropRecommendationModel
 
-def validate_dataset(file_path):
+def validate_dataset(file_path, chunksize=DEFAULT_CHUNK_SIZE, report_path=None):
     try:
-        # Read the dataset
+        # One streaming pass computes every check and statistic below
         print(f"Reading dataset from: {file_path}")
-        df = pd.read_csv(file_path)
+        report = profile_dataset(file_path, chunksize)
+        if report_path:
+            write_report(report, report_path)
+            print(f"Validation report written to: {report_path}")
         
         # Display basic information
         print("\nDataset Information:")
-        print(f"Number of samples: {len(df)}")
-        print(f"Number of features: {len(df.columns)}")
+        print(f"Number of samples: {report['n_rows']}")
+        print(f"Number of features: {len(report['columns'])}")
         print("\nColumn names:")
-        for col in df.columns:
+        for col in report['columns']:
             print(f"- {col}")
         
-        # Check for required columns
-        required_columns = ['N', 'P', 'K', 'temperature', 'humidity', 'moisture', 'rainfall', 'label']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        
-        if missing_columns:
-            print("\n❌ Missing required columns:")
-            for col in missing_columns:
-                print(f"- {col}")
-            return False
-        
-        # Check for missing values
-        missing_values = df.isnull().sum()
-        if missing_values.any():
-            print("\n❌ Found missing values:")
-            print(missing_values[missing_values > 0])
+        if not report['valid']:
+            print("\n❌ Dataset is not valid:")
+            for error in report['errors']:
+                print(f"- {error}")
             return False
         
-        # Check data types
-        print("\nData types:")
-        print(df.dtypes)
-        
         # Check value ranges
         print("\nValue ranges:")
-        for col in df.columns:
-            if col != 'label':
-                print(f"{col}: {df[col].min():.2f} to {df[col].max():.2f}")
+        for col, stats in report['numeric'].items():
+            print(f"{col}: {stats['min']:.2f} to {stats['max']:.2f}")
         
         # Check unique crop labels
         print("\nUnique crop labels:")
-        print(df['label'].unique())
+        print(list(report['labels']))
         
         # Basic statistics
         print("\nBasic statistics:")
-        print(df.describe())
+        print(pd.DataFrame(report['numeric']).loc[['count', 'mean', 'std', 'min', 'q25', 'q50', 'q75', 'max']])
         
         # Check for outliers
         print("\nChecking for outliers...")
-        for col in df.columns:
-            if col != 'label':
-                Q1 = df[col].quantile(0.25)
-                Q3 = df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                outliers = df[(df[col] < Q1 - 1.5 * IQR) | (df[col] > Q3 + 1.5 * IQR)][col]
-                if len(outliers) > 0:
-                    print(f"Found {len(outliers)} outliers in {col}")
+        for col, stats in report['numeric'].items():
+            if stats['outliers'] > 0:
+                print(f"Found {stats['outliers']} outliers in {col}")
         
-        print("\n✅ Dataset validation completed successfully!")
+        print(f"\n✅ Dataset validation completed successfully in {report['elapsed_seconds']:.2f}s!")
         return True
         
     except Exception as e:
         print(f"\n❌ Error validating dataset: {str(e)}")
         return False
 
-def prepare_dataset(file_path):
+def prepare_dataset(file_path, model_dir='models'):
     try:
-        # Read the dataset
-        df = pd.read_csv(file_path)
-        
-        # Handle missing values if any
-        df = df.fillna(df.mean())
-        
-        # Remove duplicates
-        df = df.drop_duplicates()
-        
-        # Save processed dataset
-        processed_path = os.path.join(os.path.dirname(file_path), 'processed_crop_recommendation.csv')
-        df.to_csv(processed_path, index=False)
-        print(f"\n✅ Processed dataset saved to: {processed_path}")
+        # Validation already rejects missing values, so instead of writing a
+        # cleaned CSV copy the encoded feature matrix is cached for training
+        model = CropRecommendationModel(model_dir=model_dir)
+        X, y = model.load_features(file_path)
+        print(f"\n✅ Encoded {X.shape[0]} samples x {X.shape[1]} features into: {model.feature_cache.root}")
         
-        return processed_path
+        return file_path
         
     except Exception as e:
         print(f"\n❌ Error preparing dataset: {str(e)}")
         return None
 
 if __name__ == "__main__":
-    # Path to your dataset
-    dataset_path = os.path.join('data', 'crop_recommendation.csv')
+    parser = argparse.ArgumentParser(description="Validate and prepare a crop recommendation dataset")
+    parser.add_argument('dataset', nargs='?', default=os.path.join('data', 'crop_recommendation.csv'))
+    parser.add_argument('--report', help="Write the machine-readable validation report to this JSON file")
+    parser.add_argument('--model-dir', default='models', help="Where the encoded feature cache is kept")
+    args = parser.parse_args()
+    dataset_path = args.dataset
     
     # Validate dataset
-    if validate_dataset(dataset_path):
+    if validate_dataset(dataset_path, report_path=args.report):
         # Prepare dataset
-        processed_path = prepare_dataset(dataset_path)
+        processed_path = prepare_dataset(dataset_path, args.model_dir)
         if processed_path:
             print("\nDataset is ready to use!")
     else:
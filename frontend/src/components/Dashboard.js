@@ -22,8 +22,30 @@ ChartJS.register(
   Legend
 );
 
+// Long ranges are charted from server-side rollups instead of raw rows
+const HISTORY_RANGES = {
+  recent: { label: 'Latest readings' },
+  week: { label: 'Last 7 days (hourly)', resolution: 'hour', days: 7 },
+  month: { label: 'Last 30 days (daily)', resolution: 'day', days: 30 },
+};
+
+const MAX_LIVE_READINGS = 100;
+// The server answers 503 when too many streams are open; EventSource gives up on that
+const STREAM_RETRY_MS = 30000;
+
+const rollupToReading = (bucket) => ({
+  timestamp: bucket.bucket_start,
+  temperature: bucket.temperature.mean,
+  humidity: bucket.humidity.mean,
+  moisture: bucket.moisture.mean,
+  nitrogen: bucket.nitrogen.mean,
+  phosphorus: bucket.phosphorus.mean,
+  potassium: bucket.potassium.mean,
+});
+
 const Dashboard = () => {
   const [sensorData, setSensorData] = useState([]);
+  const [historyRange, setHistoryRange] = useState('recent');
   const [currentPrediction, setCurrentPrediction] = useState(null);
   const [systemStatus, setSystemStatus] = useState(null);
   const [showPrediction, setShowPrediction] = useState(false);
@@ -31,14 +53,28 @@ const Dashboard = () => {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const response = await fetch('http://localhost:5000/api/sensor-data');
-        const data = await response.json();
-        setSensorData(data);
+        const range = HISTORY_RANGES[historyRange];
+        if (range.resolution) {
+          const since = new Date(Date.now() - range.days * 24 * 60 * 60 * 1000).toISOString();
+          const response = await fetch(
+            `http://localhost:5000/api/sensor-data/rollup?resolution=${range.resolution}&since=${since}`
+          );
+          const data = await response.json();
+          setSensorData(data.map(rollupToReading));
+        } else {
+          const response = await fetch('http://localhost:5000/api/sensor-data');
+          const data = await response.json();
+          setSensorData(data);
+        }
       } catch (error) {
         console.error('Error fetching sensor data:', error);
       }
     };
 
+    fetchData();
+  }, [historyRange]);
+
+  useEffect(() => {
     const fetchStatus = async () => {
       try {
         const response = await fetch('http://localhost:5000/api/system-status');
@@ -49,15 +85,38 @@ const Dashboard = () => {
       }
     };
 
-    fetchData();
     fetchStatus();
-    const interval = setInterval(() => {
-      fetchData();
-      fetchStatus();
-    }, 30000); // Update every 30 seconds
 
-    return () => clearInterval(interval);
-  }, []);
+    // New readings and status changes are pushed by the server instead of polled
+    let stream = null;
+    let retryTimer = null;
+    const connect = () => {
+      stream = new EventSource('http://localhost:5000/api/stream');
+      stream.addEventListener('system-status', (event) => {
+        setSystemStatus(JSON.parse(event.data));
+      });
+      stream.addEventListener('sensor-data', (event) => {
+        if (historyRange !== 'recent') {
+          return;
+        }
+        const reading = JSON.parse(event.data);
+        setSensorData((previous) => [reading, ...previous].slice(0, MAX_LIVE_READINGS));
+      });
+      stream.onerror = (error) => {
+        console.error('Live sensor stream error:', error);
+        // EventSource reconnects dropped streams on its own, but not refused ones
+        if (stream.readyState === EventSource.CLOSED) {
+          retryTimer = setTimeout(connect, STREAM_RETRY_MS);
+        }
+      };
+    };
+    connect();
+
+    return () => {
+      clearTimeout(retryTimer);
+      stream.close();
+    };
+  }, [historyRange]);
 
   const handleFarmerInput = async (formData) => {
     try {
@@ -77,7 +136,11 @@ const Dashboard = () => {
   };
 
   const chartData = {
-    labels: sensorData.map(data => new Date(data.timestamp).toLocaleTimeString()),
+    labels: sensorData.map(data => (
+      historyRange === 'recent'
+        ? new Date(data.timestamp).toLocaleTimeString()
+        : new Date(data.timestamp).toLocaleString()
+    )),
     datasets: [
       {
         label: 'Temperature (°C)',
@@ -149,6 +212,15 @@ const Dashboard = () => {
 
       <div className="charts-section">
         <h2>Sensor Data History</h2>
+        <select
+          aria-label="History range"
+          value={historyRange}
+          onChange={(e) => setHistoryRange(e.target.value)}
+        >
+          {Object.entries(HISTORY_RANGES).map(([key, range]) => (
+            <option key={key} value={key}>{range.label}</option>
+          ))}
+        </select>
         <div className="chart-container">
           <Line data={chartData} options={{
             responsive: true,
@@ -5,8 +5,29 @@ import axios from 'axios';
 // Mock axios
 jest.mock('axios');
 
+// jsdom has no EventSource; record the streams the dashboard opens
+class MockEventSource {
+  static CLOSED = 2;
+  static instances = [];
+
+  constructor(url) {
+    this.url = url;
+    this.readyState = 0;
+    this.listeners = {};
+    this.close = jest.fn();
+    MockEventSource.instances.push(this);
+  }
+
+  addEventListener(type, listener) {
+    this.listeners[type] = listener;
+  }
+}
+
 describe('Dashboard Component', () => {
   beforeEach(() => {
+    MockEventSource.instances = [];
+    global.EventSource = MockEventSource;
+
     // Mock successful API responses
     axios.get.mockImplementation((url) => {
       if (url === 'http://localhost:5000/api/sensor-data') {
@@ -53,6 +74,14 @@ describe('Dashboard Component', () => {
     });
   });
 
+  test('opens the live stream and closes it on unmount', () => {
+    const { unmount } = render(<Dashboard />);
+    expect(MockEventSource.instances).toHaveLength(1);
+    expect(MockEventSource.instances[0].url).toBe('http://localhost:5000/api/stream');
+    unmount();
+    expect(MockEventSource.instances[0].close).toHaveBeenCalled();
+  });
+
   test('displays farmer input form', () => {
     render(<Dashboard />);
     expect(screen.getByText('Enter Farm Details')).toBeInTheDocument();